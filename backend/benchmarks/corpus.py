@@ -0,0 +1,175 @@
+import io
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from docx import Document
+
+# --- GÉNÉRATEUR DE CV SYNTHÉTIQUES ---
+# Corpus déterministe (graine fixe) : mêmes octets à chaque exécution.
+
+FIRST_NAMES = ["Jean", "Marie", "Ayoub", "Sophie", "Karim", "Claire", "Thomas", "Nadia", "Lucas", "Emma"]
+LAST_NAMES = ["Dupont", "Martin", "Jemaa", "Bernard", "Haddad", "Lefèvre", "Moreau", "Benali", "Petit", "Garnier"]
+DOMAINS = ["gmail.com", "outlook.fr", "yahoo.com", "proton.me"]
+
+SECTIONS = {
+    "fr": {
+        "education": "Formation",
+        "experience": "Expérience professionnelle",
+        "skills": "Compétences",
+        "languages": "Langues",
+        "degrees": ["Master Informatique", "Licence Professionnelle Réseaux", "BUT Informatique de Gestion",
+                    "Diplôme d'ingénieur en génie logiciel", "BTS Systèmes Numériques"],
+        "jobs": ["Développeur Python", "Ingénieur données", "Chef de projet", "Technicien support"],
+        "sentence": "Conception et maintenance d'applications, revue de code et mise en production.",
+    },
+    "en": {
+        "education": "Education",
+        "experience": "Work Experience",
+        "skills": "Skills",
+        "languages": "Languages",
+        "degrees": ["Master of Science in Computer Science", "Bachelor of Engineering", "MBA Finance",
+                    "PhD Applied Mathematics", "BSc Data Analytics"],
+        "jobs": ["Software Engineer", "Data Analyst", "Project Manager", "Support Technician"],
+        "sentence": "Designed and maintained services, reviewed code and shipped releases.",
+    },
+}
+
+LINES_PER_PAGE = 48
+
+
+@dataclass
+class SyntheticCV:
+    """Contenu logique d'un CV synthétique, avant rendu PDF/DOCX."""
+    name: str
+    lang: str
+    first_name: str
+    last_name: str
+    email: str
+    phone: str
+    degree: str
+    pages: List[List[str]]
+    tables: List[List[Tuple[str, str, str]]]
+
+
+def make_cv(seed: int, pages: int = 1, lang: str = "fr") -> SyntheticCV:
+    """Construit le contenu d'un CV de `pages` pages (tableaux et longues suites de chiffres inclus)."""
+    rng = random.Random(seed)
+    words = SECTIONS[lang]
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    email = f"{first_name.lower()}.{last_name.lower()}{rng.randint(1, 99)}@{rng.choice(DOMAINS)}"
+    phone = "+33 6 " + " ".join(f"{rng.randint(0, 99):02d}" for _ in range(4))
+    degree = rng.choice(words["degrees"])
+
+    content: List[List[str]] = []
+    tables: List[List[Tuple[str, str, str]]] = []
+    for page in range(pages):
+        lines: List[str] = []
+        if page == 0:
+            lines += [f"{first_name} {last_name}", f"{email} | {phone}", ""]
+            lines += [words["education"], f"2018-2020 {degree}", ""]
+        lines.append(words["experience"])
+        while len(lines) < LINES_PER_PAGE - 6:
+            start = rng.randint(2005, 2022)
+            lines.append(f"{start}-{start + rng.randint(1, 3)} {rng.choice(words['jobs'])}")
+            lines.append(words["sentence"])
+            # Longues suites de chiffres (identifiants, références) : pièges pour le téléphone
+            lines.append(f"Ref. {rng.randint(10**11, 10**12 - 1)} - ID {'-'.join(str(rng.randint(1000, 9999)) for _ in range(4))}")
+        tables.append([
+            (words["skills"], "Python, SQL, Docker", str(rng.randint(1, 10))),
+            (words["languages"], "Français, English", "C1"),
+            ("2019-2021", rng.choice(words["jobs"]), str(rng.randint(2010, 2024))),
+        ])
+        content.append(lines)
+
+    return SyntheticCV(
+        name=f"cv_{lang}_{pages}p_{seed}",
+        lang=lang, first_name=first_name, last_name=last_name,
+        email=email, phone=phone, degree=degree,
+        pages=content, tables=tables
+    )
+
+
+# --- RENDU PDF ---
+# Écriture PDF minimale (Helvetica, WinAnsiEncoding) sans dépendance externe.
+
+def _pdf_escape(text: str) -> bytes:
+    raw = text.encode("cp1252", "replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _pdf_page_stream(lines: List[str], table: List[Tuple[str, str, str]]) -> bytes:
+    ops = [b"BT /F1 10 Tf 12 TL 50 800 Td"]
+    for line in lines:
+        ops.append(b"(" + _pdf_escape(line) + b") '")
+    ops.append(b"ET")
+
+    # Tableau 3 colonnes en bas de page : bordures puis texte des cellules
+    top, row_height, widths = 150, 20, (150, 200, 145)
+    for row_index, row in enumerate(table):
+        y = top - row_index * row_height
+        x = 50
+        for width, cell in zip(widths, row):
+            ops.append(f"{x} {y - row_height} {width} {row_height} re S".encode())
+            ops.append(b"BT /F1 9 Tf " + f"{x + 4} {y - 14}".encode() + b" Td (" + _pdf_escape(cell) + b") Tj ET")
+            x += width
+    return b"\n".join(ops)
+
+
+def render_pdf(cv: SyntheticCV) -> bytes:
+    objects: List[bytes] = []
+    page_count = len(cv.pages)
+    # 1: catalogue, 2: arbre des pages, 3: police, puis (page, contenu) par page
+    page_ids = [4 + 2 * i for i in range(page_count)]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = b" ".join(f"{pid} 0 R".encode() for pid in page_ids)
+    objects.append(b"<< /Type /Pages /Kids [" + kids + b"] /Count " + str(page_count).encode() + b" >>")
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for pid, lines, table in zip(page_ids, cv.pages, cv.tables):
+        stream = _pdf_page_stream(lines, table)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents " + f"{pid + 1} 0 R".encode() + b" >>"
+        )
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+# --- RENDU DOCX ---
+
+def render_docx(cv: SyntheticCV) -> bytes:
+    doc = Document()
+    for index, (lines, table) in enumerate(zip(cv.pages, cv.tables)):
+        if index:
+            doc.add_page_break()
+        for line in lines:
+            doc.add_paragraph(line)
+        grid = doc.add_table(rows=len(table), cols=3)
+        for row, cells in zip(grid.rows, table):
+            for cell, value in zip(row.cells, cells):
+                cell.text = value
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def build_corpus(page_counts=(1, 20, 200), langs=("fr", "en"), seed: int = 42) -> Dict[str, Tuple[SyntheticCV, bytes, bytes]]:
+    """Corpus complet : nom -> (contenu, octets PDF, octets DOCX)."""
+    corpus = {}
+    for offset, (pages, lang) in enumerate((p, l) for p in page_counts for l in langs):
+        cv = make_cv(seed + offset, pages=pages, lang=lang)
+        corpus[cv.name] = (cv, render_pdf(cv), render_docx(cv))
+    return corpus
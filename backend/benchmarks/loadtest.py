@@ -0,0 +1,393 @@
+"""
+Test de charge de l'API : démarre uvicorn (main:app) en local et l'interroge avec un client
+asynchrone, sur le corpus synthétique (PDF et DOCX), pour chaque nombre de workers uvicorn et
+chaque taille de document.
+
+Usage (depuis backend/) :
+    python -m benchmarks.loadtest                                   # 1 et 2 workers, CV de 1 et 5 pages
+    python -m benchmarks.loadtest --workers 1 2 4 --pages 1 20 --concurrency 16 --requests 400
+    python -m benchmarks.loadtest --mix upload=6,bulk=2,batch=1,search=1 --json loadtest.json
+    python -m benchmarks.loadtest --compare loadtest.json --max-regression 0.3   # code 1 si régression
+    python -m benchmarks.loadtest --url http://localhost:8000       # serveur déjà démarré
+"""
+import os
+import sys
+import json
+import math
+import time
+import random
+import socket
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.corpus import make_cv, render_docx, render_pdf
+from services.extractor import EXTRACTOR_VERSION
+from services.parsers import DOCX_MIME, PDF_MIME
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MIX = "upload=8,bulk=1,batch=1"
+BATCH_FILES = 5
+SEARCH_QUERIES = ("python", "master informatique", "chef de projet", "gmail")
+READY_TIMEOUT = 120
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class Payload:
+    filename: str
+    content: bytes
+    content_type: str
+
+
+@dataclass
+class Sample:
+    """Une requête : type, code HTTP (0 si elle n'a pas abouti) et latence."""
+    kind: str
+    status: int
+    seconds: float
+
+    @property
+    def failed(self) -> bool:
+        return self.status == 0 or self.status >= 400
+
+
+# --- CORPUS ---
+
+def build_payloads(pages: int, documents: int, formats: Sequence[str], seed: int = 1000) -> List[Payload]:
+    """Documents distincts (pas de résultat servi par le cache), en alternant langue et format."""
+    payloads = []
+    for index in range(documents):
+        cv = make_cv(seed + index, pages=pages, lang="fr" if index % 2 else "en")
+        fmt = formats[index % len(formats)]
+        if fmt == "pdf":
+            payloads.append(Payload(f"{cv.name}.pdf", render_pdf(cv), PDF_MIME))
+        else:
+            payloads.append(Payload(f"{cv.name}.docx", render_docx(cv), DOCX_MIME))
+    return payloads
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """"upload=8,bulk=1" -> poids de chaque type de requête."""
+    mix = {}
+    for item in spec.split(","):
+        kind, _, weight = item.strip().partition("=")
+        if kind not in REQUESTS:
+            raise ValueError(f"Type de requête inconnu : {kind} (attendu : {', '.join(REQUESTS)})")
+        mix[kind] = float(weight or 1)
+    if not any(mix.values()):
+        raise ValueError("Mélange de requêtes vide")
+    return mix
+
+
+# --- REQUÊTES ---
+
+def _files(payload: Payload) -> dict:
+    return {"file": (payload.filename, payload.content, payload.content_type)}
+
+
+async def _upload(client: httpx.AsyncClient, payloads: List[Payload], rng: random.Random) -> httpx.Response:
+    return await client.post("/api/v1/upload-cv", files=_files(rng.choice(payloads)))
+
+
+async def _bulk(client: httpx.AsyncClient, payloads: List[Payload], rng: random.Random) -> httpx.Response:
+    """Upload d'un import en masse : file de priorité "bulk" (servie après les uploads interactifs)."""
+    return await client.post("/api/v1/upload-cv", files=_files(rng.choice(payloads)), headers={"X-Priority": "bulk"})
+
+
+async def _batch(client: httpx.AsyncClient, payloads: List[Payload], rng: random.Random) -> httpx.Response:
+    files = [("files", (p.filename, p.content, p.content_type)) for p in rng.sample(payloads, min(BATCH_FILES, len(payloads)))]
+    return await client.post("/api/v1/upload-cv/batch", files=files)
+
+
+async def _search(client: httpx.AsyncClient, payloads: List[Payload], rng: random.Random) -> httpx.Response:
+    return await client.get("/api/v1/search", params={"q": rng.choice(SEARCH_QUERIES)})
+
+
+REQUESTS = {"upload": _upload, "bulk": _bulk, "batch": _batch, "search": _search}
+
+
+async def drive(
+    base_url: str,
+    payloads: List[Payload],
+    mix: Dict[str, float],
+    concurrency: int,
+    requests: int,
+    seed: int = 0,
+    timeout: float = 120
+) -> Tuple[List[Sample], float]:
+    """
+    Boucle fermée : `concurrency` clients envoient chacun une requête dès la précédente terminée,
+    jusqu'à `requests` requêtes au total. Retourne les mesures et la durée totale.
+    """
+    rng = random.Random(seed)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=requests)
+    samples: List[Sample] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def user(user_id: int) -> None:
+            user_rng = random.Random(seed * 1000 + user_id)
+            while kinds:
+                kind = kinds.pop()
+                started = time.perf_counter()
+                try:
+                    status = (await REQUESTS[kind](client, payloads, user_rng)).status_code
+                except httpx.HTTPError:
+                    status = 0
+                samples.append(Sample(kind, status, time.perf_counter() - started))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(i) for i in range(max(1, concurrency))))
+        return samples, time.perf_counter() - started
+
+
+# --- STATISTIQUES ---
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Percentile au rang le plus proche (valeurs triées)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: List[Sample], duration: float) -> dict:
+    """Latences (ms), débit et taux d'erreur d'un ensemble de requêtes."""
+    latencies = sorted(s.seconds for s in samples)
+    errors = sum(1 for s in samples if s.failed)
+    statuses: Dict[str, int] = {}
+    for s in samples:
+        statuses[str(s.status)] = statuses.get(str(s.status), 0) + 1
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "status": dict(sorted(statuses.items())),
+        "throughput_rps": len(samples) / duration if duration else 0.0,
+        "latency_ms": {
+            **{f"p{p}": percentile(latencies, p) * 1000 for p in PERCENTILES},
+            "mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            "max": latencies[-1] * 1000 if latencies else 0.0,
+        },
+    }
+
+
+def scenario_key(scenario: dict) -> Tuple:
+    return scenario["workers"], scenario["pages"]
+
+
+def compare_reports(current: dict, previous: dict, max_regression: float) -> List[str]:
+    """Régressions d'un scénario à l'autre : p95 plus lent ou débit plus faible de plus de max_regression."""
+    reference = {scenario_key(s): s for s in previous.get("scenarios", [])}
+    regressions = []
+    for scenario in current["scenarios"]:
+        before = reference.get(scenario_key(scenario))
+        if before is None:
+            continue
+        label = f"{scenario['workers']} worker(s) / {scenario['pages']} page(s)"
+        p95, p95_before = scenario["latency_ms"]["p95"], before["latency_ms"]["p95"]
+        if p95_before and p95 > p95_before * (1 + max_regression):
+            regressions.append(f"{label} : p95 {p95:.1f} ms (référence {p95_before:.1f} ms)")
+        rps, rps_before = scenario["throughput_rps"], before["throughput_rps"]
+        if rps_before and rps < rps_before * (1 - max_regression):
+            regressions.append(f"{label} : débit {rps:.2f} req/s (référence {rps_before:.2f} req/s)")
+        if scenario["error_rate"] > before["error_rate"] + max_regression / 10:
+            regressions.append(
+                f"{label} : erreurs {scenario['error_rate']:.1%} (référence {before['error_rate']:.1%})"
+            )
+    return regressions
+
+
+# --- SERVEUR ---
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def server_env(data_dir: str, mix: Dict[str, float], cache: bool, overrides: Dict[str, str]) -> Dict[str, str]:
+    """Environnement du serveur : bases et documents dans un dossier temporaire, cache désactivé par défaut."""
+    env = dict(os.environ)
+    env.update({
+        "CV_JOB_DB": os.path.join(data_dir, "jobs.db"),
+        "CV_DEDUP_DB": os.path.join(data_dir, "dedup.db"),
+        "CV_DOCUMENT_DIR": os.path.join(data_dir, "documents"),
+        "CV_SEARCH_DB": os.path.join(data_dir, "search.db") if mix.get("search") else "",
+        "CV_RATE_LIMIT": "0",
+    })
+    if not cache:
+        env.update({"CV_CACHE_SIZE": "0", "CV_CACHE_DB": ""})
+    env.update(overrides)
+    return env
+
+
+def start_server(workers: int, port: int, env: Dict[str, str], log_path: str) -> subprocess.Popen:
+    """uvicorn en sous-processus ; ses journaux vont dans un fichier (un tube non lu bloquerait le serveur)."""
+    with open(log_path, "ab") as log:
+        return subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(workers), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+
+
+def log_tail(log_path: Optional[str], size: int = 2000) -> str:
+    if log_path is None or not os.path.exists(log_path):
+        return ""
+    with open(log_path, "rb") as f:
+        return f.read()[-size:].decode(errors="replace")
+
+
+def wait_ready(
+    base_url: str,
+    process: Optional[subprocess.Popen] = None,
+    log_path: Optional[str] = None,
+    timeout: float = READY_TIMEOUT
+) -> None:
+    """Attend que /ready réponde 200 (préchauffage terminé)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"uvicorn s'est arrêté :\n{log_tail(log_path)}")
+        try:
+            if httpx.get(f"{base_url}/ready", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Serveur non prêt après {timeout} s : {base_url}")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def run_scenario(base_url: str, payloads: List[Payload], args, mix: Dict[str, float]) -> dict:
+    # Préchauffage : une requête par client, hors mesures (connexions, workers du pool)
+    asyncio.run(drive(base_url, payloads, {"upload": 1}, args.concurrency, args.concurrency, seed=args.seed + 1))
+    samples, duration = asyncio.run(drive(base_url, payloads, mix, args.concurrency, args.requests, seed=args.seed))
+    by_kind = {kind: summarize([s for s in samples if s.kind == kind], duration)
+               for kind in mix if any(s.kind == kind for s in samples)}
+    return {**summarize(samples, duration), "duration_s": duration, "by_kind": by_kind}
+
+
+# --- RAPPORT ---
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_report(scenarios: List[dict]) -> None:
+    print(f"{'workers':>7} {'pages':>5} {'Ko':>7} {'req':>5} {'req/s':>8} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erreurs':>8}")
+    for s in scenarios:
+        workers = "-" if s["workers"] is None else s["workers"]
+        print(f"{workers:>7} {s['pages']:>5} {s['file_size_bytes'] / 1024:>7.1f} {s['requests']:>5} "
+              f"{s['throughput_rps']:>8.2f} {s['latency_ms']['p50']:>9.1f} {s['latency_ms']['p95']:>9.1f} "
+              f"{s['latency_ms']['p99']:>9.1f} {s['error_rate']:>8.1%}")
+        for kind, k in s["by_kind"].items():
+            print(f"{'':>7} {'':>5} {kind:>7} {k['requests']:>5} {k['throughput_rps']:>8.2f} "
+                  f"{k['latency_ms']['p50']:>9.1f} {k['latency_ms']['p95']:>9.1f} "
+                  f"{k['latency_ms']['p99']:>9.1f} {k['error_rate']:>8.1%}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Test de charge de l'API d'extraction de CV")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2], help="workers uvicorn à comparer")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5], help="tailles de documents (pages)")
+    parser.add_argument("--formats", nargs="+", choices=["pdf", "docx"], default=["pdf", "docx"])
+    parser.add_argument("--documents", type=int, default=20, help="documents distincts par taille")
+    parser.add_argument("--concurrency", type=int, default=8, help="clients simultanés")
+    parser.add_argument("--requests", type=int, default=100, help="requêtes mesurées par scénario")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"poids des requêtes ({', '.join(REQUESTS)})")
+    parser.add_argument("--cache", action="store_true", help="garde le cache de résultats du serveur")
+    parser.add_argument("--env", action="append", default=[], metavar="CLE=VALEUR",
+                        help="variable d'environnement du serveur (ex : CV_WORKERS=2)")
+    parser.add_argument("--url", help="serveur déjà démarré (--workers et --env ignorés)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    parser.add_argument("--compare", help="résultats JSON d'une version précédente")
+    parser.add_argument("--max-regression", type=float, default=0.3, help="régression tolérée (0.3 = 30 %%)")
+    args = parser.parse_args(argv)
+
+    mix = parse_mix(args.mix)
+    overrides = dict(item.split("=", 1) for item in args.env)
+    corpus = {pages: build_payloads(pages, args.documents, args.formats) for pages in args.pages}
+    scenarios = []
+
+    for workers in ([None] if args.url else args.workers):
+        with tempfile.TemporaryDirectory() as data_dir:
+            process, log_path = None, None
+            base_url = args.url
+            if base_url is None:
+                port = free_port()
+                base_url = f"http://127.0.0.1:{port}"
+                log_path = os.path.join(data_dir, "uvicorn.log")
+                process = start_server(workers, port, server_env(data_dir, mix, args.cache, overrides), log_path)
+            try:
+                wait_ready(base_url, process, log_path)
+                for pages, payloads in corpus.items():
+                    result = run_scenario(base_url, payloads, args, mix)
+                    scenarios.append({
+                        "workers": workers,
+                        "pages": pages,
+                        "file_size_bytes": sum(len(p.content) for p in payloads) / len(payloads),
+                        **result,
+                    })
+            finally:
+                if process is not None:
+                    stop_server(process)
+
+    print_report(scenarios)
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "extractor_version": EXTRACTOR_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "mix": mix,
+            "formats": args.formats,
+            "cache": args.cache,
+            "env": overrides,
+            "url": args.url,
+        },
+        "scenarios": scenarios,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare_reports(report, json.load(f), args.max_regression)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Benchmark du repérage des téléphones sur des entrées défavorables (longues suites de chiffres
+et de séparateurs) : vérifie que la durée croît linéairement avec la taille du texte.
+
+Usage (depuis backend/) :
+    python -m benchmarks.phones                          # tailles 10k à 160k caractères
+    python -m benchmarks.phones --sizes 5000 40000 --json phones.json
+    python -m benchmarks.phones --legacy                 # compare à l'ancienne expression
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from typing import Callable, Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.phones import iter_phones
+
+# Motifs répétés jusqu'à la taille voulue
+PATTERNS: Dict[str, str] = {
+    "chiffres": "1",
+    "zeros_espaces": "0 ",
+    "groupes_points": "12.",
+    "separateurs_mixtes": "1 2-3.4/",
+    "plages_dates": "2019 - 2020 ",
+    "indicatifs": "+33 ",
+    "parentheses": "(0)1 ",
+}
+DEFAULT_SIZES = [10_000, 40_000, 160_000]
+# Coût par caractère toléré sur la plus grande taille, relativement à la plus petite
+# (au-delà, la croissance n'est plus linéaire)
+MAX_COST_RATIO = 3.0
+
+# Ancienne détection (expression unique et filtre des années), pour comparaison
+LEGACY_PHONE_RE = re.compile(r'(\+?\d{1,3}[\s.-]?)?((?:\d[\s.-]?){7,14}\d)')
+LEGACY_YEAR_RE = re.compile(r'^\d{4}(-\d{2,4})?$')
+
+
+def legacy_scan(text: str) -> List[str]:
+    return [m.group(0).strip() for m in LEGACY_PHONE_RE.finditer(text) if not LEGACY_YEAR_RE.match(m.group(0).strip())]
+
+
+def scan(text: str) -> list:
+    return list(iter_phones(text))
+
+
+def make_input(pattern: str, size: int) -> str:
+    return (pattern * (size // len(pattern) + 1))[:size]
+
+
+def best_time(func: Callable[[str], list], text: str, runs: int) -> float:
+    """Meilleure durée sur `runs` exécutions (la moins perturbée par le reste de la machine)."""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(sizes: List[int], runs: int = 3, legacy: bool = False) -> Dict[str, dict]:
+    """Durées (ms) par motif et par taille, et rapport des coûts par caractère extrêmes."""
+    results = {}
+    for label, pattern in PATTERNS.items():
+        timings = {size: best_time(scan, make_input(pattern, size), runs) for size in sizes}
+        first, last = sizes[0], sizes[-1]
+        cost_ratio = (timings[last] / last) / max(timings[first] / first, 1e-12)
+        results[label] = {
+            "ms": {str(size): seconds * 1000 for size, seconds in timings.items()},
+            "cost_ratio": cost_ratio,
+        }
+        if legacy:
+            results[label]["legacy_ms"] = {
+                str(size): best_time(legacy_scan, make_input(pattern, size), runs) * 1000 for size in sizes
+            }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark du repérage des téléphones (pire cas)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="tailles de texte (caractères)")
+    parser.add_argument("--runs", type=int, default=3, help="exécutions par mesure (la meilleure est gardée)")
+    parser.add_argument("--max-ratio", type=float, default=MAX_COST_RATIO,
+                        help="rapport maximal des coûts par caractère (grande / petite taille)")
+    parser.add_argument("--legacy", action="store_true", help="mesure aussi l'ancienne expression régulière")
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    args = parser.parse_args(argv)
+
+    sizes = sorted(args.sizes)
+    results = measure(sizes, args.runs, args.legacy)
+
+    print(f"{'motif':<20} " + " ".join(f"{size:>10}" for size in sizes) + f" {'rapport':>8}")
+    for label, m in results.items():
+        print(f"{label:<20} " + " ".join(f"{m['ms'][str(size)]:>8.2f}ms" for size in sizes) + f" {m['cost_ratio']:>8.2f}")
+        if args.legacy:
+            print(f"{'  (ancien)':<20} " + " ".join(f"{m['legacy_ms'][str(size)]:>8.2f}ms" for size in sizes))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"sizes": sizes, "patterns": results}, f, indent=2)
+
+    superlinear = [label for label, m in results.items() if m["cost_ratio"] > args.max_ratio]
+    for label in superlinear:
+        print(f"NON LINÉAIRE {label} : coût par caractère x{results[label]['cost_ratio']:.2f} > x{args.max_ratio}")
+    return 1 if superlinear else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
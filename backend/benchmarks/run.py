@@ -0,0 +1,193 @@
+"""
+Benchmark du pipeline par étape, sur le corpus synthétique.
+
+Usage (depuis backend/) :
+    python -m benchmarks.run                      # profil rapide, comparaison à baseline.json
+    python -m benchmarks.run --full               # 1 à 200 pages
+    python -m benchmarks.run --update-baseline    # enregistre les mesures comme référence
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import build_corpus
+from services.pdf_parser import extract_text_pdf
+from services.docx_parser import extract_text_docx, extract_text_docx_python_docx
+from services.parsers import BACKENDS, PDF_MIME, iter_pages_with_fallback
+from services.extractor import clean_text, extract_email, extract_phone, extract_name, extract_degree
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+QUICK_PAGES = (1, 5, 20)
+FULL_PAGES = (1, 20, 100, 200)
+
+
+@dataclass
+class BenchDocument:
+    """Un document du corpus et ses entrées pré-calculées pour chaque étape."""
+    name: str
+    pdf: bytes
+    docx: bytes
+    raw_text: str
+    cleaned_text: str
+
+
+def _parse_pdf_with(backend: str) -> Callable[[BenchDocument], object]:
+    return lambda doc: "\f".join(BACKENDS[backend].iter_pages(doc.pdf, None))
+
+
+# Étape -> fonction mesurée
+STAGES: Dict[str, Callable[[BenchDocument], object]] = {
+    # Chaîne configurée (backend rapide, repli si besoin), puis chaque backend PDF seul
+    "parse_pdf": lambda doc: "\f".join(iter_pages_with_fallback(doc.pdf, PDF_MIME)),
+    **{f"parse_pdf_{name}": _parse_pdf_with(name) for name, backend in BACKENDS.items()
+       if backend.content_type == PDF_MIME and backend.available},
+    "parse_docx": lambda doc: extract_text_docx(doc.docx),
+    "parse_docx_python_docx": lambda doc: extract_text_docx_python_docx(doc.docx),
+    "clean_text": lambda doc: clean_text(doc.raw_text),
+    "extract_email": lambda doc: extract_email(doc.cleaned_text),
+    "extract_phone": lambda doc: extract_phone(doc.cleaned_text),
+    "extract_name": lambda doc: extract_name(doc.cleaned_text),
+    "extract_degree": lambda doc: extract_degree(doc.cleaned_text),
+}
+
+INPUT_SIZES: Dict[str, Callable[[BenchDocument], int]] = {
+    **{stage: (lambda doc: len(doc.pdf)) for stage in STAGES if stage.startswith("parse_pdf")},
+    "parse_docx": lambda doc: len(doc.docx),
+    "parse_docx_python_docx": lambda doc: len(doc.docx),
+    "clean_text": lambda doc: len(doc.raw_text.encode("utf-8")),
+}
+
+
+def input_size(stage: str, doc: BenchDocument) -> int:
+    return INPUT_SIZES.get(stage, lambda d: len(d.cleaned_text.encode("utf-8")))(doc)
+
+
+def time_stage(func: Callable[[], object], min_runs: int = 3, min_time: float = 0.5) -> float:
+    """Médiane du temps d'exécution : au moins min_runs essais, ou min_time secondes cumulées."""
+    timings: List[float] = []
+    started = time.perf_counter()
+    while len(timings) < min_runs or time.perf_counter() - started < min_time:
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+        # Les documents lents ne sont mesurés qu'une fois
+        if timings[-1] > min_time:
+            break
+    return statistics.median(timings)
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Pic d'allocation Python (octets) pendant une exécution."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def load_documents(page_counts) -> List[BenchDocument]:
+    documents = []
+    for name, (_, pdf, docx) in build_corpus(page_counts=page_counts).items():
+        raw_text = extract_text_pdf(pdf)
+        documents.append(BenchDocument(name, pdf, docx, raw_text, clean_text(raw_text)))
+    return documents
+
+
+def run_benchmarks(documents: List[BenchDocument], stages: Optional[List[str]] = None) -> Dict[str, Dict[str, dict]]:
+    results: Dict[str, Dict[str, dict]] = {}
+    for doc in documents:
+        results[doc.name] = {}
+        for stage in stages or STAGES:
+            func = lambda: STAGES[stage](doc)
+            seconds = time_stage(func)
+            size = input_size(stage, doc)
+            results[doc.name][stage] = {
+                "seconds": seconds,
+                "docs_per_s": 1 / seconds if seconds else float("inf"),
+                "mb_per_s": size / seconds / 1e6 if seconds else float("inf"),
+                "peak_kb": peak_memory(func) / 1024,
+            }
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float, min_delta: float) -> List[str]:
+    """Liste des régressions : temps > baseline * (1 + tolerance) et écart > min_delta secondes."""
+    regressions = []
+    for doc_name, stages in results.items():
+        for stage, measure in stages.items():
+            reference = baseline.get(doc_name, {}).get(stage)
+            if reference is None:
+                continue
+            limit = reference["seconds"] * (1 + tolerance)
+            if measure["seconds"] > limit and measure["seconds"] - reference["seconds"] > min_delta:
+                regressions.append(
+                    f"{doc_name} / {stage} : {measure['seconds'] * 1000:.2f} ms "
+                    f"(référence {reference['seconds'] * 1000:.2f} ms)"
+                )
+    return regressions
+
+
+def print_report(results: dict) -> None:
+    print(f"{'document':<22} {'étape':<23} {'ms':>10} {'docs/s':>10} {'Mo/s':>9} {'pic Ko':>10}")
+    for doc_name, stages in results.items():
+        for stage, m in stages.items():
+            print(f"{doc_name:<22} {stage:<23} {m['seconds'] * 1000:>10.3f} "
+                  f"{m['docs_per_s']:>10.1f} {m['mb_per_s']:>9.2f} {m['peak_kb']:>10.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline d'extraction de CV")
+    parser.add_argument("--full", action="store_true", help="corpus complet (jusqu'à 200 pages)")
+    parser.add_argument("--pages", type=int, nargs="+", help="tailles de documents (pages)")
+    parser.add_argument("--stages", nargs="+", choices=sorted(STAGES), help="étapes à mesurer")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="fichier de référence JSON")
+    parser.add_argument("--update-baseline", action="store_true", help="écrase la référence avec ces mesures")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="régression tolérée (0.5 = +50%%)")
+    parser.add_argument("--min-delta", type=float, default=0.002, help="écart minimal signalé (secondes)")
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    args = parser.parse_args(argv)
+
+    page_counts = args.pages or (FULL_PAGES if args.full else QUICK_PAGES)
+    results = run_benchmarks(load_documents(page_counts), args.stages)
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        for doc_name, stages in results.items():
+            baseline.setdefault(doc_name, {}).update(
+                {stage: {"seconds": m["seconds"]} for stage, m in stages.items()}
+            )
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Référence mise à jour : {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Aucune référence : lancez avec --update-baseline.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        regressions = compare_to_baseline(results, json.load(f), args.tolerance, args.min_delta)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
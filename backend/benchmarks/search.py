@@ -0,0 +1,125 @@
+"""
+Benchmark de l'index de recherche (SQLite FTS5) sur un grand nombre de CV synthétiques.
+
+Usage (depuis backend/) :
+    python -m benchmarks.search                        # 100 000 documents, index temporaire
+    python -m benchmarks.search --documents 20000 --json search.json
+    python -m benchmarks.search --db index.db --max-ms 10   # échec si une requête dépasse 10 ms (p95)
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+from typing import Dict, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import make_cv
+from models.cv_result import CVResult
+from services.extractor import clean_text
+from services.search import SearchIndex
+
+INSERT_BATCH = 1000
+
+# Requêtes mesurées : libellé -> arguments de SearchIndex.search
+QUERIES: Dict[str, dict] = {
+    "texte_frequent": {"query": "developpeur python"},
+    "texte_rare": {"query": "garnier ingenieur"},
+    "prefixe": {"query": "informat*"},
+    "filtre_diplome": {"degree": "master informatique"},
+    "filtre_domaine": {"domain": "proton.me"},
+    "texte_et_domaine": {"query": "chef de projet", "domain": "gmail.com"},
+    "diplome_et_domaine": {"degree": "mba", "domain": "yahoo.com"},
+    "page_profonde": {"query": "python", "page": 50},
+    "liste_recents": {},
+}
+
+
+def synthetic_documents(count: int):
+    """(identifiant, résultat, texte nettoyé) pour `count` CV d'une page, en français et en anglais."""
+    for seed in range(count):
+        cv = make_cv(seed, lang="fr" if seed % 2 else "en")
+        lines = [line for page in cv.pages for line in page]
+        lines += [" ".join(row) for table in cv.tables for row in table]
+        result = CVResult(
+            first_name=cv.first_name, last_name=cv.last_name, email=cv.email,
+            phone=cv.phone, degree=cv.degree
+        )
+        yield f"{seed:064x}", result, clean_text("\n".join(lines))
+
+
+def build_index(index: SearchIndex, count: int) -> float:
+    """Remplit l'index par transactions de INSERT_BATCH documents ; retourne la durée."""
+    started = time.perf_counter()
+    batch: List[Tuple[str, CVResult, str, str]] = []
+    for document_id, result, text in synthetic_documents(count):
+        batch.append((document_id, result, text, f"{document_id[-8:]}.pdf"))
+        if len(batch) == INSERT_BATCH:
+            index.add_many(batch)
+            batch = []
+    if batch:
+        index.add_many(batch)
+    return time.perf_counter() - started
+
+
+def time_queries(index: SearchIndex, runs: int = 20) -> Dict[str, dict]:
+    results = {}
+    for label, kwargs in QUERIES.items():
+        index.search(**kwargs)  # premier appel : pages SQLite chargées en cache
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            found = index.search(**kwargs)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        results[label] = {
+            "p50_ms": statistics.median(timings) * 1000,
+            "p95_ms": timings[int(len(timings) * 0.95) - 1] * 1000,
+            "total": found["total"],
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de l'index de recherche des CV")
+    parser.add_argument("--documents", type=int, default=100_000, help="nombre de CV indexés")
+    parser.add_argument("--db", help="base SQLite (défaut : fichier temporaire supprimé en fin d'exécution)")
+    parser.add_argument("--runs", type=int, default=20, help="exécutions par requête")
+    parser.add_argument("--max-ms", type=float, help="échec si le p95 d'une requête dépasse ce seuil")
+    parser.add_argument("--json", help="écrit les résultats dans ce fichier")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = SearchIndex(args.db or os.path.join(tmp_dir, "search.db"))
+        try:
+            existing = index.stats()["documents"]
+            build_seconds = build_index(index, args.documents) if existing < args.documents else 0.0
+            documents = index.stats()["documents"]
+            print(f"Index : {documents} documents (construction {build_seconds:.1f} s, "
+                  f"{(documents - existing) / build_seconds if build_seconds else 0:.0f} docs/s)")
+
+            queries = time_queries(index, args.runs)
+        finally:
+            index.close()
+
+    print(f"{'requête':<20} {'p50 ms':>9} {'p95 ms':>9} {'résultats':>10}")
+    for label, m in queries.items():
+        print(f"{label:<20} {m['p50_ms']:>9.2f} {m['p95_ms']:>9.2f} {m['total']:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"documents": documents, "build_seconds": build_seconds, "queries": queries}, f, indent=2)
+
+    if args.max_ms is not None:
+        slow = [label for label, m in queries.items() if m["p95_ms"] > args.max_ms]
+        for label in slow:
+            print(f"LENT {label} : p95 {queries[label]['p95_ms']:.2f} ms > {args.max_ms} ms")
+        return 1 if slow else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
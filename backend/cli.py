@@ -0,0 +1,211 @@
+"""
+Extraction en masse hors ligne : parcourt un dossier ou une archive ZIP et analyse chaque CV
+sur un pool de processus, sans passer par l'API HTTP.
+
+Usage (depuis backend/) :
+    python cli.py cvs/ -o resultats.jsonl            # une ligne JSON par document
+    python cli.py campagne.zip --workers 8 > out.jsonl
+    python cli.py cvs/ -o resultats.jsonl            # relancé après interruption : reprise
+
+Avec -o, un fichier de reprise (<sortie>.checkpoint) liste les documents déjà traités :
+une exécution interrompue reprend là où elle s'était arrêtée.
+"""
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from typing import IO, Iterator, Optional, Set, Tuple
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from services.batch import ENTRY_TOO_LARGE, analyze_batch_item
+from services.memory import MB, call_measured, recycle_reason
+from services.pipeline import guess_content_type
+
+logger = logging.getLogger("CVExtractor.cli")
+
+# Document à traiter : (nom affiché, chemin du fichier ou de l'archive, entrée dans l'archive, taille)
+Item = Tuple[str, str, Optional[str], int]
+
+
+def is_hidden(name: str) -> bool:
+    return name.startswith("__MACOSX/") or any(part.startswith(".") for part in name.split("/"))
+
+
+def iter_items(path: str) -> Iterator[Item]:
+    """Documents PDF/DOCX d'un dossier (récursivement) ou d'une archive ZIP, dans un ordre stable."""
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and not is_hidden(info.filename) and guess_content_type(info.filename):
+                    yield info.filename, path, info.filename, info.file_size
+        return
+
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            full_path = os.path.join(root, filename)
+            name = os.path.relpath(full_path, path).replace(os.sep, "/")
+            if not is_hidden(name) and guess_content_type(name):
+                yield name, full_path, None, os.path.getsize(full_path)
+
+
+@lru_cache(maxsize=4)
+def open_archive(path: str) -> zipfile.ZipFile:
+    """
+    Archive ouverte une fois par processus du pool : relire le répertoire central à chaque
+    entrée rendrait le traitement d'une grande archive quadratique.
+    """
+    return zipfile.ZipFile(path)
+
+
+def process_item(name: str, path: str, entry: Optional[str], size: int) -> dict:
+    """Exécuté dans un processus du pool : lecture du document puis pipeline complet."""
+    # Taille lue pendant le parcours (processus principal) : un fichier trop gros n'est pas ouvert
+    if size > config.BATCH_MAX_ENTRY_SIZE:
+        return {"filename": name, "status_code": 413, "result": None, "error": ENTRY_TOO_LARGE}
+    try:
+        if entry is None:
+            with open(path, "rb") as f:
+                content = f.read()
+        else:
+            content = open_archive(path).read(entry)
+    except (OSError, zipfile.BadZipFile, KeyError) as e:
+        return {"filename": name, "status_code": 400, "result": None, "error": f"Lecture impossible : {e}"}
+    return analyze_batch_item(name, content, None).model_dump()
+
+
+def load_checkpoint(path: Optional[str]) -> Set[str]:
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def run(
+    items: Iterator[Item],
+    output: IO[str],
+    checkpoint: Optional[IO[str]] = None,
+    done: Optional[Set[str]] = None,
+    workers: int = 1,
+) -> dict:
+    """
+    Analyse les documents sur un pool de processus. Chaque résultat est écrit dès qu'il est prêt,
+    puis le document est inscrit dans le fichier de reprise : une interruption peut au pire
+    produire une ligne en double, jamais en perdre une.
+    Le nombre de documents en vol est borné : la liste complète n'est jamais chargée en mémoire.
+    """
+    done = done or set()
+    stats = {"processed": 0, "skipped": 0, "errors": 0, "recycled": 0}
+    workers = max(1, workers)
+    max_in_flight = workers * 4
+    pool = ProcessPoolExecutor(max_workers=workers)
+    # Documents soumis au pool courant : au-delà de CV_WORKER_MAX_TASKS par worker, ou si un worker
+    # dépasse CV_WORKER_MAX_RSS, le pool est remplacé (l'ancien termine ses documents puis s'arrête)
+    pool_tasks = 0
+    in_flight = {}
+
+    def recycle(reason: str, rss: Optional[int]) -> None:
+        nonlocal pool, pool_tasks
+        logger.warning(f"Recyclage des workers ({reason} : {pool_tasks} documents, RSS {(rss or 0) // MB} Mo)")
+        pool.shutdown(wait=False)
+        pool = ProcessPoolExecutor(max_workers=workers)
+        pool_tasks = 0
+        stats["recycled"] += 1
+
+    def drain(return_when) -> None:
+        finished, _ = wait(in_flight, return_when=return_when)
+        for future in finished:
+            name, submitted_to = in_flight.pop(future)
+            rss = None
+            try:
+                line, error, rss = future.result()
+                if error is not None:
+                    raise error
+            except Exception as e:
+                logger.error(f"Echec worker sur {name} : {e}")
+                line = {"filename": name, "status_code": 500, "result": None, "error": "Erreur interne."}
+            output.write(json.dumps(line, ensure_ascii=False) + "\n")
+            output.flush()
+            if checkpoint is not None:
+                checkpoint.write(name + "\n")
+                checkpoint.flush()
+            stats["processed"] += 1
+            if line["status_code"] != 200:
+                stats["errors"] += 1
+            reason = recycle_reason(0, workers, rss)
+            if reason is not None and submitted_to is pool:
+                recycle(reason, rss)
+
+    try:
+        for name, path, entry, size in items:
+            if name in done:
+                stats["skipped"] += 1
+                continue
+            in_flight[pool.submit(call_measured, process_item, name, path, entry, size)] = (name, pool)
+            pool_tasks += 1
+            reason = recycle_reason(pool_tasks, workers, None)
+            if reason is not None:
+                recycle(reason, None)
+            if len(in_flight) >= max_in_flight:
+                drain(FIRST_COMPLETED)
+        while in_flight:
+            drain(FIRST_COMPLETED)
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Extraction en masse de CV (dossier ou archive ZIP) vers JSONL")
+    parser.add_argument("input", help="dossier ou archive ZIP contenant des PDF/DOCX")
+    parser.add_argument("-o", "--output", help="fichier JSONL de sortie (défaut : sortie standard)")
+    parser.add_argument("--checkpoint", help="fichier de reprise (défaut : <sortie>.checkpoint avec -o)")
+    parser.add_argument("--workers", type=int, default=config.BATCH_WORKERS, help="processus d'analyse")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    if not os.path.exists(args.input):
+        print(f"Entrée introuvable : {args.input}", file=sys.stderr)
+        return 2
+
+    checkpoint_path = args.checkpoint or (f"{args.output}.checkpoint" if args.output else None)
+    done = load_checkpoint(checkpoint_path)
+    if done:
+        print(f"Reprise : {len(done)} document(s) déjà traité(s)", file=sys.stderr)
+
+    output = open(args.output, "a" if done else "w", encoding="utf-8") if args.output else sys.stdout
+    checkpoint = open(checkpoint_path, "a", encoding="utf-8") if checkpoint_path else None
+    started = time.perf_counter()
+    try:
+        stats = run(iter_items(args.input), output, checkpoint, done, args.workers)
+    except KeyboardInterrupt:
+        print("Interrompu : relancez la même commande pour reprendre.", file=sys.stderr)
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{stats['processed']} document(s) traité(s) en {elapsed:.1f} s "
+        f"({stats['processed'] / elapsed if elapsed else 0:.1f} docs/s), "
+        f"{stats['errors']} erreur(s), {stats['skipped']} ignoré(s) (déjà traités), "
+        f"{stats['recycled']} recyclage(s) des workers",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
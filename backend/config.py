@@ -0,0 +1,151 @@
+import os
+
+# --- CONFIGURATION DU BACKEND ---
+# Toutes les valeurs sont surchargeables par variables d'environnement.
+
+
+def _env_int(name: str, default: int) -> int:
+    """Lit un entier depuis l'environnement, avec repli sur la valeur par défaut."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Lit un nombre décimal depuis l'environnement, avec repli sur la valeur par défaut."""
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _env_list(name: str, default: str) -> list:
+    """Lit une liste de valeurs séparées par des virgules."""
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+def _env_keys(name: str) -> dict:
+    """Lit des clés d'API "cle:file" séparées par des virgules (file "interactive" par défaut)."""
+    keys = {}
+    for item in _env_list(name, ""):
+        key, _, lane = item.partition(":")
+        if key.strip():
+            keys[key.strip()] = lane.strip().lower() or "interactive"
+    return keys
+
+
+# Traitement par lot (les lots de l'API passent par l'exécuteur, file "bulk" ; CV_BATCH_WORKERS ne sert qu'à la CLI)
+BATCH_WORKERS: int = _env_int("CV_BATCH_WORKERS", os.cpu_count() or 1)
+BATCH_MAX_FILES: int = _env_int("CV_BATCH_MAX_FILES", 5000)
+BATCH_MAX_ENTRY_SIZE: int = _env_int("CV_BATCH_MAX_ENTRY_SIZE", 20 * 1024 * 1024)
+
+# Exécuteur des requêtes interactives ("thread" ou "process")
+EXECUTOR_KIND: str = os.getenv("CV_EXECUTOR", "process")
+EXECUTOR_WORKERS: int = _env_int("CV_WORKERS", os.cpu_count() or 1)
+EXECUTOR_QUEUE_SIZE: int = _env_int("CV_QUEUE_SIZE", 32)
+EXECUTOR_RETRY_AFTER: int = _env_int("CV_RETRY_AFTER", 2)
+# File des requêtes "bulk" (imports en masse) : servie après la file interactive (CV_QUEUE_SIZE)
+EXECUTOR_BULK_QUEUE_SIZE: int = _env_int("CV_BULK_QUEUE_SIZE", 64)
+
+# Limite de débit des uploads par client : clé d'API connue (en-tête X-API-Key), sinon adresse IP.
+# Seau de RATE_LIMIT_BURST requêtes, rempli à RATE_LIMIT requêtes/s (0 = désactivé) ; 429 au-delà.
+# CV_API_KEYS : "cle:file" séparées par des virgules, file "interactive" (défaut) ou "bulk".
+# Un client peut aussi se déclasser lui-même avec l'en-tête "X-Priority: bulk".
+RATE_LIMIT: float = _env_float("CV_RATE_LIMIT", 0)
+RATE_LIMIT_BURST: int = _env_int("CV_RATE_LIMIT_BURST", 20)
+RATE_LIMIT_CLIENTS: int = _env_int("CV_RATE_LIMIT_CLIENTS", 10000)
+API_KEYS: dict = _env_keys("CV_API_KEYS")
+
+# Réception des fichiers : taille maximale (lue par blocs) et nombre de pages déclaré
+MAX_UPLOAD_SIZE: int = _env_int("CV_MAX_UPLOAD_SIZE", 10 * 1024 * 1024)
+BATCH_MAX_UPLOAD_SIZE: int = _env_int("CV_BATCH_MAX_UPLOAD_SIZE", 512 * 1024 * 1024)
+# Corps complet d'une requête de lot (tous fichiers confondus), compté à la réception
+BATCH_MAX_REQUEST_SIZE: int = _env_int("CV_BATCH_MAX_REQUEST_SIZE", 1024 * 1024 * 1024)
+MAX_DOCUMENT_PAGES: int = _env_int("CV_MAX_DOCUMENT_PAGES", 500)
+
+# Ordre de priorité des backends de lecture : le suivant n'est utilisé que si le
+# texte du précédent semble inexploitable (vide, glyphes non décodés)
+PDF_BACKENDS: list = _env_list("CV_PDF_BACKENDS", "pdfium,pdfplumber")
+DOCX_BACKENDS: list = _env_list("CV_DOCX_BACKENDS", "docx_xml")
+PARSER_ORDER: dict = {
+    "application/pdf": PDF_BACKENDS,
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": DOCX_BACKENDS,
+}
+
+# Préchauffage des parsers au démarrage (/ready répond 503 tant qu'il n'est pas terminé)
+WARMUP: bool = os.getenv("CV_WARMUP", "1") not in ("0", "false", "no")
+
+# Au-delà de cette taille, le document est écrit sur disque avant parsing
+SPOOL_THRESHOLD: int = _env_int("CV_SPOOL_THRESHOLD", 8 * 1024 * 1024)
+
+# Cache des résultats (CV_CACHE_DB vide = pas de niveau persistant)
+CACHE_SIZE: int = _env_int("CV_CACHE_SIZE", 1024)
+CACHE_TTL: int = _env_int("CV_CACHE_TTL", 24 * 3600)
+CACHE_DB: str = os.getenv("CV_CACHE_DB", "")
+
+# Garde-fous mémoire : croissance maximale de la RSS pendant l'analyse d'un document (422 au-delà),
+# recyclage des workers dont la RSS dépasse WORKER_MAX_RSS ou après WORKER_MAX_TASKS tâches (0 = désactivé)
+DOCUMENT_MAX_MEMORY: int = _env_int("CV_DOCUMENT_MAX_MEMORY", 512 * 1024 * 1024)
+WORKER_MAX_RSS: int = _env_int("CV_WORKER_MAX_RSS", 1024 * 1024 * 1024)
+WORKER_MAX_TASKS: int = _env_int("CV_WORKER_MAX_TASKS", 500)
+
+# Lecture paresseuse des PDF : arrêt dès que tous les champs sont trouvés
+STREAMING_PARSE: bool = os.getenv("CV_STREAMING_PARSE", "1") not in ("0", "false", "no")
+MAX_PAGES: int = _env_int("CV_MAX_PAGES", 50)
+
+# Pays des numéros de téléphone écrits au format national (sans indicatif), par ordre de priorité.
+# Les numéros avec indicatif (+32, 00212...) sont reconnus quel que soit ce réglage.
+PHONE_REGIONS: list = _env_list("CV_PHONE_REGIONS", "FR")
+
+# Dictionnaires d'extraction (mots ignorés, diplômes, prénoms), rechargeables à chaud.
+# CV_ADMIN_TOKEN protège les endpoints d'administration (vide = endpoints désactivés).
+DICTIONARY_DIR: str = os.getenv("CV_DICTIONARY_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+ADMIN_TOKEN: str = os.getenv("CV_ADMIN_TOKEN", "")
+
+# Documents reçus et miniatures des pages (aperçu), rangés par empreinte du contenu
+# (CV_DOCUMENT_DIR vide = désactivé : aucun document écrit sur disque)
+DOCUMENT_DIR: str = os.getenv("CV_DOCUMENT_DIR", "")
+DOCUMENT_STORE_SIZE: int = _env_int("CV_DOCUMENT_STORE_SIZE", 1024 * 1024 * 1024)
+THUMBNAIL_WIDTH: int = _env_int("CV_THUMBNAIL_WIDTH", 400)
+THUMBNAIL_MAX_WIDTH: int = _env_int("CV_THUMBNAIL_MAX_WIDTH", 1200)
+
+# Index de recherche plein texte des CV analysés (SQLite FTS5, CV_SEARCH_DB vide = désactivé)
+SEARCH_DB: str = os.getenv("CV_SEARCH_DB", "")
+SEARCH_PAGE_SIZE: int = _env_int("CV_SEARCH_PAGE_SIZE", 20)
+SEARCH_MAX_PAGE_SIZE: int = _env_int("CV_SEARCH_MAX_PAGE_SIZE", 100)
+# Requêtes très larges : classement BM25 limité aux N correspondances les plus récentes
+SEARCH_RANK_WINDOW: int = _env_int("CV_SEARCH_RANK_WINDOW", 2000)
+
+# Détection des quasi-doublons (MinHash/LSH, CV_DEDUP_DB vide = désactivé)
+DEDUP_DB: str = os.getenv("CV_DEDUP_DB", "")
+# Signature de DEDUP_BANDS x DEDUP_ROWS valeurs : candidats à partir d'environ 40 % de similarité
+DEDUP_BANDS: int = _env_int("CV_DEDUP_BANDS", 32)
+DEDUP_ROWS: int = _env_int("CV_DEDUP_ROWS", 4)
+DEDUP_SHINGLE: int = _env_int("CV_DEDUP_SHINGLE", 3)
+# Texte signé : début du document (la lecture en flux continue au besoin jusqu'à ce volume)
+DEDUP_CHARS: int = _env_int("CV_DEDUP_CHARS", 6000)
+# Doublon signalé : similarité >= seuil avec email ou téléphone identique, ou >= quasi-identique
+DEDUP_THRESHOLD: float = _env_float("CV_DEDUP_THRESHOLD", 0.5)
+DEDUP_NEAR_IDENTICAL: float = _env_float("CV_DEDUP_NEAR_IDENTICAL", 0.9)
+DEDUP_MAX_CANDIDATES: int = _env_int("CV_DEDUP_MAX_CANDIDATES", 200)
+DEDUP_MAX_RESULTS: int = _env_int("CV_DEDUP_MAX_RESULTS", 10)
+
+# Jobs asynchrones (file persistée dans SQLite)
+JOB_DB: str = os.getenv("CV_JOB_DB", "jobs.db")
+JOB_WORKERS: int = _env_int("CV_JOB_WORKERS", 2)
+# Bail d'un job en cours, renouvelé pendant l'analyse (un job interrompu est relancé à son expiration)
+JOB_LEASE: int = _env_int("CV_JOB_LEASE", 300)
+# Durée de conservation des jobs terminés (0 : jamais supprimés)
+JOB_TTL: int = _env_int("CV_JOB_TTL", 86400)
+JOB_MAX_WAIT: int = _env_int("CV_JOB_MAX_WAIT", 30)
+
+# Garde-fous du parser DOCX (bombes de décompression)
+DOCX_MAX_XML_BYTES: int = _env_int("CV_DOCX_MAX_XML_BYTES", 64 * 1024 * 1024)
+DOCX_MAX_RATIO: int = _env_int("CV_DOCX_MAX_RATIO", 200)
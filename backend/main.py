@@ -1,25 +1,35 @@
-import sys
 import os
+import math
+import time
+import asyncio
 import logging
-from typing import Optional
-from tempfile import NamedTemporaryFile
+import secrets
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
 
-# Ajout du dossier courant au path pour les imports locaux
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from fastapi import FastAPI, UploadFile, File, HTTPException, status
+from fastapi import FastAPI, Request, UploadFile, File, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, JSONResponse
 
 # Imports locaux
-from models.cv_result import CVResult
-from services.pdf_parser import extract_text_pdf
-from services.docx_parser import extract_text_docx
-from services.extractor import (
-    clean_text, 
-    extract_email, 
-    extract_phone, 
-    extract_name, 
-    extract_degree
-)
+import config
+from models.cv_result import CVResult, BatchItemResult
+from models.job import JobCreated, JobStatus
+from models.document import DocumentInfo
+from models.search import SearchResults
+from services.pipeline import DocumentError, analyze_document_full
+from services.ingest import UploadSizeLimit, batch_size_limit_detail, ingest_upload, read_upload
+from services.batch import is_zip, expand_zip, run_batch
+from services.executor import QueueFullError, get_executor, shutdown_executor
+from services.ratelimit import Client, close_rate_limiter, get_rate_limiter, identify_client
+from services.cache import get_cache, close_cache, content_digest, make_cache_key
+from services.documents import DocumentStore, get_document_store, close_document_store
+from services.search import get_search_index, close_search_index
+from services.dedup import get_dedup_index, close_dedup_index
+from services.dictionaries import DictionaryError, get_dictionaries, reload_dictionaries
+from services.thumbnails import count_pages, render_thumbnail
+from services.jobs import start_jobs, stop_jobs, get_job_store, notify_workers, wait_for_job
+from services.metrics import record_rate_limited, record_upload, render_metrics, server_timing_header
+from services.warmup import is_ready, mark_ready, readiness, reset_readiness, warm_up_service
 
 # Configuration Logging
 logging.basicConfig(
@@ -29,84 +39,378 @@ logging.basicConfig(
 )
 logger = logging.getLogger("CVExtractor")
 
-app = FastAPI(title="CV Extractor API")
 
-# Mapping MIME Type -> Fonction de parsing
-PARSERS = {
-    "application/pdf": extract_text_pdf,
-    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": extract_text_docx
-}
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Dictionnaires chargés avant le premier fork : les workers en héritent
+    get_dictionaries()
+    start_jobs()
+    reset_readiness()
+    warmup_task = asyncio.create_task(warm_up_service(get_executor())) if config.WARMUP else None
+    if warmup_task is None:
+        mark_ready()
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+        await asyncio.gather(warmup_task, return_exceptions=True)
+    await stop_jobs()
+    shutdown_executor()
+    close_cache()
+    close_document_store()
+    close_search_index()
+    close_dedup_index()
+    close_rate_limiter()
+
+
+app = FastAPI(title="CV Extractor API", lifespan=lifespan)
+
+# Routes à document unique : corps limité à MAX_UPLOAD_SIZE (Content-Length, puis octets reçus)
+SINGLE_UPLOAD_PATHS = {"/api/v1/upload-cv", "/api/v1/jobs"}
+# Route de lot : corps complet limité à BATCH_MAX_REQUEST_SIZE (chaque fichier, à BATCH_MAX_UPLOAD_SIZE)
+BATCH_UPLOAD_PATHS = {"/api/v1/upload-cv/batch"}
+
+app.add_middleware(UploadSizeLimit, paths=SINGLE_UPLOAD_PATHS, max_size=lambda: config.MAX_UPLOAD_SIZE)
+app.add_middleware(
+    UploadSizeLimit, paths=BATCH_UPLOAD_PATHS, max_size=lambda: config.BATCH_MAX_REQUEST_SIZE,
+    detail=batch_size_limit_detail
+)
+
+
+# Routes d'upload soumises à la limite de débit par client
+RATE_LIMITED_PATHS = SINGLE_UPLOAD_PATHS | BATCH_UPLOAD_PATHS
+
+
+def request_client(request: Request) -> Client:
+    """Client de la requête (clé d'API ou adresse IP) et sa file de priorité."""
+    return identify_client(request.headers, request.client.host if request.client else None)
+
+
+@app.middleware("http")
+async def rate_limit(request: Request, call_next):
+    """Refuse en 429 (avec Retry-After) un client qui dépasse son débit, avant toute lecture du corps."""
+    limiter = get_rate_limiter()
+    if limiter is not None and request.method == "POST" and request.url.path in RATE_LIMITED_PATHS:
+        client = request_client(request)
+        wait = limiter.acquire(client.key)
+        if wait > 0:
+            record_rate_limited(client.lane)
+            record_upload(None, status.HTTP_429_TOO_MANY_REQUESTS, {})
+            logger.warning(f"Limite de débit atteinte ({client.lane}) sur {request.url.path}")
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Trop de requêtes, réessayez plus tard."},
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+    return await call_next(request)
+
+
+def http_error(status_code: int, detail: str, timings: Dict[str, float], headers: Optional[Dict[str, str]] = None) -> HTTPException:
+    """HTTPException portant aussi l'en-tête Server-Timing des étapes déjà exécutées."""
+    headers = dict(headers or {})
+    if timings:
+        headers["Server-Timing"] = server_timing_header(timings)
+    return HTTPException(status_code=status_code, detail=detail, headers=headers)
+
 
 @app.post("/api/v1/upload-cv", response_model=CVResult)
-async def upload_cv(file: UploadFile = File(...)) -> CVResult:
+async def upload_cv(request: Request, response: Response, file: UploadFile = File(...)) -> CVResult:
     """
     Endpoint principal : Reçoit un fichier, l'analyse et retourne les infos extraites.
+    Les clients "bulk" (clé d'API déclarée comme telle, ou en-tête X-Priority: bulk) passent
+    après les requêtes interactives dans la file des workers.
     """
-    tmp_path: Optional[str] = None
-    
-    # 1. Validation du Format
-    if file.content_type not in PARSERS:
-        logger.warning(f"Format rejeté : {file.content_type}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, 
-            detail="Format non supporté. Utilisez PDF ou DOCX."
-        )
+    timings: Dict[str, float] = {}
+    status_code = 500
+    content_type = file.content_type
+    size: Optional[int] = None
+    pages: Optional[int] = None
+    parser: Optional[str] = None
+    peak_memory: Optional[int] = None
 
     try:
-        # 2. Gestion Fichier Temporaire
-        suffix = ".pdf" if file.content_type == "application/pdf" else ".docx"
-        
-        with NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            content = await file.read()
-            if not content:
-                raise HTTPException(status_code=400, detail="Fichier vide.")
-            
-            tmp.write(content)
-            tmp_path = tmp.name
-            logger.info(f"Fichier reçu : {file.filename} -> {tmp_path}")
-
-        # 3. Parsing du Texte
-        try:
-            parse_function = PARSERS[file.content_type]
-            raw_text = parse_function(tmp_path)
-            
-            if not raw_text or len(raw_text.strip()) < 10:
-                raise HTTPException(status_code=422, detail="Fichier illisible ou image scannée non supportée.")
-                
-        except Exception as e:
-            # On capture les erreurs remontées par les parsers
-            logger.error(f"Echec parsing : {e}")
-            raise HTTPException(status_code=422, detail="Impossible de lire le contenu du fichier.")
-
-        # 4. Extraction d'informations (NLP)
-        logger.info("Analyse sémantique en cours...")
-        cleaned_text = clean_text(raw_text)
-        
-        first_name, last_name = extract_name(cleaned_text)
-        
-        result = CVResult(
-            first_name=first_name,
-            last_name=last_name,
-            email=extract_email(cleaned_text),
-            phone=extract_phone(cleaned_text),
-            degree=extract_degree(cleaned_text)
-        )
-        
-        logger.info("Extraction réussie.")
+        # 1. Lecture bornée du fichier et détection du format d'après son contenu
+        started = time.perf_counter()
+        content, content_type = await ingest_upload(file, config.MAX_UPLOAD_SIZE)
+        size = len(content)
+        timings["read"] = time.perf_counter() - started
+
+        # 2. Cache : un fichier déjà analysé ne repasse pas par les parsers
+        started = time.perf_counter()
+        cache = get_cache()
+        document_id = content_digest(content)
+        cache_key = make_cache_key(content, document_id)
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        index = get_search_index()
+        dedup = get_dedup_index()
+        signature = None
+        if cached is not None and index is not None and not await asyncio.to_thread(index.contains, document_id):
+            # Résultat connu mais document absent de l'index : ré-analyse pour indexer son texte
+            cached = None
+        if cached is not None and dedup is not None:
+            signature = await asyncio.to_thread(dedup.get, document_id)
+            if signature is None:
+                # Résultat connu mais signature absente : ré-analyse pour la calculer
+                cached = None
+        timings["cache"] = time.perf_counter() - started
+        if cached is not None:
+            logger.info(f"Résultat servi depuis le cache : {file.filename}")
+            result = CVResult(**cached)
+        else:
+            # 3. Parsing et extraction, hors de la boucle d'événements
+            started = time.perf_counter()
+            analysis = await get_executor().run(
+                analyze_document_full, content, content_type, file.filename, index is not None, dedup is not None,
+                lane=request_client(request).lane
+            )
+            result, stage_timings, signature = analysis.result, analysis.timings, analysis.signature
+            # Le temps non passé dans les étapes est l'attente d'un worker
+            timings["queue"] = max(0.0, time.perf_counter() - started - sum(stage_timings.values()))
+            timings.update(stage_timings)
+            pages = result.pages_parsed
+            parser = result.parser
+            peak_memory = analysis.peak_memory
+            await asyncio.to_thread(cache.set, cache_key, result.model_dump(exclude={"duplicates"}))
+            logger.info("Extraction réussie.")
+
+            if index is not None:
+                started = time.perf_counter()
+                await asyncio.to_thread(index.add, document_id, result, analysis.text, file.filename)
+                timings["index"] = time.perf_counter() - started
+
+        # Quasi-doublons parmi les documents déjà reçus (puis enregistrement de celui-ci)
+        if dedup is not None and signature is not None:
+            started = time.perf_counter()
+            result.duplicates = await asyncio.to_thread(dedup.check_in, document_id, signature, result)
+            timings["dedup"] = time.perf_counter() - started
+
+        # 4. Conservation du document pour l'aperçu (miniatures rendues à la demande)
+        store = get_document_store()
+        if store is not None:
+            await asyncio.to_thread(store.put, document_id, content, content_type)
+        result.document_id = document_id
+
+        status_code = 200
+        response.headers["Server-Timing"] = server_timing_header(timings)
         return result
 
-    except HTTPException:
+    except DocumentError as e:
+        status_code = e.status_code
+        raise http_error(e.status_code, e.detail, timings)
+
+    except QueueFullError as e:
+        status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        logger.warning("File d'attente pleine, requête rejetée.")
+        raise http_error(status_code, "Serveur saturé, réessayez plus tard.", timings,
+                         {"Retry-After": str(e.retry_after)})
+
+    except HTTPException as e:
+        status_code = e.status_code
         raise # On relance les erreurs HTTP volontaires
-        
+
     except Exception as e:
         logger.critical(f"Erreur serveur inattendue : {e}")
-        raise HTTPException(status_code=500, detail="Erreur interne du serveur.")
-        
+        raise http_error(500, "Erreur interne du serveur.", timings)
+
     finally:
-        # 5. Nettoyage
-        if tmp_path and os.path.exists(tmp_path):
+        record_upload(content_type, status_code, timings, size, pages, parser, peak_memory)
+
+
+@app.post("/api/v1/upload-cv/batch", response_model=List[BatchItemResult])
+async def upload_cv_batch(files: List[UploadFile] = File(...)) -> List[BatchItemResult]:
+    """
+    Endpoint de traitement par lot : accepte plusieurs fichiers ou une archive ZIP.
+    Retourne un résultat (ou une erreur) par document, dans l'ordre de réception.
+    """
+    documents = []
+    for upload in files:
+        try:
+            content = await read_upload(upload, config.BATCH_MAX_UPLOAD_SIZE)
+        except DocumentError as e:
+            record_upload(upload.content_type, e.status_code, {})
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+        if is_zip(upload.filename, upload.content_type):
             try:
-                os.remove(tmp_path)
-                logger.debug(f"Nettoyage temp : {tmp_path}")
-            except OSError:
-                logger.warning(f"Impossible de supprimer {tmp_path}")
\ No newline at end of file
+                # Décompression et contrôle CRC hors de la boucle d'événements
+                for name, data in await asyncio.to_thread(expand_zip, content):
+                    documents.append((name, data, None))
+            except Exception as e:
+                logger.warning(f"Archive ZIP invalide {upload.filename} : {e}")
+                raise HTTPException(status_code=400, detail=f"Archive ZIP invalide : {upload.filename}")
+        else:
+            documents.append((upload.filename, content, None))
+
+        if len(documents) > config.BATCH_MAX_FILES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Lot trop volumineux (max {config.BATCH_MAX_FILES} documents)."
+            )
+
+    if not documents:
+        raise HTTPException(status_code=400, detail="Aucun document PDF ou DOCX dans le lot.")
+
+    logger.info(f"Lot reçu : {len(documents)} document(s)")
+    return await run_batch(documents)
+
+
+@app.post("/api/v1/jobs", response_model=JobCreated, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(file: UploadFile = File(...)) -> JobCreated:
+    """
+    Soumet un document pour analyse asynchrone : retourne immédiatement un identifiant de job.
+    Adapté aux documents longs qui dépasseraient le délai d'une requête synchrone.
+    """
+    try:
+        content, content_type = await ingest_upload(file, config.MAX_UPLOAD_SIZE)
+    except DocumentError as e:
+        # Les documents acceptés sont comptés à leur analyse (services.batch.run_batch)
+        record_upload(file.content_type, e.status_code, {})
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+    job_id = await asyncio.to_thread(get_job_store().create, file.filename, content, content_type)
+    notify_workers()
+    logger.info(f"Job {job_id} créé pour {file.filename}")
+    return JobCreated(id=job_id, status="queued")
+
+
+@app.get("/api/v1/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str, wait: float = Query(0, ge=0, description="Long-polling : attente max (secondes)")) -> JobStatus:
+    """État et résultat d'un job. Avec `wait`, la réponse attend la fin du job (long-polling)."""
+    job = await wait_for_job(get_job_store(), job_id, min(wait, config.JOB_MAX_WAIT))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job introuvable.")
+    return JobStatus(**job)
+
+
+async def run_or_503(func, *args):
+    """Exécute un rendu sur l'exécuteur borné ; file pleine -> 503 avec Retry-After."""
+    try:
+        return await get_executor().run(func, *args)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail="Serveur saturé, réessayez plus tard.",
+                            headers={"Retry-After": str(e.retry_after)})
+
+
+def require_document_store() -> DocumentStore:
+    store = get_document_store()
+    if store is None:
+        raise HTTPException(status_code=404, detail="Stockage des documents désactivé (CV_DOCUMENT_DIR).")
+    return store
+
+
+@app.get("/api/v1/documents/{document_id}", response_model=DocumentInfo)
+async def get_document(document_id: str) -> DocumentInfo:
+    """Type et nombre de pages d'un document reçu (pour l'aperçu page par page)."""
+    store = require_document_store()
+    path = store.document_path(document_id)
+    meta = store.get_meta(document_id) if path else None
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Document introuvable.")
+    if meta.get("pages") is None:
+        meta["pages"] = await run_or_503(count_pages, path, meta["content_type"])
+        await asyncio.to_thread(store.set_meta, document_id, meta)
+    return DocumentInfo(id=document_id, **meta)
+
+
+@app.get("/api/v1/documents/{document_id}/pages/{page}.png")
+async def get_page_thumbnail(
+    document_id: str,
+    page: int,
+    width: int = Query(config.THUMBNAIL_WIDTH, ge=50, le=config.THUMBNAIL_MAX_WIDTH)
+) -> FileResponse:
+    """
+    Miniature PNG d'une page, rendue à la première demande puis servie depuis le disque.
+    Le contenu ne change jamais pour un identifiant donné : mise en cache navigateur illimitée.
+    """
+    store = require_document_store()
+    path = store.document_path(document_id)
+    meta = store.get_meta(document_id) if path else None
+    if meta is None:
+        raise HTTPException(status_code=404, detail="Document introuvable.")
+
+    thumbnail = store.thumbnail_path(document_id, page, width)
+    if not os.path.exists(thumbnail):
+        try:
+            png = await run_or_503(render_thumbnail, path, meta["content_type"], page, width)
+        except IndexError:
+            raise HTTPException(status_code=404, detail="Page introuvable.")
+        thumbnail = await asyncio.to_thread(store.put_thumbnail, document_id, page, width, png)
+    return FileResponse(thumbnail, media_type="image/png",
+                        headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+
+@app.get("/api/v1/search", response_model=SearchResults)
+async def search(
+    q: str = Query("", description="Texte recherché (nom, diplôme, contenu du CV)"),
+    degree: str = Query("", description="Filtre sur le diplôme (ex : master informatique)"),
+    email_domain: str = Query("", description="Filtre sur le domaine de l'email (ex : gmail.com)"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(config.SEARCH_PAGE_SIZE, ge=1, le=config.SEARCH_MAX_PAGE_SIZE)
+) -> SearchResults:
+    """Recherche classée et paginée dans les CV déjà analysés (nécessite CV_SEARCH_DB)."""
+    index = get_search_index()
+    if index is None:
+        raise HTTPException(status_code=404, detail="Index de recherche désactivé (CV_SEARCH_DB).")
+    found = await asyncio.to_thread(index.search, q, degree, email_domain, page, page_size)
+    return SearchResults(**found)
+
+
+@app.get("/ready")
+def ready() -> JSONResponse:
+    """Sonde de préparation : 503 tant que le préchauffage des parsers n'est pas terminé."""
+    return JSONResponse(readiness(), status_code=200 if is_ready() else 503)
+
+
+@app.get("/api/v1/executor")
+def executor_stats() -> dict:
+    """État de l'exécuteur : profondeur de file (par priorité), workers occupés, rejets, limite de débit."""
+    limiter = get_rate_limiter()
+    return {**get_executor().stats(), "rate_limit": limiter.stats() if limiter is not None else None}
+
+
+@app.get("/api/v1/cache")
+def cache_stats() -> dict:
+    """Compteurs du cache de résultats (hits, misses, évictions)."""
+    return get_cache().stats()
+
+
+# --- ADMINISTRATION ---
+
+def require_admin(authorization: Optional[str]) -> None:
+    """Jeton CV_ADMIN_TOKEN attendu en "Authorization: Bearer" ; endpoints absents (404) sans jeton configuré."""
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Administration désactivée (CV_ADMIN_TOKEN).")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.strip().encode(), config.ADMIN_TOKEN.encode()):
+        raise HTTPException(
+            status_code=401, detail="Jeton d'administration invalide.", headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+@app.get("/api/v1/admin/dictionaries")
+def dictionaries_info(authorization: Optional[str] = Header(None)) -> dict:
+    """Version chargée des dictionnaires (empreinte et nombre d'entrées)."""
+    require_admin(authorization)
+    return get_dictionaries().stats()
+
+
+@app.post("/api/v1/admin/dictionaries/reload")
+async def reload_dictionaries_endpoint(authorization: Optional[str] = Header(None)) -> dict:
+    """
+    Relit les fichiers de CV_DICTIONARY_DIR sans redémarrer le serveur, puis recycle les pools de
+    workers pour qu'ils héritent de la nouvelle version. Fichier invalide : 422, version précédente conservée.
+    Avec plusieurs workers uvicorn, chacun doit être rechargé (ou redémarré).
+    """
+    require_admin(authorization)
+    try:
+        dictionaries = await asyncio.to_thread(reload_dictionaries)
+    except DictionaryError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    recycled = {"executor": get_executor().recycle("reload")}
+    return {**dictionaries.stats(), "recycled": recycled}
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    """Métriques Prometheus : latences par étape, uploads par type et code, tailles, pages."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -1,8 +1,36 @@
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
+class DuplicateMatch(BaseModel):
+    document_id: str
+    similarity: float
+    same_email: bool = False
+    same_phone: bool = False
+
+class FieldPosition(BaseModel):
+    # Page (à partir de 1) et position (début, fin) du champ dans le texte brut de la page
+    page: int
+    start: int
+    end: int
+
 class CVResult(BaseModel):
     first_name: str
     last_name: str
     email: str
     phone: str
     degree: str
+    phone_e164: Optional[str] = None
+    # Tous les diplômes de la rubrique Formation (degree est le premier)
+    degrees: List[str] = []
+    # Position dans le document de email, phone et degree (quand ils sont trouvés)
+    positions: Dict[str, FieldPosition] = {}
+    pages_parsed: Optional[int] = None
+    parser: Optional[str] = None
+    document_id: Optional[str] = None
+    duplicates: List[DuplicateMatch] = []
+
+class BatchItemResult(BaseModel):
+    filename: str
+    status_code: int
+    result: Optional[CVResult] = None
+    error: Optional[str] = None
@@ -0,0 +1,7 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class DocumentInfo(BaseModel):
+    id: str
+    content_type: str
+    pages: Optional[int] = None
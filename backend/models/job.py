@@ -0,0 +1,18 @@
+from typing import Optional
+from pydantic import BaseModel
+
+from models.cv_result import CVResult
+
+class JobCreated(BaseModel):
+    id: str
+    status: str
+
+class JobStatus(BaseModel):
+    id: str
+    status: str
+    filename: Optional[str] = None
+    status_code: Optional[int] = None
+    result: Optional[CVResult] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
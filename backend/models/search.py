@@ -0,0 +1,17 @@
+from typing import List, Optional
+from pydantic import BaseModel
+
+from models.cv_result import CVResult
+
+class SearchHit(BaseModel):
+    document_id: str
+    filename: Optional[str] = None
+    score: Optional[float] = None
+    snippet: Optional[str] = None
+    result: CVResult
+
+class SearchResults(BaseModel):
+    total: int
+    page: int
+    page_size: int
+    hits: List[SearchHit]
@@ -0,0 +1,203 @@
+import io
+import asyncio
+import logging
+import zipfile
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+from models.cv_result import CVResult, BatchItemResult
+from services.cache import ResultCache, get_cache, content_digest, make_cache_key
+from services.pipeline import Analysis, DocumentError, analyze_document_full, guess_content_type
+from services.ingest import sniff_content_type
+from services.search import get_search_index
+from services.dedup import DedupIndex, get_dedup_index
+from services.executor import BULK, get_executor
+from services.metrics import record_upload
+
+logger = logging.getLogger(__name__)
+
+ZIP_MIMES = {"application/zip", "application/x-zip-compressed"}
+
+# Erreur d'une entrée d'archive au-delà de BATCH_MAX_ENTRY_SIZE (jamais décompressée)
+ENTRY_TOO_LARGE = "Fichier trop volumineux."
+
+def is_zip(filename: str, content_type: Optional[str]) -> bool:
+    return content_type in ZIP_MIMES or (filename or "").lower().endswith(".zip")
+
+
+def expand_zip(content: bytes) -> List[Tuple[str, Optional[bytes]]]:
+    """
+    Extrait les documents PDF/DOCX d'une archive ZIP. Les dossiers et fichiers cachés sont ignorés ;
+    une entrée trop volumineuse n'est pas décompressée : son contenu vaut None (erreur 413 dans le lot).
+    Décompression et contrôle CRC : à appeler hors de la boucle d'événements.
+    """
+    entries = []
+    with zipfile.ZipFile(io.BytesIO(content)) as archive:
+        for info in archive.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or name.rsplit("/", 1)[-1].startswith("."):
+                continue
+            if guess_content_type(name) is None:
+                continue
+            if info.file_size > config.BATCH_MAX_ENTRY_SIZE:
+                logger.warning(f"Entrée ZIP ignorée (trop volumineuse) : {name}")
+                entries.append((name, None))
+                continue
+            entries.append((name, archive.read(info)))
+    return entries
+
+
+def analyze_batch_item(filename: str, content: bytes, content_type: Optional[str]) -> BatchItemResult:
+    """
+    Traite un document du lot. Ne lève jamais : l'erreur est reportée dans le résultat
+    pour qu'un fichier défaillant n'interrompe pas le lot.
+    """
+    return _analyze_item(filename, content, content_type, False, False)[0]
+
+
+def detect_content_type(filename: str, content: bytes, content_type: Optional[str]) -> Optional[str]:
+    """Le contenu fait foi ; l'en-tête puis l'extension servent de repli."""
+    return sniff_content_type(content) or content_type or guess_content_type(filename)
+
+
+def _analyze_item(
+    filename: str,
+    content: bytes,
+    content_type: Optional[str],
+    keep_text: bool,
+    sign: bool
+) -> Tuple[BatchItemResult, Optional[str], Optional[Analysis]]:
+    """
+    Comme analyze_batch_item ; retourne aussi le type détecté et l'analyse complète (durées
+    des étapes, texte nettoyé à indexer si keep_text, signature MinHash si sign), None en cas d'erreur.
+    """
+    try:
+        content_type = detect_content_type(filename, content, content_type)
+        analysis = analyze_document_full(content, content_type, filename, keep_text, sign)
+        return BatchItemResult(filename=filename, status_code=200, result=analysis.result), content_type, analysis
+    except DocumentError as e:
+        return BatchItemResult(filename=filename, status_code=e.status_code, error=e.detail), content_type, None
+    except Exception as e:
+        logger.error(f"Erreur inattendue sur {filename} : {e}")
+        return BatchItemResult(filename=filename, status_code=500, error="Erreur interne du serveur."), content_type, None
+
+
+def record_item(
+    item: BatchItemResult,
+    content_type: Optional[str],
+    size: Optional[int],
+    analysis: Optional[Analysis] = None
+) -> None:
+    """Métriques d'upload d'un document du lot (comme un upload unitaire)."""
+    if analysis is None:
+        record_upload(content_type, item.status_code, {}, size)
+    else:
+        record_upload(content_type, item.status_code, analysis.timings, size,
+                      item.result.pages_parsed, item.result.parser, analysis.peak_memory)
+
+
+def check_in_all(dedup: DedupIndex, signed: List[Tuple[str, List[int], CVResult]]) -> None:
+    """
+    Recherche les doublons de chaque document du lot, dans l'ordre du lot : un document
+    est aussi comparé aux documents qui le précèdent dans le même lot.
+    """
+    for document_id, signature, result in signed:
+        result.duplicates = dedup.check_in(document_id, signature, result)
+
+
+def store_all(cache: ResultCache, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+    """Enregistre les résultats du lot dans le cache (hors de la boucle d'événements : SQLite)."""
+    for key, value in entries:
+        cache.set(key, value)
+
+
+async def run_batch(documents: List[Tuple[str, Optional[bytes], Optional[str]]]) -> List[BatchItemResult]:
+    """
+    Répartit l'analyse des documents sur les workers de l'exécuteur partagé, dans la file "bulk" :
+    les uploads interactifs passent devant. Au plus `workers` documents du lot sont soumis à la
+    fois ; ils ne sont pas soumis à la borne de la file (un lot attend son tour au lieu d'être
+    rejeté), qui reste réservée aux uploads "bulk" unitaires. L'ordre des résultats est conservé.
+    Les documents déjà présents dans le cache ne sont pas renvoyés aux workers. Empreintes, cache,
+    index de recherche et doublons (SQLite) sont consultés dans un thread, hors de la boucle d'événements.
+    Si l'index de recherche est activé, les documents analysés y sont ajoutés ; si la détection
+    des doublons est activée, chaque résultat signale ses quasi-doublons.
+    Chaque document est compté dans les métriques d'upload (documents des lots et des jobs).
+    Un document sans contenu (None : entrée d'archive trop volumineuse) est reporté en erreur 413.
+    """
+    executor = get_executor()
+    cache = get_cache()
+    search_index = get_search_index()
+    keep_text = search_index is not None
+    dedup = get_dedup_index()
+    sign = dedup is not None
+    items: List[Optional[BatchItemResult]] = [None] * len(documents)
+    digests: List[Optional[str]] = [None] * len(documents)
+    signatures: List[Optional[List[int]]] = [None] * len(documents)
+    keys: List[Optional[str]] = [None] * len(documents)
+    pending = []
+
+    def lookup() -> None:
+        for index, (filename, content, content_type) in enumerate(documents):
+            if content is None:
+                items[index] = BatchItemResult(filename=filename, status_code=413, error=ENTRY_TOO_LARGE)
+                record_item(items[index], content_type or guess_content_type(filename), None)
+                continue
+            if content:
+                digests[index] = content_digest(content)
+                keys[index] = make_cache_key(content, digests[index])
+                cached = cache.get(keys[index])
+                if cached is not None and keep_text and not search_index.contains(digests[index]):
+                    cached = None
+                if cached is not None and sign:
+                    signatures[index] = dedup.get(digests[index])
+                    if signatures[index] is None:
+                        cached = None
+                if cached is not None:
+                    items[index] = BatchItemResult(filename=filename, status_code=200, result=CVResult(**cached))
+                    record_item(items[index], detect_content_type(filename, content, content_type), len(content))
+                    continue
+            pending.append(index)
+
+    await asyncio.to_thread(lookup)
+
+    # Documents du lot en vol (en cours ou en attente d'un worker)
+    slots = asyncio.Semaphore(executor.workers)
+
+    async def analyze(index: int):
+        async with slots:
+            return await executor.run(_analyze_item, *documents[index], keep_text, sign, lane=BULK, bounded=False)
+
+    results = await asyncio.gather(*(analyze(index) for index in pending), return_exceptions=True)
+    stored = []
+    indexed = []
+
+    for index, outcome in zip(pending, results):
+        filename, content, content_type = documents[index]
+        if isinstance(outcome, BaseException):
+            # Crash du processus worker (ex: BrokenProcessPool, le pool est reconstruit par l'exécuteur)
+            logger.error(f"Echec worker sur {filename} : {outcome}")
+            items[index] = BatchItemResult(filename=filename, status_code=500, error="Erreur interne du serveur.")
+            record_item(items[index], content_type, len(content))
+            continue
+        items[index], content_type, analysis = outcome
+        record_item(items[index], content_type, len(content), analysis)
+        if analysis is None:
+            continue
+        signatures[index] = analysis.signature
+        if keys[index] is not None:
+            stored.append((keys[index], items[index].result.model_dump(exclude={"duplicates"})))
+            if keep_text:
+                indexed.append((digests[index], items[index].result, analysis.text, filename))
+
+    if stored:
+        await asyncio.to_thread(store_all, cache, stored)
+    if indexed:
+        await asyncio.to_thread(search_index.add_many, indexed)
+    if sign:
+        signed = [
+            (digests[index], signatures[index], items[index].result)
+            for index in range(len(documents))
+            if signatures[index] is not None and items[index].result is not None
+        ]
+        await asyncio.to_thread(check_in_all, dedup, signed)
+    return items
@@ -0,0 +1,190 @@
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import config
+from services.dictionaries import dictionaries_fingerprint
+from services.extractor import EXTRACTOR_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Purge des entrées expirées du niveau SQLite : à l'ouverture, puis toutes les PURGE_EVERY écritures
+PURGE_EVERY = 500
+
+
+def content_digest(content: bytes) -> str:
+    """Empreinte SHA-256 (hexadécimale) du fichier."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def make_cache_key(content: bytes, digest: Optional[str] = None) -> str:
+    """Clé de cache : empreinte SHA-256 du fichier + version de l'extracteur et des dictionnaires."""
+    return f"{digest or content_digest(content)}:{EXTRACTOR_VERSION}.{dictionaries_fingerprint()}"
+
+
+class ResultCache:
+    """
+    Cache des résultats d'extraction à deux niveaux :
+    - un LRU en mémoire, borné et avec durée de vie (TTL) ;
+    - une base SQLite optionnelle, persistante et partagée entre workers uvicorn.
+    Les entrées expirées de la base ne sont jamais servies ; elles sont supprimées à l'ouverture
+    puis toutes les `purge_every` écritures (index sur expires_at), pas à chaque écriture.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 86400,
+        db_path: Optional[str] = None,
+        purge_every: int = PURGE_EVERY
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl = ttl
+        self.db_path = db_path or None
+        self.purge_every = max(1, purge_every)
+        self._writes = 0
+        self._memory: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._db: Optional[sqlite3.Connection] = None
+
+        if self.db_path:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at)")
+            self._disk_purge(time.time())
+            self._db.commit()
+
+    # --- Niveau mémoire ---
+
+    def _memory_get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= now:
+            del self._memory[key]
+            self._counters["expirations"] += 1
+            return None
+        self._memory.move_to_end(key)
+        return value
+
+    def _memory_set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        if self.max_entries == 0:
+            return
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    # --- Niveau disque ---
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM results WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Lecture cache SQLite impossible : {e}")
+            return None
+        if row is None:
+            return None
+        return row[1], json.loads(row[0])
+
+    def _disk_purge(self, now: float) -> None:
+        deleted = self._db.execute("DELETE FROM results WHERE expires_at <= ?", (now,)).rowcount
+        if deleted:
+            logger.info(f"Cache SQLite : {deleted} entrée(s) expirée(s) supprimée(s)")
+
+    def _disk_set(self, key: str, value: Dict[str, Any], expires_at: float, now: float) -> None:
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._disk_purge(now)
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Ecriture cache SQLite impossible : {e}")
+
+    # --- API publique ---
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            value = self._memory_get(key, now)
+            if value is not None:
+                self._counters["hits"] += 1
+                return value
+
+            stored = self._disk_get(key, now)
+            if stored is not None:
+                expires_at, value = stored
+                self._memory_set(key, value, expires_at)
+                self._counters["hits"] += 1
+                self._counters["disk_hits"] += 1
+                return value
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        expires_at = now + self.ttl
+        with self._lock:
+            self._memory_set(key, value, expires_at)
+            self._disk_set(key, value, expires_at, now)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "persistent": self._db is not None,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Cache partagé par les endpoints
+_cache: Optional[ResultCache] = None
+
+
+def get_cache() -> ResultCache:
+    global _cache
+    if _cache is None:
+        _cache = ResultCache(
+            max_entries=config.CACHE_SIZE,
+            ttl=config.CACHE_TTL,
+            db_path=config.CACHE_DB
+        )
+    return _cache
+
+
+def close_cache() -> None:
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
@@ -0,0 +1,244 @@
+import re
+import time
+import struct
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import config
+from models.cv_result import CVResult, DuplicateMatch
+from services.extractor import EXTRACTOR_VERSION, NOT_FOUND
+from services.phones import to_e164
+
+logger = logging.getLogger(__name__)
+
+# --- DÉTECTION DES QUASI-DOUBLONS ---
+# Chaque CV analysé reçoit une signature MinHash calculée sur le texte nettoyé (ensemble de
+# shingles de mots). Les signatures sont découpées en bandes (LSH) : deux documents dont une
+# bande est identique deviennent candidats, retrouvés par des recherches indexées dans SQLite
+# (coût indépendant du nombre de documents). La similarité de Jaccard est ensuite estimée
+# sur la signature complète et confirmée par l'égalité exacte de l'email ou du téléphone.
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+# Valeurs de hachage sur 64 bits ; bornées à 63 bits pour les colonnes INTEGER de SQLite
+HASH_BITS = 64
+BUCKET_MASK = (1 << 63) - 1
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS signatures ("
+    "document_id TEXT PRIMARY KEY, params TEXT NOT NULL, signature BLOB NOT NULL, "
+    "email TEXT, phone TEXT, added_at REAL NOT NULL)",
+    # Une ligne par bande : la clé primaire (band, bucket, document_id) sert d'index de recherche
+    "CREATE TABLE IF NOT EXISTS lsh_buckets ("
+    "band INTEGER NOT NULL, bucket INTEGER NOT NULL, document_id TEXT NOT NULL, "
+    "PRIMARY KEY (band, bucket, document_id)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS lsh_buckets_document ON lsh_buckets (document_id)",
+]
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def shingles(text: str, size: int) -> Set[int]:
+    """Empreintes 64 bits des suites de `size` mots consécutifs (casse ignorée)."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {_hash64(" ".join(words).encode("utf-8"))} if words else set()
+    return {
+        _hash64(" ".join(words[start:start + size]).encode("utf-8"))
+        for start in range(len(words) - size + 1)
+    }
+
+
+def minhash(text: str, num_hashes: int, shingle_size: int) -> Optional[List[int]]:
+    """
+    Signature MinHash de `num_hashes` valeurs par hachage à permutation unique : chaque shingle
+    est haché une fois puis rangé dans un des `num_hashes` compartiments, dont on garde le minimum
+    (un passage sur le texte, au lieu d'un hachage par permutation). Les compartiments vides
+    (textes courts) empruntent le minimum du suivant non vide, décalé selon la distance
+    (densification), pour que l'estimation reste valable. None si le texte n'a aucun mot.
+    """
+    hashes = shingles(text, shingle_size)
+    if not hashes:
+        return None
+    bins: List[Optional[int]] = [None] * num_hashes
+    for value in hashes:
+        slot, rank = value % num_hashes, value // num_hashes
+        if bins[slot] is None or rank < bins[slot]:
+            bins[slot] = rank
+
+    if None in bins:
+        # Écart entre deux emprunts : au-delà de toute valeur réelle d'un compartiment
+        offset = (1 << HASH_BITS) // num_hashes
+        filled = list(bins)
+        for slot in range(num_hashes):
+            if filled[slot] is None:
+                distance = 1
+                while filled[(slot + distance) % num_hashes] is None:
+                    distance += 1
+                bins[slot] = filled[(slot + distance) % num_hashes] + distance * offset
+    return bins
+
+
+def similarity(left: List[int], right: List[int]) -> float:
+    """Estimation de la similarité de Jaccard : part des positions égales des deux signatures."""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+def band_buckets(signature: List[int], rows: int) -> List[Tuple[int, int]]:
+    """(bande, empreinte des `rows` valeurs de la bande) pour chaque bande de la signature."""
+    return [
+        (band, _hash64(struct.pack(f"<{rows}Q", *signature[start:start + rows])) & BUCKET_MASK)
+        for band, start in enumerate(range(0, len(signature), rows))
+    ]
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """Téléphones comparés au format E.164 : "+33 6 12..." et "06 12..." sont égaux."""
+    if not phone or phone == NOT_FOUND:
+        return None
+    return to_e164(phone)
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    if not email or email == NOT_FOUND:
+        return None
+    return email.strip().lower()
+
+
+def signature_params() -> str:
+    """Paramètres de la signature : deux signatures ne sont comparables que s'ils sont égaux."""
+    return f"{EXTRACTOR_VERSION}:{config.DEDUP_BANDS}x{config.DEDUP_ROWS}:{config.DEDUP_SHINGLE}:{config.DEDUP_CHARS}"
+
+
+def document_signature(text: str) -> Optional[List[int]]:
+    """Signature d'un texte nettoyé avec les paramètres configurés (DEDUP_CHARS premiers caractères)."""
+    return minhash(text[:config.DEDUP_CHARS], config.DEDUP_BANDS * config.DEDUP_ROWS, config.DEDUP_SHINGLE)
+
+
+class DedupIndex:
+    """
+    Index LSH des signatures MinHash, persisté dans SQLite (partagé entre workers uvicorn, WAL).
+    Un document ré-ajouté remplace sa signature précédente.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._db.execute(statement)
+
+    def get(self, document_id: str) -> Optional[List[int]]:
+        """Signature enregistrée d'un document (None si absente ou calculée avec d'autres paramètres)."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT signature FROM signatures WHERE document_id = ? AND params = ?",
+                (document_id, signature_params())
+            ).fetchone()
+        return list(struct.unpack(f"<{len(row[0]) // 8}Q", row[0])) if row else None
+
+    def find(self, signature: List[int], result: CVResult, exclude: Optional[str] = None) -> List[DuplicateMatch]:
+        """
+        Doublons probables d'un document, du plus au moins similaire : candidats LSH dont la
+        similarité estimée atteint DEDUP_THRESHOLD et dont l'email ou le téléphone est identique,
+        ou dont la similarité atteint DEDUP_NEAR_IDENTICAL (même texte, champs non extraits).
+        Au plus DEDUP_MAX_CANDIDATES candidats sont comparés : ceux qui partagent le plus de bandes
+        (les plus similaires), le document `exclude` n'en fait jamais partie.
+        """
+        buckets = band_buckets(signature, config.DEDUP_ROWS)
+        keys = ", ".join("(?, ?)" for _ in buckets)
+        params = [value for bucket in buckets for value in bucket]
+        with self._lock:
+            candidates = self._db.execute(
+                f"WITH keys (band, bucket) AS (VALUES {keys}), "
+                f"shared (document_id, bands) AS ("
+                f"SELECT b.document_id, COUNT(*) FROM keys CROSS JOIN lsh_buckets b "
+                f"ON b.band = keys.band AND b.bucket = keys.bucket "
+                f"WHERE b.document_id != ? GROUP BY b.document_id) "
+                f"SELECT s.document_id, s.signature, s.email, s.phone FROM shared "
+                f"JOIN signatures s ON s.document_id = shared.document_id "
+                f"WHERE s.params = ? ORDER BY shared.bands DESC, s.document_id LIMIT ?",
+                # Identifiant vide : aucun document exclu
+                params + [exclude or "", signature_params(), config.DEDUP_MAX_CANDIDATES]
+            ).fetchall()
+
+        email, phone = normalize_email(result.email), normalize_phone(result.phone)
+        matches = []
+        for document_id, blob, other_email, other_phone in candidates:
+            score = similarity(signature, struct.unpack(f"<{len(signature)}Q", blob))
+            same_email = email is not None and email == other_email
+            same_phone = phone is not None and phone == other_phone
+            if score >= config.DEDUP_NEAR_IDENTICAL or (score >= config.DEDUP_THRESHOLD and (same_email or same_phone)):
+                matches.append(DuplicateMatch(
+                    document_id=document_id, similarity=round(score, 3),
+                    same_email=same_email, same_phone=same_phone
+                ))
+        matches.sort(key=lambda match: (-match.similarity, match.document_id))
+        return matches[:config.DEDUP_MAX_RESULTS]
+
+    def add(self, document_id: str, signature: List[int], result: CVResult) -> None:
+        self.add_many([(document_id, signature, result)])
+
+    def add_many(self, documents: List[Tuple[str, List[int], CVResult]]) -> None:
+        """Enregistre (ou remplace) des signatures dans une seule transaction."""
+        now = time.time()
+        params = signature_params()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for document_id, signature, result in documents:
+                    self._db.execute("DELETE FROM lsh_buckets WHERE document_id = ?", (document_id,))
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO signatures (document_id, params, signature, email, phone, added_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (document_id, params, struct.pack(f"<{len(signature)}Q", *signature),
+                         normalize_email(result.email), normalize_phone(result.phone), now)
+                    )
+                    self._db.executemany(
+                        "INSERT OR IGNORE INTO lsh_buckets (band, bucket, document_id) VALUES (?, ?, ?)",
+                        [(band, bucket, document_id) for band, bucket in band_buckets(signature, config.DEDUP_ROWS)]
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def check_in(self, document_id: str, signature: List[int], result: CVResult) -> List[DuplicateMatch]:
+        """Recherche les doublons d'un nouveau document puis l'ajoute à l'index."""
+        matches = self.find(signature, result, exclude=document_id)
+        self.add(document_id, signature, result)
+        return matches
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+        return {"db_path": self.db_path, "documents": count}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# Index partagé par les endpoints (None si CV_DEDUP_DB est vide)
+_index: Optional[DedupIndex] = None
+
+
+def get_dedup_index() -> Optional[DedupIndex]:
+    global _index
+    if _index is None and config.DEDUP_DB:
+        _index = DedupIndex(config.DEDUP_DB)
+        logger.info(f"Index des doublons ouvert : {config.DEDUP_DB}")
+    return _index
+
+
+def close_dedup_index() -> None:
+    global _index
+    if _index is not None:
+        _index.close()
+        _index = None
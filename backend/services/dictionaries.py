@@ -0,0 +1,162 @@
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# --- DICTIONNAIRES D'EXTRACTION ---
+# Les listes de mots (mots ignorés, diplômes, prénoms...) sont des fichiers texte de
+# CV_DICTIONARY_DIR, compilés au chargement en structures immuables (frozenset, expression
+# régulière). Ils sont chargés une fois dans le processus principal : les workers, créés par
+# fork, en héritent sans les relire. Un rechargement remplace l'ensemble en une seule
+# affectation ; les pools de workers sont alors recyclés pour hériter de la nouvelle version.
+
+DICTIONARY_FILES: Dict[str, str] = {
+    "skip_words": "skip_keywords.txt",
+    "degrees": "degrees.txt",
+    "degree_stop_words": "degree_stop_words.txt",
+    "first_names": "first_names.txt",
+    "section_headings": "section_headings.txt",
+}
+# Facultatifs : sans prénoms, le nom est pris dans l'ordre de l'en-tête ; sans titres de
+# rubriques, le document n'est pas découpé en sections (tout le texte est cherché)
+OPTIONAL_FILES = {"first_names", "section_headings"}
+
+
+class DictionaryError(Exception):
+    """Fichier de dictionnaire absent, illisible ou vide."""
+
+
+def strip_accents(word: str) -> str:
+    return unicodedata.normalize('NFKD', word).encode('ascii', 'ignore').decode('utf-8')
+
+
+def with_unaccented(words: Iterable[str]) -> FrozenSet[str]:
+    """Ajoute la variante sans accents de chaque mot (le texte nettoyé n'en a plus)."""
+    return frozenset(w for word in words for w in (word, strip_accents(word)))
+
+
+@dataclass(frozen=True, eq=False)
+class Dictionaries:
+    """Version compilée des dictionnaires (comparée par identité : une instance par chargement)."""
+    skip_words: FrozenSet[str]
+    degree_stop_words: FrozenSet[str]
+    # Diplômes triés du plus long au plus court : "master of science" prime sur "master"
+    degrees: Tuple[str, ...]
+    first_names: FrozenSet[str]
+    # Titre de rubrique -> section ("formation" -> "education")
+    section_headings: Tuple[Tuple[str, str], ...]
+    directory: str
+    # Empreinte du contenu des fichiers : change à chaque modification
+    fingerprint: str
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def degree_pattern(self) -> str:
+        return r'(?<!\w)(?:' + '|'.join(re.escape(d) for d in self.degrees) + r')(?!\w)'
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "directory": self.directory,
+            "fingerprint": self.fingerprint,
+            "loaded_at": self.loaded_at,
+            "skip_words": len(self.skip_words),
+            "degrees": len(self.degrees),
+            "degree_stop_words": len(self.degree_stop_words),
+            "first_names": len(self.first_names),
+            "section_headings": len(self.section_headings),
+        }
+
+
+def read_entries(path: str) -> List[str]:
+    """Entrées d'un fichier : une par ligne, en minuscules ; lignes vides et commentaires (#) ignorés."""
+    with open(path, encoding="utf-8") as f:
+        return [line.strip().lower() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def parse_headings(entries: List[str], filename: str) -> Tuple[Tuple[str, str], ...]:
+    """Lignes "section: titre" -> (titre, section), variantes sans accents comprises."""
+    headings = {}
+    for entry in entries:
+        section, separator, heading = entry.partition(":")
+        section, heading = section.strip(), " ".join(heading.split())
+        if not separator or not section.isidentifier() or not heading:
+            raise DictionaryError(f"Ligne invalide dans {filename} : {entry!r} (attendu \"section: titre\")")
+        for variant in (heading, strip_accents(heading)):
+            headings.setdefault(variant, section)
+    return tuple(sorted(headings.items()))
+
+
+def load_dictionaries(directory: Optional[str] = None) -> Dictionaries:
+    """Lit et compile les dictionnaires du dossier ; lève DictionaryError si l'un est inutilisable."""
+    directory = directory or config.DICTIONARY_DIR
+    entries: Dict[str, List[str]] = {}
+    digest = hashlib.sha256()
+    for name, filename in DICTIONARY_FILES.items():
+        path = os.path.join(directory, filename)
+        if name in OPTIONAL_FILES and not os.path.exists(path):
+            entries[name] = []
+            continue
+        try:
+            entries[name] = read_entries(path)
+        except (OSError, UnicodeDecodeError) as e:
+            raise DictionaryError(f"Dictionnaire illisible ({filename}) : {e}") from e
+        if not entries[name] and name not in OPTIONAL_FILES:
+            raise DictionaryError(f"Dictionnaire vide : {filename}")
+        digest.update(filename.encode("utf-8") + b"\0" + "\n".join(entries[name]).encode("utf-8") + b"\0")
+
+    dictionaries = Dictionaries(
+        skip_words=with_unaccented(entries["skip_words"]),
+        degree_stop_words=with_unaccented(entries["degree_stop_words"]),
+        degrees=tuple(sorted(with_unaccented(entries["degrees"]), key=lambda d: (-len(d), d))),
+        first_names=with_unaccented(entries["first_names"]),
+        section_headings=parse_headings(entries["section_headings"], DICTIONARY_FILES["section_headings"]),
+        directory=directory,
+        fingerprint=digest.hexdigest()[:16],
+    )
+    # Compilation immédiate : une expression invalide est détectée au chargement, pas à la requête
+    re.compile(dictionaries.degree_pattern)
+    return dictionaries
+
+
+# Version courante, partagée par les extractions du processus
+_current: Optional[Dictionaries] = None
+_lock = threading.Lock()
+
+
+def get_dictionaries() -> Dictionaries:
+    global _current
+    if _current is None:
+        with _lock:
+            if _current is None:
+                _current = load_dictionaries()
+    return _current
+
+
+def reload_dictionaries(directory: Optional[str] = None) -> Dictionaries:
+    """
+    Relit les fichiers et remplace la version courante. En cas d'erreur, la version
+    précédente reste en place (DictionaryError est propagée).
+    """
+    global _current
+    started = time.perf_counter()
+    dictionaries = load_dictionaries(directory)
+    with _lock:
+        _current = dictionaries
+    logger.info(
+        f"Dictionnaires rechargés en {time.perf_counter() - started:.3f} s "
+        f"({dictionaries.fingerprint}, {len(dictionaries.first_names)} prénoms)"
+    )
+    return dictionaries
+
+
+def dictionaries_fingerprint() -> str:
+    return get_dictionaries().fingerprint
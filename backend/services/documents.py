@@ -0,0 +1,128 @@
+import os
+import re
+import json
+import shutil
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Identifiant d'un document : empreinte SHA-256 hexadécimale de son contenu
+DOCUMENT_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class DocumentStore:
+    """
+    Documents reçus et miniatures de leurs pages, rangés sur disque par empreinte du contenu
+    (partagés entre workers uvicorn). Au-delà de max_bytes, les documents les moins
+    récemment utilisés sont supprimés avec leurs miniatures.
+    """
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._size = sum(
+            os.path.getsize(os.path.join(path, name))
+            for path, _, names in os.walk(root) for name in names
+        )
+
+    def _dir(self, document_id: str) -> str:
+        if not DOCUMENT_ID_RE.match(document_id or ""):
+            raise ValueError(f"Identifiant de document invalide : {document_id!r}")
+        return os.path.join(self.root, document_id[:2], document_id)
+
+    def _write(self, path: str, data: bytes) -> None:
+        # Écriture atomique : un lecteur concurrent ne voit jamais de fichier partiel
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        try:
+            # Fichier réécrit (meta.json) : seule la différence de taille compte
+            replaced = os.path.getsize(path)
+        except OSError:
+            replaced = 0
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._size += len(data) - replaced
+
+    def put(self, document_id: str, content: bytes, content_type: str) -> None:
+        directory = self._dir(document_id)
+        if os.path.exists(os.path.join(directory, "meta.json")):
+            os.utime(directory)
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._write(os.path.join(directory, "document"), content)
+        self.set_meta(document_id, {"content_type": content_type})
+        self.prune()
+
+    def document_path(self, document_id: str) -> Optional[str]:
+        """Chemin du document, ou None s'il est inconnu (ou déjà évincé)."""
+        try:
+            path = os.path.join(self._dir(document_id), "document")
+        except ValueError:
+            return None
+        return path if os.path.exists(path) else None
+
+    def get_meta(self, document_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self._dir(document_id), "meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (ValueError, OSError):
+            return None
+
+    def set_meta(self, document_id: str, meta: Dict[str, Any]) -> None:
+        self._write(os.path.join(self._dir(document_id), "meta.json"), json.dumps(meta).encode("utf-8"))
+
+    def thumbnail_path(self, document_id: str, page: int, width: int) -> str:
+        return os.path.join(self._dir(document_id), f"page{page}_w{width}.png")
+
+    def put_thumbnail(self, document_id: str, page: int, width: int, png: bytes) -> str:
+        path = self.thumbnail_path(document_id, page, width)
+        self._write(path, png)
+        os.utime(self._dir(document_id))
+        return path
+
+    def prune(self) -> None:
+        """Supprime les documents les moins récemment utilisés jusqu'à repasser sous max_bytes."""
+        if self._size <= self.max_bytes:
+            return
+        directories = []
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if os.path.isdir(prefix_dir):
+                directories += [os.path.join(prefix_dir, name) for name in os.listdir(prefix_dir)]
+        directories.sort(key=lambda path: os.stat(path).st_mtime)
+
+        for directory in directories:
+            if self._size <= self.max_bytes:
+                break
+            freed = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+            shutil.rmtree(directory, ignore_errors=True)
+            with self._lock:
+                self._size -= freed
+            logger.info(f"Document évincé du stockage : {os.path.basename(directory)}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"root": self.root, "bytes": self._size, "max_bytes": self.max_bytes}
+
+
+# Stockage partagé par les endpoints (None si CV_DOCUMENT_DIR est vide)
+_store: Optional[DocumentStore] = None
+
+
+def get_document_store() -> Optional[DocumentStore]:
+    global _store
+    if _store is None and config.DOCUMENT_DIR:
+        _store = DocumentStore(config.DOCUMENT_DIR, config.DOCUMENT_STORE_SIZE)
+        logger.info(f"Stockage des documents ouvert : {config.DOCUMENT_DIR}")
+    return _store
+
+
+def close_document_store() -> None:
+    global _store
+    _store = None
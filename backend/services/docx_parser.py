@@ -1,17 +1,150 @@
-from docx import Document
+import re
+import zipfile
 import logging
+from typing import IO, Iterator, List
+from xml.etree.ElementTree import iterparse
+
+import config
+from services.source import DocumentSource, open_source, describe_source
 
 # Configuration du logger pour ce module
 logger = logging.getLogger(__name__)
 
-def extract_text_docx(file_path: str) -> str:
-    """Extrait le texte brut d'un fichier DOCX."""
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Ordre de lecture : en-têtes, corps, puis pieds de page
+HEADER_RE = re.compile(r"^word/header(\d*)\.xml$")
+FOOTER_RE = re.compile(r"^word/footer(\d*)\.xml$")
+BODY_PART = "word/document.xml"
+
+
+class DocxBombError(ValueError):
+    """Archive DOCX suspecte (bombe de décompression)."""
+
+
+class _BoundedReader:
+    """Flux de lecture qui s'interrompt au-delà d'un nombre d'octets décompressés."""
+
+    def __init__(self, stream: IO[bytes], budget: List[int]):
+        self._stream = stream
+        self._budget = budget
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._stream.read(size)
+        self._budget[0] -= len(data)
+        if self._budget[0] < 0:
+            raise DocxBombError("Contenu XML décompressé trop volumineux")
+        return data
+
+
+def _numbered_parts(names, pattern: re.Pattern) -> List[str]:
+    """Parties qui correspondent au motif, triées par numéro (header2 avant header10)."""
+    numbered = []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            numbered.append((int(match.group(1) or 0), name))
+    return [name for _, name in sorted(numbered)]
+
+
+def _text_parts(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """Parties XML contenant du texte, dans l'ordre de lecture, après contrôle anti-bombe."""
+    names = {info.filename: info for info in archive.infolist()}
+    if BODY_PART not in names:
+        raise ValueError("word/document.xml absent : ce n'est pas un DOCX")
+
+    parts = [names[n] for n in _numbered_parts(names, HEADER_RE)]
+    parts.append(names[BODY_PART])
+    parts += [names[n] for n in _numbered_parts(names, FOOTER_RE)]
+
+    for info in parts:
+        if info.compress_size and info.file_size / info.compress_size > config.DOCX_MAX_RATIO:
+            raise DocxBombError(f"Taux de compression suspect pour {info.filename}")
+    return parts
+
+
+def _iter_part_text(stream: IO[bytes]) -> Iterator[str]:
+    """
+    Parcours incrémental d'une partie XML WordprocessingML.
+    Les éléments déjà lus sont libérés au fil de l'eau (mémoire bornée).
+    """
+    stack = []
+    fallback_depth = 0
+    cell_depth = 0
+    run_depth = 0
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == MC_FALLBACK:
+                fallback_depth += 1
+            elif elem.tag == W_NS + "tc":
+                cell_depth += 1
+            elif elem.tag == W_NS + "r":
+                run_depth += 1
+            continue
+
+        stack.pop()
+        tag = elem.tag
+        if tag == W_NS + "r":
+            run_depth -= 1
+        if tag == MC_FALLBACK:
+            # Le contenu de repli duplique celui des zones de texte : ignoré
+            fallback_depth -= 1
+        elif fallback_depth:
+            pass
+        elif tag == W_NS + "t" and elem.text:
+            yield elem.text
+        elif tag == W_NS + "tab" and run_depth:
+            # Hors d'un run (w:pPr/w:tabs), w:tab définit un taquet, pas une tabulation
+            yield "\t"
+        elif tag == W_NS + "br" and elem.get(W_NS + "type") == "page":
+            yield "\f"
+        elif tag in (W_NS + "br", W_NS + "cr"):
+            yield "\n"
+        elif tag == W_NS + "p":
+            # Dans un tableau, les paragraphes d'une cellule restent sur la même ligne
+            yield " " if cell_depth else "\n"
+        elif tag == W_NS + "tc":
+            cell_depth -= 1
+            yield "\t"
+        elif tag == W_NS + "tr":
+            yield "\n"
+
+        # Libération : un bloc de premier niveau du corps (paragraphe, tableau) est terminé
+        if len(stack) <= 2 and stack:
+            stack[-1].clear()
+        else:
+            elem.clear()
+
+
+def iter_text_docx(source: DocumentSource) -> Iterator[str]:
+    """Texte d'un DOCX, lu en flux depuis l'archive (en-têtes, corps avec tableaux, pieds de page)."""
+    budget = [config.DOCX_MAX_XML_BYTES]
+    with zipfile.ZipFile(open_source(source)) as archive:
+        for info in _text_parts(archive):
+            with archive.open(info) as stream:
+                yield from _iter_part_text(_BoundedReader(stream, budget))
+            yield "\n"
+
+
+def extract_text_docx(source: DocumentSource) -> str:
+    """Extrait le texte brut d'un DOCX (chemin, bytes ou flux binaire)."""
+    try:
+        return "".join(iter_text_docx(source))
+    except Exception as e:
+        logger.error(f"Erreur lors de la lecture du DOCX {describe_source(source)}: {e}")
+        raise e
+
+
+def extract_text_docx_python_docx(source: DocumentSource) -> str:
+    """Ancienne implémentation via python-docx (paragraphes du corps uniquement), gardée pour comparaison."""
+    from docx import Document
+
     try:
-        doc = Document(file_path)
-        text = ""
-        for para in doc.paragraphs:
-            text += para.text + "\n"
-        return text
+        doc = Document(open_source(source))
+        return "".join(para.text + "\n" for para in doc.paragraphs)
     except Exception as e:
-        logger.error(f"Erreur lors de la lecture du DOCX {file_path}: {e}")
-        raise e
\ No newline at end of file
+        logger.error(f"Erreur lors de la lecture du DOCX {describe_source(source)}: {e}")
+        raise e
@@ -0,0 +1,258 @@
+import time
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Deque, Dict, Optional
+
+import config
+from services.memory import MB, call_measured, recycle_reason
+from services.metrics import record_queue_rejected, record_queue_wait, record_recycle
+from services.warmup import warm_up_worker
+
+logger = logging.getLogger(__name__)
+
+# Files de priorité, de la plus prioritaire à la moins prioritaire : un worker libéré prend
+# la plus ancienne tâche de la première file non vide (les imports en masse passent après
+# les uploads du frontend, sans leur ajouter de latence)
+INTERACTIVE = "interactive"
+BULK = "bulk"
+LANES = (INTERACTIVE, BULK)
+
+
+class QueueFullError(Exception):
+    """La file d'attente des workers est pleine : la requête doit être rejetée."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("File d'attente pleine")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """
+    Exécute les traitements bloquants (parsing, extraction) hors de la boucle
+    d'événements, sur un pool de threads ou de processus.
+    Le nombre de tâches en attente est borné : au-delà, QueueFullError est levée
+    au lieu de laisser la latence s'accumuler.
+    Au plus `workers` tâches sont confiées au pool ; les autres attendent dans la file de leur
+    priorité (LANES), bornée par `queue_size` (interactive) ou `bulk_queue_size` (bulk).
+    En mode "process", le pool est recyclé (voir recycle_reason) quand un worker garde trop de
+    mémoire ou après un nombre de tâches donné : les nouvelles tâches partent sur un pool neuf,
+    l'ancien termine les siennes puis s'arrête. `initializer` prépare chaque processus du pool
+    (premier pool compris) avant sa première tâche.
+    """
+
+    def __init__(
+        self,
+        kind: str = "process",
+        workers: int = 1,
+        queue_size: int = 0,
+        retry_after: int = 1,
+        initializer: Optional[Callable[[], None]] = None,
+        bulk_queue_size: Optional[int] = None
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Type d'exécuteur inconnu : {kind}")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.queue_sizes = {
+            INTERACTIVE: self.queue_size,
+            BULK: self.queue_size if bulk_queue_size is None else max(0, bulk_queue_size),
+        }
+        self.retry_after = retry_after
+        self.initializer = initializer
+        self._pool: Optional[Executor] = None
+        self._in_flight = 0
+        # Tâches confiées au pool (au plus `workers`) et tâches en attente d'un worker, par file
+        self._running = 0
+        self._waiting: Dict[str, Deque[asyncio.Future]] = {lane: deque() for lane in LANES}
+        self._dispatched = {lane: 0 for lane in LANES}
+        self._lane_rejected = {lane: 0 for lane in LANES}
+        self._wait_seconds = {lane: 0.0 for lane in LANES}
+        self._completed = 0
+        self._rejected = 0
+        self._pool_tasks = 0
+        self._recycled = 0
+        self._worker_rss: Optional[int] = None
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=self.initializer)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="cv-worker")
+            logger.info(f"Exécuteur démarré ({self.kind}, {self.workers} workers, file {self.queue_size})")
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any, lane: str = INTERACTIVE, bounded: bool = True) -> Any:
+        """
+        Soumet une tâche au pool dans la file `lane`, ou lève QueueFullError si aucun worker
+        n'est libre et que la file est pleine. Avec bounded=False, la tâche attend son tour quelle
+        que soit la longueur de la file (l'appelant borne lui-même ses tâches en vol, voir run_batch).
+        """
+        if lane not in self._waiting:
+            raise ValueError(f"File de priorité inconnue : {lane}")
+        if bounded and self._running >= self.workers and len(self._waiting[lane]) >= self.queue_sizes[lane]:
+            self._rejected += 1
+            self._lane_rejected[lane] += 1
+            record_queue_rejected(lane)
+            raise QueueFullError(self.retry_after)
+
+        self._in_flight += 1
+        try:
+            await self._acquire(lane)
+            try:
+                return await self._submit(func, *args)
+            finally:
+                self._release()
+        except BrokenProcessPool:
+            # Un worker a crashé : on reconstruit le pool pour les requêtes suivantes
+            logger.error("Pool de processus cassé, redémarrage.")
+            self.shutdown()
+            raise
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        if self.kind == "thread":
+            return await loop.run_in_executor(pool, func, *args)
+        try:
+            result, error, rss = await loop.run_in_executor(pool, call_measured, func, *args)
+        finally:
+            if pool is self._pool:
+                self._pool_tasks += 1
+        self._worker_rss = rss
+        self._recycle_if_needed(pool, rss)
+        if error is not None:
+            raise error
+        return result
+
+    async def _acquire(self, lane: str) -> None:
+        """Attend un worker libre ; le temps d'attente est mesuré par file."""
+        started = time.perf_counter()
+        if self._running < self.workers:
+            # Des workers libres : aucune tâche n'attend
+            self._running += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiting[lane].append(waiter)
+            try:
+                # _release transmet directement son worker (self._running inchangé)
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.cancelled():
+                    self._waiting[lane].remove(waiter)
+                else:
+                    # Worker reçu mais requête annulée entre-temps : il passe à la tâche suivante
+                    self._release()
+                raise
+        waited = time.perf_counter() - started
+        self._dispatched[lane] += 1
+        self._wait_seconds[lane] += waited
+        record_queue_wait(lane, waited)
+
+    def _release(self) -> None:
+        for lane in LANES:
+            waiting = self._waiting[lane]
+            while waiting:
+                waiter = waiting.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self._running -= 1
+
+    def _recycle_if_needed(self, pool: Executor, rss: Optional[int]) -> None:
+        if pool is not self._pool:
+            return  # pool déjà remplacé
+        reason = recycle_reason(self._pool_tasks, self.workers, rss)
+        if reason is None:
+            return
+        logger.warning(
+            f"Recyclage des workers ({reason} : {self._pool_tasks} tâches, "
+            f"RSS {(rss or 0) // MB} Mo)"
+        )
+        self._replace_pool(reason)
+
+    def recycle(self, reason: str) -> bool:
+        """
+        Remplace le pool de processus (par exemple après un rechargement des dictionnaires :
+        les nouveaux workers héritent de l'état courant du processus principal).
+        Retourne False en mode "thread" ou si aucun pool n'est encore démarré.
+        """
+        if self.kind != "process" or self._pool is None:
+            return False
+        logger.info(f"Recyclage des workers ({reason})")
+        self._replace_pool(reason)
+        return True
+
+    def _replace_pool(self, reason: str) -> None:
+        pool = self._pool
+        self._pool = None
+        self._pool_tasks = 0
+        self._recycled += 1
+        record_recycle("executor", reason)
+        # Sans annulation : les tâches en cours sur l'ancien pool se terminent normalement
+        pool.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": self._in_flight,
+            "queued": sum(len(waiting) for waiting in self._waiting.values()),
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "recycled": self._recycled,
+            "pool_tasks": self._pool_tasks,
+            "worker_rss": self._worker_rss,
+            "lanes": {
+                lane: {
+                    "queue_size": self.queue_sizes[lane],
+                    "queued": len(self._waiting[lane]),
+                    "dispatched": self._dispatched[lane],
+                    "rejected": self._lane_rejected[lane],
+                    "wait_seconds": round(self._wait_seconds[lane], 6),
+                }
+                for lane in LANES
+            },
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Exécuteur partagé par les endpoints interactifs
+_executor: Optional[BoundedExecutor] = None
+
+
+def get_executor() -> BoundedExecutor:
+    global _executor
+    if _executor is None:
+        _executor = BoundedExecutor(
+            kind=config.EXECUTOR_KIND,
+            workers=config.EXECUTOR_WORKERS,
+            queue_size=config.EXECUTOR_QUEUE_SIZE,
+            retry_after=config.EXECUTOR_RETRY_AFTER,
+            initializer=warm_up_worker if config.WARMUP else None,
+            bulk_queue_size=config.EXECUTOR_BULK_QUEUE_SIZE
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -1,139 +1,27 @@
 import re
-import unicodedata
+import time
 import logging
-from typing import Tuple, List, Set
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from services.dictionaries import Dictionaries, get_dictionaries
+from services.normalizer import NormalizedText, normalize_text
+from services.phones import find_phone
+from services.sections import CONTACT, EDUCATION, EXPERIENCE, HEADER, SectionIndex, segment
 
 # --- CONFIGURATION LOGGING ---
 logger = logging.getLogger(__name__)
 
 # --- CONSTANTES DE CONFIGURATION ---
 
-# Mots à ignorer lors de l'analyse (dates, structure, soft skills...)
-SKIP_KEYWORDS: Set[str] = {
-    # Temporel
-    "janvier", "février", "mars", "avril", "mai", "juin",
-    "juillet", "août", "aout", "septembre", "octobre", "novembre", "décembre",
-    "january", "february", "march", "april", "may", "june",
-    "july", "august", "september", "october", "november", "december",
-    "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "oct", "nov", "dec",
-    "lundi", "mardi", "mercredi", "jeudi", "vendredi", "samedi", "dimanche",
-    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
-    "aujourd'hui", "today", "now", "present", "présent", "actuel", "current",
-    "année", "year", "ans", "years", "mois", "month", "months",
-    "semaine", "week", "jour", "day", "date", "durée", "duration", "période", "period",
-    "depuis", "since", "pendant", "during", "vers", "about",
-
-    # Structure CV & Rubriques
-    "curriculum", "vitae", "resume", "cv", "profil", "profile", "portfolio",
-    "formation", "education", "enseignement", "academic", "background",
-    "expérience", "experience", "expériences", "professionnelle", "work", "history",
-    "compétences", "skills", "technologies", "tech", "technical", "aptitudes",
-    "langues", "languages", "langue", "linguistique",
-    "projets", "projects", "réalisations", "achievements",
-    "certifications", "diplômes", "degrees", "certificats", "brevets",
-    "intérêts", "hobbies", "loisirs", "activités", "interests", "activities",
-    "sommaire", "summary", "objectif", "objective", "about", "me", "infos",
-    "références", "references", "annexes", "appendix", "divers", "miscellaneous",
-
-    # Identité Professionnelle
-    "développeur", "developer", "dev", "prog", "coder", "programmer",
-    "ingénieur", "engineer", "engineering", "génie",
-    "stagiaire", "stage", "intern", "internship", "trainee",
-    "alternant", "alternance", "apprenti", "apprentissage", "apprentice",
-    "étudiant", "student", "élève", "pupil", "graduate", "alumni",
-    "data", "scientist", "analyst", "architecte", "architect",
-    "manager", "lead", "chef", "directeur", "director", "head", "vp",
-    "consultant", "expert", "spécialiste", "specialist",
-    "technicien", "technician", "support", "admin", "administrator",
-    "fullstack", "backend", "frontend", "devops", "sysadmin", "network",
-    "freelance", "indépendant", "contractor", "employé", "employee",
-    "junior", "senior", "medior", "confirmé", "confirmed", "lead",
-
-    # Coordonnées
-    "tél", "tel", "phone", "mobile", "cell", "fixe", "fax", "gsm",
-    "email", "mail", "e-mail", "courriel", "contact", "coordonnées",
-    "gmail", "outlook", "hotmail", "yahoo", "icloud", "protonmail",
-    "adresse", "address", "domicile", "home", "location", "localisation",
-    "rue", "street", "avenue", "boulevard", "bvd", "impasse", "allée", "place",
-    "route", "chemin", "road", "way", "lane", "drive",
-    "code", "postal", "zip", "cedex", "bp", "appartement", "apt", "étage", "floor",
-    "ville", "city", "pays", "country", "france", "paris", "lyon", "marseille",
-    "région", "region", "province", "state", "district",
-    "linkedin", "github", "gitlab", "bitbucket", "site", "web", "website", "url",
-
-    # Grammaire & Mots courants
-    "le", "la", "l", "les", "un", "une", "des", "du", "de", "d",
-    "mon", "ma", "mes", "ton", "ta", "tes", "son", "sa", "ses", "notre", "votre", "leur",
-    "je", "tu", "il", "elle", "nous", "vous", "ils", "elles", "moi", "toi",
-    "ce", "cet", "cette", "ces", "celui", "celle", "ceux", "celles",
-    "qui", "que", "quoi", "dont", "où",
-    "en", "au", "aux", "à", "a", "dans", "par", "pour", "sur", "avec", "et", "ou", "ni", "car",
-    "mais", "donc", "or", "sans", "sous", "chez", "vers",
-    "the", "a", "an", "this", "that", "these", "those",
-    "my", "your", "his", "her", "its", "our", "their",
-    "i", "you", "he", "she", "it", "we", "they", "me", "us", "them",
-    "of", "in", "to", "for", "with", "and", "or", "but", "nor", "so", "yet",
-    "at", "from", "on", "by", "about", "into", "through", "over", "before", "after",
-
-    # Action & État
-    "disponible", "available", "immédiat", "immediate", "immediately",
-    "partir", "starting", "démarrage", "start",
-    "né", "born", "date", "naissance", "birth", "age", "âge",
-    "permis", "driver", "license", "driving", "b", "a", "vehicule", "voiture", "car",
-    "recherche", "cherche", "seeking", "looking", "search", "demande",
-    "souhaite", "wish", "aimerait", "would", "like",
-    "objectif", "goal", "target", "mission", "vision",
-    "mention", "spécialité", "option", "niveau", "level", "grade",
-    "admis", "admitted", "obtenu", "obtained", "validé", "validated",
-
-    # Soft Skills
-    "dynamique", "dynamic", "motivé", "motivated", "sérieux", "serious",
-    "curieux", "curious", "autonome", "autonomous", "rigueur", "rigorous",
-    "équipe", "team", "teamwork", "relationnel", "relational",
-    "créatif", "creative", "polyvalent", "versatile", "organisé", "organized",
-    "ponctuel", "punctual", "sociable", "leadership", "management"
-}
-
-# Liste des diplômes connus
-RAW_DEGREES: List[str] = [
-    "doctorat", "phd", "ph.d", "docteur",
-    "diplôme d'ingénieur", "ingénierie", "ingénieur",
-    "master of science", "master", "msc", "m.sc",
-    "master of business administration", "mba",
-    "mastère", "mastere", "dea", "dess",
-    "bachelor universitaire de technologie", "but", "bachelor", "bachelors",
-    "b.sc", "b.a", "b.eng", "b.b.a", "b.f.a", "b.tech",
-    "licence professionnelle", "licence pro", "licence",
-    "brevet de technicien supérieur", "bts",
-    "diplôme universitaire de technologie", "dut",
-    "deug",
-    "baccalauréat", "bac"
-]
-
-# Mots d'arrêt pour la détection de la spécialité du diplôme
-DEGREE_STOP_WORDS: Set[str] = {
-    # Articles & Prépositions
-    "le", "la", "l", "les", "un", "une", "des", "du", "de", "d",
-    "en", "au", "aux", "à", "a", "dans", "par", "pour", "sur", "avec", 
-    "et", "ou", "ni", "car", "sans", "sous", "vers", "chez",
-    "the", "a", "an", "of", "in", "to", "for", "with", "and", "&", "or",
-    "at", "from", "on", "by", "about",
-
-    # Vocabulaire Académique / Structure
-    "mention", "spécialité", "spécialisation", "option", "filière", "parcours",
-    "cursus", "orientation", "branche", "domaine", "intitulé",
-    "niveau", "grade", "titre", "diplôme", "certificat",
-    "majeure", "mineure", "module", "uv",
-    "major", "minor", "specialization", "speciality", "focus", "track",
-    "emphasis", "stream", "field", "branch", "concentration",
-    "degree", "diploma", "honours", "hons", "award",
-
-    # Parasites (Lieux, Dates, Institutions) 
-    "université", "university", "école", "school", "institute", "institut",
-    "faculté", "faculty", "academy", "académie",
-    "paris", "lyon", "marseille", "france",
-    "mars", "avril", "mai", "juin", "juillet", "septembre", "octobre"
-}
+# Version de la logique d'extraction : à incrémenter à chaque changement de résultat
+# (invalide le cache des résultats)
+EXTRACTOR_VERSION = "11"
+
+# Valeur retournée quand un champ n'est pas trouvé
+NOT_FOUND = "Non trouvé"
+
+# Mots ignorés, diplômes et prénoms : fichiers de CV_DICTIONARY_DIR (voir services.dictionaries)
 
 
 # --- FONCTIONS UTILITAIRES ---
@@ -141,62 +29,298 @@ DEGREE_STOP_WORDS: Set[str] = {
 def clean_text(text: str) -> str:
     """
     Normalise le texte : mise en minuscules, suppression des espaces multiples
-    et suppression des accents.
+    et suppression des accents. Les sauts de ligne et de page sont conservés.
     """
     if not text:
         return ""
 
     try:
-        text = text.lower()
-        
-        replacements = {
-            'œ': 'oe', 'æ': 'ae', '€': ' euro ',
-            '’': "'", '‘': "'", '–': "-"
-        }
-        for char, repl in replacements.items():
-            text = text.replace(char, repl)
-
-        text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8')
-        return re.sub(r'\s+', ' ', text).strip()
-    
+        return normalize_text(text)
     except Exception as e:
         logger.warning(f"Echec du nettoyage de texte : {e}")
         return text
 
 
-# --- FONCTIONS D'EXTRACTION ---
+# --- MOTEUR D'EXTRACTION ---
 
-def extract_email(text: str) -> str:
-    """Extrait le premier email trouvé."""
-    if not text: 
-        return "Non trouvé"
+EMAIL_PATTERN = r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'
 
-    try:
-        match = re.search(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+', text)
-        return match.group(0) if match else "Non trouvé"
-    except Exception as e:
-        logger.error(f"Erreur regex email : {e}")
-        return "Non trouvé"
+# Champs cherchés dans le texte (le nom est déduit de l'en-tête)
+SCAN_FIELDS = ("email", "phone", "degree")
+ALL_FIELDS = ("name",) + SCAN_FIELDS
 
+# Nombre de lignes d'en-tête examinées pour le nom
+HEADER_LINES = 5
 
-def extract_phone(text: str) -> str:
-    """Extrait le téléphone en filtrant les années (ex: 2025-2028)."""
-    if not text: 
-        return "Non trouvé"
 
-    pattern = r'(\+?\d{1,3}[\s.-]?)?((?:\d[\s.-]?){7,14}\d)'
+_EMAIL_RE = re.compile(EMAIL_PATTERN)
 
-    try:
-        for match in re.finditer(pattern, text):
-            phone = match.group(0).strip()
-            # Protection contre les années
-            if re.match(r'^\d{4}(-\d{2,4})?$', phone):
+# Caractères de la partie locale d'un email (voir EMAIL_PATTERN)
+_EMAIL_LOCAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-")
+
+
+@lru_cache(maxsize=2)
+def _degree_re(dictionaries: Dictionaries) -> "re.Pattern":
+    """Diplômes connus, en une seule expression compilée une fois par version des dictionnaires."""
+    return re.compile(dictionaries.degree_pattern, re.IGNORECASE)
+
+
+_NAME_WORD_RE = re.compile(r'\b[A-Za-zÀ-ÿ]{3,}\b')
+_TOKEN_RE = re.compile(r'\S+')
+_LINE_RE = re.compile(r'[^\n\f\r\v]*\S[^\n\f\r\v]*')
+_DIGITS_RE = re.compile(r'\d+')
+_EMAIL_SPLIT_RE = re.compile(r'[._-]')
+_LINE_END_RE = re.compile(r'[\n\f\r\v]')
+
+
+def _degree_title(text: str, match: "re.Match", stop_words: FrozenSet[str], end: Optional[int] = None) -> str:
+    """
+    Construit 'Diplôme Spécialité' à partir du diplôme trouvé et des mots suivants,
+    sur la même ligne (la ligne suivante peut être un email ou un autre champ) et avant `end`.
+    """
+    degree = match.group(0).lower().capitalize()
+
+    limit = len(text) if end is None else end
+    line_end = _LINE_END_RE.search(text, match.end(), limit)
+    if line_end is not None:
+        limit = line_end.start()
+
+    # Recherche de la spécialité dans les mots suivants
+    specialty_parts = []
+    for index, token in enumerate(_TOKEN_RE.finditer(text, match.end(), limit)):
+        if index >= 9:
+            break
+        clean_word = token.group(0).lower().replace(".", "").replace(",", "").replace("'", "")
+
+        if clean_word in stop_words or clean_word.isdigit():
+            continue
+
+        #rendre la spécialité de 2 mots uniquement
+        specialty_parts.append(clean_word.capitalize())
+        if len(specialty_parts) >= 2:
+            break
+
+    return f"{degree} {' '.join(specialty_parts)}".strip()
+
+
+def _header_lines(text: str, span: Tuple[int, int], count: int = HEADER_LINES) -> Iterator[str]:
+    """Premières lignes non vides de la zone, sans découper le reste du document."""
+    for index, match in enumerate(_LINE_RE.finditer(text, *span)):
+        if index >= count:
+            break
+        yield match.group(0)
+
+
+def _name_from_header(text: str, span: Tuple[int, int], dictionaries: Dictionaries) -> Optional[Tuple[str, str]]:
+    """
+    Cherche prénom et nom dans les premières lignes (en-tête du CV). La première ligne dont
+    l'un des deux mots retenus est un prénom connu l'emporte, dans l'ordre prénom puis nom
+    ("DUPONT Jean" -> Jean Dupont) ; à défaut, la première ligne de deux mots retenus.
+    """
+    skip_words, first_names = dictionaries.skip_words, dictionaries.first_names
+    fallback = None
+    for line in _header_lines(text, span):
+        candidates = _NAME_WORD_RE.findall(line)
+        valid_words = [w for w in candidates if w.lower() not in skip_words]
+        if len(valid_words) < 2:
+            continue
+
+        first, last = valid_words[0].capitalize(), valid_words[1].capitalize()
+        if first.lower() in first_names:
+            return first, last
+        if last.lower() in first_names:
+            return last, first
+        if fallback is None:
+            fallback = first, last
+    return fallback
+
+
+def _name_from_email(email: str) -> Optional[Tuple[str, str]]:
+    """Devine prénom et nom depuis la partie locale de l'email (ex: jean.dupont@...)."""
+    # Nettoyage de la partie locale (avant @) pour retirer les chiffres
+    local_part = _DIGITS_RE.sub('', email.split("@")[0])
+    valid_parts = [p for p in _EMAIL_SPLIT_RE.split(local_part) if len(p) >= 2]
+
+    if len(valid_parts) >= 2:
+        return valid_parts[0].capitalize(), valid_parts[1].capitalize()
+    return None
+
+
+def _degrees_in(
+    text: str,
+    spans: List[Tuple[int, int]],
+    dictionaries: Dictionaries,
+    first_only: bool = False
+) -> List[Tuple[str, Tuple[int, int]]]:
+    """
+    Diplômes des zones, dans l'ordre et sans doublon : (titre, position). Un seul par ligne
+    (le plus long reconnu en premier : "Bachelor universitaire de technologie (BUT)" n'en donne qu'un) ;
+    la spécialité d'un diplôme s'arrête au diplôme suivant.
+    """
+    pattern = _degree_re(dictionaries)
+    degrees: Dict[str, Tuple[int, int]] = {}
+    for start, end in spans:
+        matches: List["re.Match"] = []
+        line_end = start
+        for match in pattern.finditer(text, start, end):
+            if match.start() < line_end:
                 continue
-            return phone
+            matches.append(match)
+            if first_only:
+                break
+            next_line = _LINE_END_RE.search(text, match.end(), end)
+            line_end = next_line.start() if next_line else end
+        for match, following in zip(matches, matches[1:] + [None]):
+            title = _degree_title(text, match, dictionaries.degree_stop_words, following.start() if following else end)
+            degrees.setdefault(title, match.span())
+        if first_only and degrees:
+            break
+    return list(degrees.items())
+
+
+def _find_email(text: str, start: int, end: int) -> Optional["re.Match"]:
+    """
+    Premier email de text[start:end], même résultat que _EMAIL_RE.search : chaque "@" est repéré
+    par une recherche de caractère, puis l'email est relu autour. Le texte n'est pas parcouru par
+    l'expression, dont le coût dominait les zones sans email.
+    """
+    at = text.find("@", start, end)
+    while at != -1:
+        begin = at
+        while begin > start and text[begin - 1] in _EMAIL_LOCAL_CHARS:
+            begin -= 1
+        email = _EMAIL_RE.match(text, begin, end) if begin < at else None
+        if email is not None:
+            return email
+        at = text.find("@", at + 1, end)
+    return None
+
+
+def _scan_contacts(text: str, spans: List[Tuple[int, int]], missing: Set[str], found: Dict[str, Any]) -> None:
+    """Cherche les coordonnées de `missing` (email, téléphone) dans les zones, dans l'ordre."""
+    for start, end in spans:
+        if "email" in missing:
+            email = _find_email(text, start, end)
+            if email is not None:
+                found["email"] = email.group(0)
+                found["spans"]["email"] = email.span()
+                missing.discard("email")
+        if "phone" in missing:
+            phone = find_phone(text, None, start, end)
+            if phone is not None:
+                found["phone"] = phone.raw
+                found["spans"]["phone"] = phone.span
+                missing.discard("phone")
+        if not missing:
+            return
+
+
+def _uncovered(spans: List[Tuple[int, int]], length: int) -> List[Tuple[int, int]]:
+    """Zones du texte hors de `spans` (positions triées, sans chevauchement)."""
+    gaps = []
+    position = 0
+    for start, end in spans:
+        if start > position:
+            gaps.append((position, start))
+        position = max(position, end)
+    if position < length:
+        gaps.append((position, length))
+    return gaps
+
+
+def _outside(text: str, index: SectionIndex, *excluded: str) -> List[Tuple[int, int]]:
+    return [(s.start, s.end) for s in index.sections if s.name not in excluded] or [(0, len(text))]
+
+
+def extract_fields(
+    text: str,
+    fields: Iterable[str] = ALL_FIELDS,
+    timings: Optional[Dict[str, float]] = None,
+    sections: Optional[SectionIndex] = None,
+    source: Optional[NormalizedText] = None
+) -> Dict[str, Any]:
+    """
+    Extrait les champs demandés, chacun dans ses sections (voir services.sections) :
+    - nom : lignes de l'en-tête (texte avant le premier titre de rubrique) ;
+    - email, téléphone : en-tête et rubrique de coordonnées d'abord, puis le reste du texte (jamais
+      relu) pour les champs encore manquants ;
+    - diplômes : tous ceux de la rubrique Formation ; sans cette rubrique, le premier trouvé
+      hors des expériences.
+    `sections` est le découpage de `text` (calculé s'il n'est pas fourni).
+    Retourne un dict : email, phone, degree (str), degrees (diplômes de la rubrique Formation),
+    name (tuple prénom, nom) et spans (position (début, fin) de chaque champ trouvé dans `text`).
+    Si `source` (normalisation de `text` avec ses positions) est fourni, raw_spans donne aussi
+    la position de chaque champ trouvé dans le texte brut.
+    Si `timings` est fourni, y cumule la durée du parcours (extract_scan) et du nom (extract_name).
+    """
+    wanted = set(fields)
+    found: Dict[str, Any] = {field: NOT_FOUND for field in SCAN_FIELDS}
+    found["name"] = (NOT_FOUND, NOT_FOUND)
+    found["degrees"] = []
+    found["spans"] = {}
+    if not text:
+        return found
+
+    # Le nom a besoin de l'email en repli
+    if "name" in wanted:
+        wanted.add("email")
+    dictionaries = get_dictionaries()
+
+    started = time.perf_counter()
+    index = sections if sections is not None else segment(text, dictionaries=dictionaries)
+    try:
+        missing = wanted & {"email", "phone"}
+        if missing:
+            contact_spans = index.spans(HEADER, CONTACT)
+            _scan_contacts(text, contact_spans, missing, found)
+            _scan_contacts(text, _uncovered(contact_spans, len(text)), missing, found)
+
+        if "degree" in wanted:
+            education = index.spans(EDUCATION)
+            if education:
+                degrees = _degrees_in(text, education, dictionaries)
+                found["degrees"] = [title for title, _ in degrees]
+            else:
+                degrees = _degrees_in(text, _outside(text, index, EXPERIENCE), dictionaries, first_only=True)
+            if degrees:
+                found["degree"], found["spans"]["degree"] = degrees[0]
     except Exception as e:
-        logger.error(f"Erreur regex téléphone : {e}")
+        logger.error(f"Erreur lors du parcours du texte : {e}")
+    scanned = time.perf_counter()
+
+    if "name" in wanted:
+        try:
+            header = (index.spans(HEADER) or [(0, len(text))])[0]
+            name = _name_from_header(text, header, dictionaries)
+            if name is None and found["email"] != NOT_FOUND:
+                name = _name_from_email(found["email"])
+            if name is not None:
+                found["name"] = name
+        except Exception as e:
+            logger.error(f"Erreur extraction nom : {e}")
+
+    if source is not None:
+        found["raw_spans"] = {name: source.raw_span(*span) for name, span in found["spans"].items()}
+
+    if timings is not None:
+        timings["extract_scan"] = timings.get("extract_scan", 0.0) + scanned - started
+        timings["extract_name"] = timings.get("extract_name", 0.0) + time.perf_counter() - scanned
+    return found
+
+
+# --- FONCTIONS D'EXTRACTION ---
 
-    return "Non trouvé"
+def extract_email(text: str) -> str:
+    """Extrait le premier email trouvé."""
+    return extract_fields(text, ("email",))["email"]
+
+
+def extract_phone(text: str) -> str:
+    """
+    Extrait le premier numéro valide pour son pays (les années, plages de dates et
+    identifiants ne respectent pas les règles de longueur des numéros).
+    """
+    return extract_fields(text, ("phone",))["phone"]
 
 
 def extract_name(text: str) -> Tuple[str, str]:
@@ -204,72 +328,18 @@ def extract_name(text: str) -> Tuple[str, str]:
     Extrait le prénom et le nom.
     Priorité : En-tête du CV sinon Deviné via l'email.
     """
-    if not text: 
-        return "Non trouvé", "Non trouvé"
-
-    try:
-        # Recherche dans les 5 premières lignes
-        lines = text.splitlines()[:5]
-
-        for line in lines:
-            candidates = re.findall(r'\b[A-Za-zÀ-ÿ]{3,}\b', line)
-            valid_words = [w for w in candidates if w.lower() not in SKIP_KEYWORDS]
-            
-            if len(valid_words) >= 2:
-                return valid_words[0].capitalize(), valid_words[1].capitalize()
-
-        # Si échec, tentative via l'email
-        email = extract_email(text)
-        if email and email != "Non trouvé":
-            # Nettoyage de la partie locale (avant @) pour retirer les chiffres
-            local_part = re.sub(r'\d+', '', email.split("@")[0])
-            parts = re.split(r'[._-]', local_part)
-            
-            valid_parts = [p for p in parts if len(p) >= 2]
-            
-            if len(valid_parts) >= 2:
-                return valid_parts[0].capitalize(), valid_parts[1].capitalize()
-    
-    except Exception as e:
-        logger.error(f"Erreur extraction nom : {e}")
-
-    return "Non trouvé", "Non trouvé"
+    return extract_fields(text, ("name",))["name"]
 
 
 def extract_degree(text: str) -> str:
     """
-    Recherche un diplôme connu et tente d'extraire la spécialité associée.
+    Recherche un diplôme connu (dans la rubrique Formation si elle existe) et tente
+    d'extraire la spécialité associée.
     Ex: 'BUT Informatique de Gestion' -> 'But Informatique Gestion'
     """
-    if not text:
-        return "Non trouvé"
+    return extract_fields(text, ("degree",))["degree"]
 
-    try:
-        words = re.findall(r"[^\s]+", text.lower())
-
-        for i, word in enumerate(words):
-            if word in RAW_DEGREES:
-                #extraction diplome
-                degree = word.capitalize()
-                
-                # Recherche de la spécialité dans les mots suivants
-                specialty_parts = []
-                
-                for next_word in words[i + 1 : i + 10]:
-                    clean_word = next_word.replace(".", "").replace(",", "").replace("'", "")
-                    
-                    if clean_word in DEGREE_STOP_WORDS or clean_word.isdigit():
-                        continue
-                    
-                    #rendre la spécialité de 2 mots uniquement
-                    specialty_parts.append(clean_word.capitalize())
-                    if len(specialty_parts) >= 2:
-                        break
-                
-                full_title = f"{degree} {' '.join(specialty_parts)}".strip()
-                return full_title
-
-    except Exception as e:
-        logger.error(f"Erreur inattendue lors de l'extraction du diplôme : {e}")
 
-    return "Non trouvé"
\ No newline at end of file
+def extract_degrees(text: str) -> List[str]:
+    """Tous les diplômes de la rubrique Formation (liste vide sans cette rubrique)."""
+    return extract_fields(text, ("degree",))["degrees"]
@@ -0,0 +1,157 @@
+import io
+import zipfile
+import logging
+from typing import Callable, Collection, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from services.pipeline import PDF_MIME, DOCX_MIME, DocumentError
+from services.metrics import record_upload
+
+logger = logging.getLogger(__name__)
+
+# --- RÉCEPTION DES FICHIERS ---
+# Lecture par blocs avec taille maximale, et type détecté d'après le contenu
+# (signature des premiers octets) plutôt que d'après l'en-tête envoyé par le client.
+
+CHUNK_SIZE = 64 * 1024
+SNIFF_SIZE = 1024
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+DOCX_BODY_PART = "word/document.xml"
+
+# Marge tolérée pour l'enveloppe multipart (en-têtes, séparateurs)
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def looks_like_document(head: bytes) -> bool:
+    """Les premiers octets correspondent-ils à un PDF ou à une archive ZIP (DOCX) ?"""
+    return PDF_MAGIC in head[:SNIFF_SIZE] or head.startswith(ZIP_MAGIC)
+
+
+def sniff_content_type(content: bytes) -> Optional[str]:
+    """
+    Type MIME déduit du contenu : `%PDF-` dans le premier Ko (les lecteurs tolèrent
+    quelques octets parasites avant), ou archive ZIP contenant word/document.xml.
+    """
+    if PDF_MAGIC in content[:SNIFF_SIZE]:
+        return PDF_MIME
+    if content.startswith(ZIP_MAGIC):
+        try:
+            # Seul le répertoire central (fin de l'archive) est lu
+            with zipfile.ZipFile(io.BytesIO(content)) as archive:
+                archive.getinfo(DOCX_BODY_PART)
+            return DOCX_MIME
+        except (zipfile.BadZipFile, KeyError):
+            return None
+    return None
+
+
+def size_limit_detail(max_size: int) -> str:
+    return f"Fichier trop volumineux (max {max_size // (1024 * 1024)} Mo)."
+
+
+def batch_size_limit_detail(max_size: int) -> str:
+    return f"Lot trop volumineux (max {max_size // (1024 * 1024)} Mo)."
+
+
+def content_length_exceeds(headers: Mapping[str, str], max_size: int) -> bool:
+    """Rejet anticipé d'après Content-Length, avant même la lecture du corps de la requête."""
+    length = headers.get("content-length", "")
+    return length.isdigit() and int(length) > max_size + MULTIPART_OVERHEAD
+
+
+class UploadSizeLimit:
+    """
+    Middleware ASGI des routes d'upload (une instance par limite). Un envoi annoncé trop volumineux
+    (Content-Length) est refusé en 413 sans lire le corps ; sinon les octets des messages
+    http.request sont comptés au fil de la réception, et la lecture s'interrompt en 413 dès que
+    la limite est dépassée : un corps envoyé par blocs (Transfer-Encoding: chunked), sans
+    Content-Length, n'est pas mis en tampon en entier avant d'être refusé.
+    Les rejets sont comptés dans les métriques d'upload (type de contenu encore inconnu).
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        paths: Collection[str],
+        max_size: Callable[[], int],
+        detail: Callable[[int], str] = size_limit_detail
+    ):
+        self.app = app
+        self.paths = paths
+        # Lue à chaque requête (configuration modifiable à chaud, tests)
+        self.max_size = max_size
+        self.detail = detail
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        max_size = self.max_size()
+        headers = Headers(scope=scope)
+        if content_length_exceeds(headers, max_size):
+            logger.warning(f"Envoi rejeté : Content-Length {headers['content-length']}")
+            record_upload(None, 413, {})
+            response = JSONResponse(status_code=413, content={"detail": self.detail(max_size)})
+            await response(scope, receive, send)
+            return
+
+        limit = max_size + MULTIPART_OVERHEAD
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    logger.warning(f"Envoi rejeté : plus de {limit} octets reçus sur {scope['path']}")
+                    record_upload(None, 413, {})
+                    # Relevée par FastAPI pendant la lecture du formulaire : réponse 413
+                    raise HTTPException(status_code=413, detail=self.detail(max_size))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def read_upload(upload: UploadFile, max_size: int, check_signature: bool = False) -> bytes:
+    """
+    Lit un fichier reçu par blocs de CHUNK_SIZE et s'interrompt dès que max_size est dépassé (413).
+    Avec check_signature, un contenu qui n'est ni un PDF ni un ZIP est rejeté (400)
+    dès le premier bloc, sans lire la suite.
+    """
+    chunks = []
+    size = 0
+    while True:
+        chunk = await upload.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        if check_signature and not chunks and not looks_like_document(chunk):
+            logger.warning(f"Signature non reconnue : {upload.filename}")
+            raise DocumentError(400, "Format non supporté. Utilisez PDF ou DOCX.")
+        size += len(chunk)
+        if size > max_size:
+            logger.warning(f"Fichier rejeté (plus de {max_size} octets) : {upload.filename}")
+            raise DocumentError(413, size_limit_detail(max_size))
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+async def ingest_upload(upload: UploadFile, max_size: int) -> Tuple[bytes, str]:
+    """Lecture bornée puis détection du type : retourne (contenu, type MIME détecté)."""
+    content = await read_upload(upload, max_size, check_signature=True)
+    if not content:
+        raise DocumentError(400, "Fichier vide.")
+    content_type = sniff_content_type(content)
+    if content_type is None:
+        logger.warning(f"Format rejeté : {upload.filename} ({upload.content_type})")
+        raise DocumentError(400, "Format non supporté. Utilisez PDF ou DOCX.")
+    if content_type != upload.content_type:
+        logger.info(f"Type corrigé d'après le contenu : {upload.content_type} -> {content_type}")
+    return content, content_type
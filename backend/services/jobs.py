@@ -0,0 +1,266 @@
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import config
+from services.batch import run_batch
+
+logger = logging.getLogger(__name__)
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+# Purge des jobs terminés trop anciens : à l'ouverture, puis toutes les PURGE_EVERY fins de job
+PURGE_EVERY = 100
+
+
+class JobStore:
+    """
+    File de jobs persistée dans SQLite : survit aux redémarrages et peut être
+    partagée par plusieurs workers uvicorn (réservation atomique des jobs).
+    Chaque réservation reçoit un jeton : le bail n'est renouvelé et le résultat
+    n'est enregistré que par le détenteur de la réservation en cours.
+    Les jobs terminés depuis plus de `ttl` secondes sont supprimés (0 : jamais).
+    """
+
+    def __init__(self, db_path: str, lease: float = 300, ttl: float = 86400, purge_every: int = PURGE_EVERY):
+        self.db_path = db_path
+        self.lease = lease
+        self.ttl = ttl
+        self.purge_every = max(1, purge_every)
+        self._completions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, filename TEXT, content_type TEXT, "
+            "payload BLOB, result TEXT, error TEXT, status_code INTEGER, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, claim TEXT)"
+        )
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "claim" not in columns:
+            # Base créée avant les jetons de réservation
+            self._db.execute("ALTER TABLE jobs ADD COLUMN claim TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (status, updated_at)")
+        self._purge(time.time())
+
+    def create(self, filename: str, content: bytes, content_type: Optional[str]) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, status, filename, content_type, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, filename, content_type, content, now, now)
+            )
+        return job_id
+
+    def claim_next(self) -> Optional[sqlite3.Row]:
+        """
+        Réserve le plus ancien job en attente (ou dont le bail a expiré).
+        La ligne renvoyée porte le jeton de la réservation (`claim`).
+        """
+        now = time.time()
+        claim = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE status = ? OR (status = ? AND updated_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now - self.lease)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = ?, updated_at = ?, claim = ? WHERE id = ?",
+                        (RUNNING, now, claim, row["id"])
+                    )
+                    row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                self._db.execute("COMMIT")
+                return row
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def renew(self, job_id: str, claim: str) -> bool:
+        """Prolonge le bail d'un job en cours ; False si la réservation a été perdue."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND status = ? AND claim = ?",
+                (time.time(), job_id, RUNNING, claim)
+            )
+        return cursor.rowcount > 0
+
+    def complete(
+        self,
+        job_id: str,
+        claim: str,
+        status_code: int,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str]
+    ) -> bool:
+        """
+        Enregistre le résultat et libère le contenu du fichier.
+        Sans effet (False) si le job a été repris entre-temps par une autre réservation.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, status_code = ?, result = ?, error = ?, payload = NULL, "
+                "updated_at = ? WHERE id = ? AND status = ? AND claim = ?",
+                (DONE if status_code == 200 else FAILED, status_code,
+                 json.dumps(result, ensure_ascii=False) if result is not None else None,
+                 error, now, job_id, RUNNING, claim)
+            )
+            if cursor.rowcount:
+                self._completions += 1
+                if self._completions % self.purge_every == 0:
+                    self._purge(now)
+        return cursor.rowcount > 0
+
+    def _purge(self, now: float) -> None:
+        if self.ttl <= 0:
+            return
+        deleted = self._db.execute(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", (DONE, FAILED, now - self.ttl)
+        ).rowcount
+        if deleted:
+            logger.info(f"File de jobs : {deleted} job(s) terminé(s) supprimé(s)")
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, status, filename, result, error, status_code, created_at, updated_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class JobRunner:
+    """Workers asynchrones qui consomment la file de jobs et analysent les documents."""
+
+    def __init__(self, store: JobStore, workers: int = 2, poll_interval: float = 1.0):
+        self.store = store
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Workers de jobs démarrés ({self.workers})")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Réveille les workers après la création d'un job."""
+        self._wakeup.set()
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            try:
+                row = await asyncio.to_thread(self.store.claim_next)
+                if row is None:
+                    # Rien à faire : attente d'un nouveau job (ou d'un job d'un autre worker uvicorn)
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._process(row)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker de jobs {index} : erreur inattendue : {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _heartbeat(self, job_id: str, claim: str) -> None:
+        """Renouvelle le bail pendant l'analyse, pour qu'un job long ne soit pas repris par un autre worker."""
+        interval = max(0.01, self.store.lease / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not await asyncio.to_thread(self.store.renew, job_id, claim):
+                logger.warning(f"Job {job_id} : réservation perdue pendant l'analyse")
+                return
+
+    async def _process(self, row: sqlite3.Row) -> None:
+        logger.info(f"Job {row['id']} : analyse de {row['filename']}")
+        heartbeat = asyncio.create_task(self._heartbeat(row["id"], row["claim"]))
+        try:
+            [item] = await run_batch([(row["filename"], row["payload"] or b"", row["content_type"])])
+        finally:
+            heartbeat.cancel()
+        result = item.result.model_dump() if item.result is not None else None
+        completed = await asyncio.to_thread(
+            self.store.complete, row["id"], row["claim"], item.status_code, result, item.error
+        )
+        if not completed:
+            logger.warning(f"Job {row['id']} : repris par un autre worker, résultat ignoré")
+
+
+async def wait_for_job(store: JobStore, job_id: str, timeout: float, interval: float = 0.2) -> Optional[Dict[str, Any]]:
+    """Long-polling : attend la fin du job au plus `timeout` secondes."""
+    deadline = time.monotonic() + max(0.0, timeout)
+    while True:
+        job = await asyncio.to_thread(store.get, job_id)
+        if job is None or job["status"] in (DONE, FAILED) or time.monotonic() >= deadline:
+            return job
+        await asyncio.sleep(interval)
+
+
+# Instances partagées, créées au démarrage de l'application
+_store: Optional[JobStore] = None
+_runner: Optional[JobRunner] = None
+
+
+def start_jobs() -> None:
+    global _store, _runner
+    _store = JobStore(config.JOB_DB, lease=config.JOB_LEASE, ttl=config.JOB_TTL)
+    _runner = JobRunner(_store, workers=config.JOB_WORKERS)
+    _runner.start()
+
+
+async def stop_jobs() -> None:
+    global _store, _runner
+    if _runner is not None:
+        await _runner.stop()
+        _runner = None
+    if _store is not None:
+        _store.close()
+        _store = None
+
+
+def get_job_store() -> JobStore:
+    if _store is None:
+        raise RuntimeError("La file de jobs n'est pas démarrée")
+    return _store
+
+
+def notify_workers() -> None:
+    if _runner is not None:
+        _runner.notify()
@@ -0,0 +1,95 @@
+import os
+import sys
+import logging
+from typing import Any, Callable, Optional, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# --- MÉMOIRE DES WORKERS ---
+# Mesures de la mémoire résidente (RSS) du processus courant : suivi du pic d'une analyse,
+# budget par document et recyclage des workers dont la mémoire ne redescend pas.
+
+MB = 1024 * 1024
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> Optional[int]:
+    """RSS courante du processus (octets), lue dans /proc ; None si indisponible (hors Linux)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """RSS maximale atteinte depuis le démarrage du processus (octets)."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilo-octets sous Linux, octets sous macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryBudget:
+    """
+    Suivi de la mémoire consommée par une analyse, échantillonnée à chaque page.
+    La croissance est mesurée par rapport à la RSS du début de l'analyse ; le pic tient aussi
+    compte du maximum du processus (ru_maxrss) s'il a progressé pendant l'analyse, ce qui capture
+    les pics survenus au milieu d'une page. Avec l'exécuteur "thread", la mesure porte sur tout
+    le processus et reste indicative.
+    """
+
+    def __init__(self, limit: int = 0):
+        self.limit = limit
+        self.baseline = current_rss()
+        self._max_before = peak_rss()
+        self.peak = self.baseline
+
+    def sample(self) -> None:
+        rss = current_rss()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+        max_rss = peak_rss()
+        if max_rss is not None and self._max_before is not None and max_rss > self._max_before:
+            self.peak = max(self.peak or 0, max_rss)
+
+    @property
+    def growth(self) -> Optional[int]:
+        """Croissance maximale de la RSS pendant l'analyse (octets)."""
+        if self.baseline is None or self.peak is None:
+            return None
+        return max(0, self.peak - self.baseline)
+
+    def exceeded(self) -> bool:
+        """Échantillonne puis indique si le budget (0 = illimité) est dépassé."""
+        self.sample()
+        return bool(self.limit) and (self.growth or 0) > self.limit
+
+
+def call_measured(func: Callable[..., Any], *args: Any) -> Tuple[Any, Optional[BaseException], Optional[int]]:
+    """
+    Exécuté dans le worker : (résultat, exception levée, RSS du worker une fois la tâche terminée).
+    L'exception est retournée plutôt que levée pour que la RSS remonte aussi après un échec
+    (un document rejeté peut avoir laissé le worker gonflé).
+    """
+    try:
+        return func(*args), None, current_rss()
+    except Exception as e:
+        return None, e, current_rss()
+
+
+def recycle_reason(tasks: int, workers: int, rss: Optional[int]) -> Optional[str]:
+    """
+    Motif de recyclage d'un pool de workers : RSS d'un worker au-delà de WORKER_MAX_RSS,
+    ou WORKER_MAX_TASKS tâches par worker en moyenne. None si le pool peut continuer.
+    """
+    if config.WORKER_MAX_RSS and rss is not None and rss > config.WORKER_MAX_RSS:
+        return "rss"
+    if config.WORKER_MAX_TASKS and tasks >= config.WORKER_MAX_TASKS * max(1, workers):
+        return "tasks"
+    return None
@@ -0,0 +1,139 @@
+import os
+import logging
+from typing import Dict, Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+# --- MÉTRIQUES PROMETHEUS ---
+
+STAGE_LATENCY = Histogram(
+    "cv_stage_duration_seconds",
+    "Durée de chaque étape du pipeline d'upload",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+UPLOADS = Counter(
+    "cv_uploads_total",
+    "Uploads traités, par type de contenu et code de réponse",
+    ["content_type", "status"]
+)
+FILE_SIZE = Histogram(
+    "cv_upload_size_bytes",
+    "Taille des fichiers reçus",
+    buckets=(10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000, 50_000_000)
+)
+PAGE_COUNT = Histogram(
+    "cv_pages_parsed",
+    "Nombre de pages PDF lues par document",
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100, 200)
+)
+
+PEAK_MEMORY = Histogram(
+    "cv_document_peak_memory_bytes",
+    "Croissance maximale de la mémoire du worker pendant l'analyse d'un document",
+    buckets=(1_000_000, 5_000_000, 10_000_000, 25_000_000, 50_000_000, 100_000_000,
+             250_000_000, 500_000_000, 1_000_000_000, 2_000_000_000)
+)
+WORKERS_RECYCLED = Counter(
+    "cv_worker_pool_recycled_total",
+    "Pools de workers recyclés, par pool et motif (rss, tasks)",
+    ["pool", "reason"]
+)
+
+QUEUE_WAIT = Histogram(
+    "cv_queue_wait_seconds",
+    "Attente d'un worker de l'exécuteur, par file de priorité",
+    ["lane"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+)
+QUEUE_REJECTED = Counter(
+    "cv_queue_rejected_total",
+    "Requêtes rejetées (503) faute de place dans leur file de priorité",
+    ["lane"]
+)
+RATE_LIMITED = Counter(
+    "cv_rate_limited_total",
+    "Requêtes refusées (429) par la limite de débit par client, par file de priorité",
+    ["lane"]
+)
+
+PARSER_SELECTED = Counter(
+    "cv_parser_selected_total",
+    "Backend de lecture retenu, par type de contenu",
+    ["content_type", "backend"]
+)
+
+# Libellés courts des types de contenu (cardinalité bornée)
+CONTENT_TYPE_LABELS = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+
+
+def content_type_label(content_type: Optional[str]) -> str:
+    return CONTENT_TYPE_LABELS.get(content_type, "other")
+
+
+def record_upload(
+    content_type: Optional[str],
+    status_code: int,
+    timings: Dict[str, float],
+    size: Optional[int] = None,
+    pages: Optional[int] = None,
+    parser: Optional[str] = None,
+    peak_memory: Optional[int] = None
+) -> None:
+    """Enregistre les métriques d'une requête d'upload."""
+    UPLOADS.labels(content_type=content_type_label(content_type), status=str(status_code)).inc()
+    for stage, seconds in timings.items():
+        STAGE_LATENCY.labels(stage=stage).observe(seconds)
+    if size is not None:
+        FILE_SIZE.observe(size)
+    if pages is not None:
+        PAGE_COUNT.observe(pages)
+    if peak_memory is not None:
+        PEAK_MEMORY.observe(peak_memory)
+    if parser is not None:
+        PARSER_SELECTED.labels(content_type=content_type_label(content_type), backend=parser).inc()
+
+
+def record_recycle(pool: str, reason: str) -> None:
+    WORKERS_RECYCLED.labels(pool=pool, reason=reason).inc()
+
+
+def record_queue_wait(lane: str, seconds: float) -> None:
+    QUEUE_WAIT.labels(lane=lane).observe(seconds)
+
+
+def record_queue_rejected(lane: str) -> None:
+    QUEUE_REJECTED.labels(lane=lane).inc()
+
+
+def record_rate_limited(lane: str) -> None:
+    RATE_LIMITED.labels(lane=lane).inc()
+
+
+def server_timing_header(timings: Dict[str, float]) -> str:
+    """Formate les durées en en-tête Server-Timing (millisecondes)."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in timings.items())
+
+
+def render_metrics() -> tuple:
+    """
+    Exposition au format Prometheus. Avec plusieurs workers uvicorn,
+    PROMETHEUS_MULTIPROC_DIR active l'agrégation multi-processus.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
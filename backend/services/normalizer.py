@@ -0,0 +1,129 @@
+import unicodedata
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import List, Tuple
+
+# --- NORMALISATION DU TEXTE ---
+# Minuscules, ligatures et ponctuation typographique, suppression des accents,
+# espaces multiples réduits. Les sauts de ligne (\n) et de page (\f) sont conservés.
+
+REPLACEMENTS = {
+    'œ': 'oe', 'æ': 'ae', '€': ' euro ',
+    '’': "'", '‘': "'", '–': "-"
+}
+
+def _normalize_char(char: str) -> str:
+    lowered = "".join(REPLACEMENTS.get(c, c) for c in char.lower())
+    return unicodedata.normalize('NFKD', lowered).encode('ascii', 'ignore').decode('utf-8')
+
+
+class _TranslationTable(dict):
+    """Table caractère -> texte normalisé : pré-calculée pour l'alphabet latin, complétée à la demande."""
+
+    def __missing__(self, code: int) -> str:
+        value = _normalize_char(chr(code))
+        self[code] = value
+        return value
+
+
+TRANSLATION_TABLE = _TranslationTable()
+for _code in list(range(0x250)) + list(range(0x2000, 0x2070)) + [ord('€')]:
+    TRANSLATION_TABLE[_code]
+
+
+def _fold(text: str) -> str:
+    """Minuscules, ligatures et accents. Équivaut à appliquer TRANSLATION_TABLE, via des passes en C."""
+    text = text.lower()
+    if text.isascii():
+        return text
+    for char, repl in REPLACEMENTS.items():
+        text = text.replace(char, repl)
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('utf-8')
+
+
+def _line_end(text: str, start: int) -> int:
+    """Fin de la ligne commençant à `start` : saut de ligne ou de page suivant, ou fin du texte."""
+    ends = [end for end in (text.find("\n", start), text.find("\f", start)) if end != -1]
+    return min(ends, default=len(text))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise le texte. Forme canonique : pages séparées par \\f, lignes par \\n,
+    sans ligne vide ni espace en bord de ligne, espaces internes réduits à un seul.
+    """
+    return normalize_with_offsets(text).text
+
+
+@dataclass
+class NormalizedText:
+    """
+    Texte normalisé (forme de normalize_text) et correspondance avec le texte brut :
+    pour chaque ligne du texte normalisé, sa position de début et celle de sa ligne brute.
+    """
+    text: str
+    raw: str
+    # Début de chaque ligne dans le texte normalisé (trié), et dans le texte brut
+    starts: List[int]
+    raw_starts: List[int]
+
+    def raw_span(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        Convertit un intervalle (non vide, sur une seule ligne) du texte normalisé en intervalle
+        du texte brut. Seule la ligne concernée est relue, caractère par caractère, avec
+        TRANSLATION_TABLE ; si elle ne se relit pas à l'identique, toute la ligne brute est retournée.
+        """
+        line = bisect_right(self.starts, start) - 1
+        line_start, raw_start = self.starts[line], self.raw_starts[line]
+        line_end, raw_end = _line_end(self.text, line_start), _line_end(self.raw, raw_start)
+        if end > line_end:
+            return raw_start, raw_end
+
+        chars: List[str] = []
+        offsets: List[int] = []
+        for index in range(raw_start, raw_end):
+            for char in TRANSLATION_TABLE[ord(self.raw[index])]:
+                if char.isspace():
+                    if not chars or chars[-1] == ' ':
+                        continue
+                    char = ' '
+                chars.append(char)
+                offsets.append(index)
+        while chars and chars[-1] == ' ':
+            chars.pop()
+            offsets.pop()
+
+        if "".join(chars) != self.text[line_start:line_end]:
+            return raw_start, raw_end
+        return offsets[start - line_start], offsets[end - 1 - line_start] + 1
+
+
+def normalize_with_offsets(text: str) -> NormalizedText:
+    """
+    Même résultat que normalize_text, en une passe sur les lignes du texte brut, avec la position
+    de chaque ligne retenue : les résultats de l'extraction peuvent désigner leur source (raw_span).
+    """
+    text = text or ""
+    parts: List[str] = []
+    starts: List[int] = []
+    raw_starts: List[int] = []
+    length = 0
+    raw_start = 0
+    # Sauts de page depuis la dernière ligne retenue (une page vide en laisse deux de suite)
+    page_breaks = 0
+    for page in text.split("\f"):
+        for raw_line in page.split("\n"):
+            line = " ".join(_fold(raw_line).split())
+            if line:
+                if parts:
+                    separator = "\f" * page_breaks or "\n"
+                    parts.append(separator)
+                    length += len(separator)
+                starts.append(length)
+                raw_starts.append(raw_start + len(raw_line) - len(raw_line.lstrip()))
+                parts.append(line)
+                length += len(line)
+                page_breaks = 0
+            raw_start += len(raw_line) + 1
+        page_breaks += 1
+    return NormalizedText("".join(parts), text, starts, raw_starts)
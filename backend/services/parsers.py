@@ -0,0 +1,129 @@
+import logging
+import importlib.util
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+import config
+from services.source import DocumentSource
+from services.pdf_parser import iter_pages_pdf, iter_pages_pdfium, iter_pages_pdfminer
+from services.docx_parser import extract_text_docx, extract_text_docx_python_docx
+
+logger = logging.getLogger(__name__)
+
+# --- REGISTRE DES PARSERS ---
+# Plusieurs implémentations par format, essayées dans l'ordre configuré :
+# un parser rapide d'abord, un parser plus robuste (et plus lent) si le résultat semble inexploitable.
+
+PDF_MIME = "application/pdf"
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Seuils de l'heuristique de qualité
+MIN_CHARS = 20
+MIN_READABLE_RATIO = 0.85
+MAX_CID_MARKERS = 3
+
+
+def looks_readable(text: str) -> bool:
+    """
+    Le texte extrait est-il exploitable ? Rejette un texte vide ou quasi vide,
+    les glyphes non décodés par le parser ("(cid:12)", U+FFFD) et une part
+    trop faible de caractères lisibles (police mal encodée).
+    """
+    stripped = text.strip()
+    if len(stripped) < MIN_CHARS:
+        return False
+    if stripped.count("(cid:") > MAX_CID_MARKERS or "\ufffd" in stripped:
+        return False
+    readable = sum(1 for char in stripped if char.isalnum() or char.isspace() or char in ".,;:@+-'()/|&")
+    return readable / len(stripped) >= MIN_READABLE_RATIO
+
+
+@dataclass(frozen=True)
+class ParserBackend:
+    """Une implémentation de lecture de texte pour un type MIME."""
+    name: str
+    content_type: str
+    iter_pages: Callable[[DocumentSource, Optional[int]], Iterator[str]]
+    # Contrôle de qualité appliqué à la première page pour décider d'un repli
+    accepts: Callable[[str], bool] = looks_readable
+    # Le format a-t-il une notion de page (nombre de pages rapporté) ?
+    paged: bool = True
+    available: bool = True
+
+
+def _single_page(parse: Callable[[DocumentSource], str]) -> Callable[[DocumentSource, Optional[int]], Iterator[str]]:
+    """Adapte un parser « texte complet » à l'interface page par page (une seule page)."""
+    def iter_pages(source: DocumentSource, max_pages: Optional[int] = None) -> Iterator[str]:
+        yield parse(source)
+    return iter_pages
+
+
+BACKENDS: Dict[str, ParserBackend] = {}
+
+
+def register_backend(backend: ParserBackend) -> None:
+    BACKENDS[backend.name] = backend
+
+
+register_backend(ParserBackend("pdfium", PDF_MIME, iter_pages_pdfium, available=importlib.util.find_spec("pypdfium2") is not None))
+register_backend(ParserBackend("pdfminer", PDF_MIME, iter_pages_pdfminer))
+register_backend(ParserBackend("pdfplumber", PDF_MIME, iter_pages_pdf))
+register_backend(ParserBackend("docx_xml", DOCX_MIME, _single_page(extract_text_docx), paged=False))
+register_backend(ParserBackend("python_docx", DOCX_MIME, _single_page(extract_text_docx_python_docx), paged=False))
+
+
+def backend_chain(content_type: str) -> List[ParserBackend]:
+    """Backends disponibles pour un type MIME, dans l'ordre de priorité configuré."""
+    chain = []
+    for name in config.PARSER_ORDER.get(content_type, ()):
+        backend = BACKENDS.get(name)
+        if backend is None or backend.content_type != content_type:
+            logger.warning(f"Backend inconnu pour {content_type} : {name}")
+        elif backend.available:
+            chain.append(backend)
+    return chain
+
+
+def supports(content_type: Optional[str]) -> bool:
+    return bool(content_type) and bool(backend_chain(content_type))
+
+
+def iter_pages_with_fallback(
+    source: DocumentSource,
+    content_type: str,
+    max_pages: Optional[int] = None,
+    selected: Optional[List[str]] = None
+) -> Iterator[str]:
+    """
+    Lit le document avec le premier backend dont la première page passe le contrôle
+    de qualité (ou qui est le dernier de la chaîne). Un backend qui échoue avant
+    d'avoir produit une page cède aussi la place au suivant.
+    Le nom du backend retenu est ajouté à `selected`.
+    """
+    chain = backend_chain(content_type)
+    if not chain:
+        raise ValueError(f"Aucun parser disponible pour {content_type}")
+
+    for position, backend in enumerate(chain):
+        last = position == len(chain) - 1
+        pages = backend.iter_pages(source, max_pages)
+        try:
+            try:
+                first = next(pages, None)
+            except Exception as e:
+                if last:
+                    raise
+                logger.warning(f"Backend {backend.name} en échec, repli : {e}")
+                continue
+            if not last and not backend.accepts(first or ""):
+                logger.info(f"Texte jugé inexploitable par {backend.name}, repli sur le backend suivant")
+                continue
+
+            if selected is not None:
+                selected.append(backend.name)
+            if first is not None:
+                yield first
+            yield from pages
+            return
+        finally:
+            pages.close()
@@ -1,18 +1,123 @@
-import pdfplumber
+import os
 import logging
+import threading
+from typing import Iterator, Optional
+
+from services.source import DocumentSource, open_source, describe_source
 
 logger = logging.getLogger(__name__)
 
-def extract_text_pdf(file_path: str) -> str:
-    """Extrait le texte brut d'un fichier PDF."""
-    text = ""
+# --- IMPORTS DIFFÉRÉS ---
+# pdfplumber, pdfminer et pypdfium2 ne sont chargés qu'au premier document qui les utilise :
+# le démarrage d'un worker (ou d'un conteneur) ne paie pas pour les backends inutilisés.
+
+
+def load_pdfium():
+    """Module pypdfium2, ou None s'il n'est pas installé."""
+    try:
+        import pypdfium2
+    except ImportError:  # pragma: no cover - dépendance de pdfplumber, normalement présente
+        return None
+    return pypdfium2
+
+
+class PdfEncryptedError(ValueError):
+    """PDF protégé par un mot de passe d'ouverture (ou chiffrement non supporté)."""
+
+
+def count_pages_pdf(source: DocumentSource) -> Optional[int]:
+    """
+    Contrôle préalable peu coûteux : lit la table xref et le catalogue, sans construire les pages.
+    Retourne le nombre de pages déclaré (None s'il est illisible) ; lève PdfEncryptedError
+    si le document ne s'ouvre pas sans mot de passe.
+    """
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdfdocument import PDFDocument, PDFPasswordIncorrect, PDFEncryptionError
+    from pdfminer.pdftypes import resolve1
+
+    stream = open_source(source)
+    owned = isinstance(stream, (str, os.PathLike))
+    fp = open(stream, "rb") if owned else stream
+    try:
+        document = PDFDocument(PDFParser(fp))
+        pages = resolve1(document.catalog.get("Pages"))
+        count = resolve1(pages.get("Count")) if isinstance(pages, dict) else None
+        return count if isinstance(count, int) else None
+    except (PDFPasswordIncorrect, PDFEncryptionError) as e:
+        raise PdfEncryptedError("PDF protégé par mot de passe") from e
+    finally:
+        if owned:
+            fp.close()
+
+
+def iter_pages_pdf(source: DocumentSource, max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Itère paresseusement sur le texte des pages d'un PDF.
+    Le document n'est lu que jusqu'à la page demandée ; max_pages plafonne le travail.
+    """
+    import pdfplumber
+
+    # Seules les pages lisibles sont construites (pdf.pages les instancie toutes d'un coup)
+    pages = range(1, max_pages + 1) if max_pages is not None else None
     try:
-        with pdfplumber.open(file_path) as pdf:
+        with pdfplumber.open(open_source(source), pages=pages) as pdf:
             for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        return text
+                text = page.extract_text() or ""
+                # Libère les objets et la mise en page de la page : sans cela, pdfplumber les garde
+                # jusqu'à la fermeture du document (des centaines de Mo sur un long PDF)
+                page.close()
+                yield text
     except Exception as e:
-        logger.error(f"Erreur lors de la lecture du PDF {file_path}: {e}")
-        raise e
\ No newline at end of file
+        logger.error(f"Erreur lors de la lecture du PDF {describe_source(source)}: {e}")
+        raise e
+
+# PDFium n'est pas thread-safe : ses appels sont sérialisés au sein d'un processus
+PDFIUM_LOCK = threading.Lock()
+
+
+def iter_pages_pdfium(source: DocumentSource, max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Texte des pages via PDFium (pypdfium2) : extraction dans l'ordre du flux de contenu,
+    sans analyse de mise en page, bien plus rapide que pdfplumber.
+    """
+    pdfium = load_pdfium()
+    if pdfium is None:
+        raise RuntimeError("pypdfium2 n'est pas installé")
+    try:
+        with PDFIUM_LOCK:
+            document = pdfium.PdfDocument(open_source(source))
+        try:
+            for index in range(len(document)):
+                if max_pages is not None and index >= max_pages:
+                    break
+                with PDFIUM_LOCK:
+                    page = document[index]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_bounded()
+                    textpage.close()
+                    page.close()
+                yield text.replace("\r\n", "\n").replace("\r", "\n")
+        finally:
+            with PDFIUM_LOCK:
+                document.close()
+    except Exception as e:
+        logger.error(f"Erreur PDFium sur {describe_source(source)}: {e}")
+        raise e
+
+
+def iter_pages_pdfminer(source: DocumentSource, max_pages: Optional[int] = None) -> Iterator[str]:
+    """Texte des pages via pdfminer.six seul (analyse de mise en page, sans la couche pdfplumber)."""
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    try:
+        for page in extract_pages(open_source(source), maxpages=max_pages or 0):
+            yield "".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+    except Exception as e:
+        logger.error(f"Erreur pdfminer sur {describe_source(source)}: {e}")
+        raise e
+
+
+def extract_text_pdf(source: DocumentSource) -> str:
+    """Extrait le texte brut d'un PDF (chemin, bytes ou flux binaire). Les pages sont séparées par \\f."""
+    return "\f".join(page_text + "\n" for page_text in iter_pages_pdf(source) if page_text)
@@ -0,0 +1,207 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+import config
+
+# --- TÉLÉPHONES ---
+# Parcours en temps linéaire : une seule expression à quantificateurs possessifs (aucun retour
+# arrière) découpe le texte en suites de groupes de chiffres séparés par un espace, un point,
+# un tiret ou une barre ; chaque suite est ensuite segmentée en numéros candidats de 15 chiffres
+# au plus, validés par les règles de longueur du pays, et normalisés au format E.164.
+
+# Suite de groupes de chiffres : "+33 (0)6 12 34 56 78", "01.45.67.89.10", "+1 (415) 555-2671".
+# Ne commence pas au milieu d'un nombre (le parcours reprend toujours après une suite entière).
+PHONE_RUN_RE = re.compile(
+    r"(?<![\d+])(?:\+[ \t]?)?+(?:\(\d{1,4}\)|\d++)"
+    r"(?:(?:[ \t]?[.\-/][ \t]?|[ \t])?+(?:\(\d{1,4}\)|\d++))*+"
+)
+# Groupes d'une suite ; "(0)" est le préfixe national noté après l'indicatif, ignoré
+_GROUP_RE = re.compile(r"\((\d{1,4})\)|(\d+)")
+TRUNK_GROUP = "(0)"
+
+# E.164 : 15 chiffres au plus, indicatif compris
+MAX_DIGITS = 15
+MIN_INTERNATIONAL_DIGITS = 8
+# Longueurs essayées (de la plus longue à la plus courte) après "+" et après "00"
+INTERNATIONAL_LENGTHS = tuple(range(MAX_DIGITS, MIN_INTERNATIONAL_DIGITS - 1, -1))
+PREFIXED_LENGTHS = tuple(length + len("00") for length in INTERNATIONAL_LENGTHS)
+
+
+@dataclass(frozen=True)
+class CountryRule:
+    """Plan de numérotation simplifié : indicatif, préfixe national et longueurs du numéro national."""
+    code: str
+    trunk: str
+    lengths: FrozenSet[int]
+    # Premiers chiffres possibles du numéro national (sans le préfixe)
+    leading: str = "123456789"
+
+
+COUNTRIES: Dict[str, CountryRule] = {
+    "FR": CountryRule("33", "0", frozenset({9})),
+    "BE": CountryRule("32", "0", frozenset({8, 9})),
+    "CH": CountryRule("41", "0", frozenset({9})),
+    "MA": CountryRule("212", "0", frozenset({9}), "5678"),
+    "DZ": CountryRule("213", "0", frozenset({8, 9}), "234567"),
+    "TN": CountryRule("216", "", frozenset({8}), "2345789"),
+    "GB": CountryRule("44", "0", frozenset({9, 10}), "1235789"),
+    "ES": CountryRule("34", "", frozenset({9}), "6789"),
+    "DE": CountryRule("49", "0", frozenset(range(6, 12))),
+    "US": CountryRule("1", "", frozenset({10}), "23456789"),
+}
+ALIASES = {"UK": "GB", "CA": "US"}
+_BY_CODE = {rule.code: rule for rule in COUNTRIES.values()}
+
+
+@dataclass(frozen=True)
+class PhoneMatch:
+    """Numéro trouvé : texte d'origine, position dans le texte et forme E.164."""
+    raw: str
+    span: Tuple[int, int]
+    e164: str
+
+
+def country_rules(regions: Optional[List[str]] = None) -> List[CountryRule]:
+    """Règles des pays dont les numéros au format national (sans indicatif) sont reconnus."""
+    names = config.PHONE_REGIONS if regions is None else regions
+    return list(_country_rules(tuple(names)))
+
+
+@lru_cache(maxsize=32)
+def _country_rules(names: Tuple[str, ...]) -> Tuple[CountryRule, ...]:
+    return tuple(COUNTRIES[code] for code in (ALIASES.get(n.upper(), n.upper()) for n in names) if code in COUNTRIES)
+
+
+@lru_cache(maxsize=32)
+def _national_lengths(rules: Tuple[CountryRule, ...]) -> Tuple[int, ...]:
+    """Nombres de chiffres possibles d'un numéro national (préfixe compris), du plus long au plus court."""
+    return tuple(sorted({len(rule.trunk) + length for rule in rules for length in rule.lengths}, reverse=True))
+
+
+def _national(digits: str, rule: CountryRule) -> Optional[str]:
+    """Numéro national (préfixe éventuel retiré) s'il respecte les règles du pays."""
+    if rule.trunk:
+        if not digits.startswith(rule.trunk):
+            return None
+        digits = digits[len(rule.trunk):]
+    if len(digits) in rule.lengths and digits[:1] in rule.leading:
+        return digits
+    return None
+
+
+def _international(digits: str) -> Optional[str]:
+    """E.164 d'un numéro écrit avec indicatif ("+" ou "00" retirés)."""
+    for size in (1, 2, 3):
+        rule = _BY_CODE.get(digits[:size])
+        if rule is None:
+            continue
+        rest = digits[size:]
+        # "+33 06 ..." : préfixe national conservé par erreur après l'indicatif
+        if rule.trunk and rest.startswith(rule.trunk) and len(rest) - len(rule.trunk) in rule.lengths:
+            rest = rest[len(rule.trunk):]
+        if len(rest) in rule.lengths and rest[:1] in rule.leading:
+            return f"+{rule.code}{rest}"
+        return None
+    # Indicatif hors table : seule la longueur E.164 est vérifiée
+    if MIN_INTERNATIONAL_DIGITS <= len(digits) <= MAX_DIGITS and digits[0] != "0":
+        return f"+{digits}"
+    return None
+
+
+def normalize(digits: str, international: bool, rules: Iterable[CountryRule]) -> Optional[str]:
+    """Forme E.164 d'une suite de chiffres, ou None si elle n'est pas un numéro valide."""
+    if international:
+        return _international(digits)
+    if digits.startswith("00"):
+        return _international(digits[2:])
+    for rule in rules:
+        national = _national(digits, rule)
+        if national is not None:
+            return f"+{rule.code}{national}"
+    return None
+
+
+def _scan_run(text: str, run: "re.Match", rules: Tuple[CountryRule, ...]) -> Optional[PhoneMatch]:
+    """
+    Premier numéro valide d'une suite de groupes. Les chiffres des groupes sont concaténés ;
+    pour chaque groupe de départ plausible (indicatif, 00 ou préfixe national), seules les
+    longueurs admises par les règles qui tombent sur une fin de groupe sont essayées, de la plus
+    longue à la plus courte : coût constant par groupe, donc linéaire sur la suite.
+    """
+    groups = list(_GROUP_RE.finditer(text, run.start(), run.end()))
+    parts = ["" if group.group(0) == TRUNK_GROUP else group.group(1) or group.group(2) for group in groups]
+    offsets = [0]
+    for part in parts:
+        offsets.append(offsets[-1] + len(part))
+    digits = "".join(parts)
+    # Position dans `digits` -> nombre de groupes consommés (le premier, sans "(0)" final)
+    group_ends: Dict[int, int] = {}
+    for count, offset in enumerate(offsets):
+        group_ends.setdefault(offset, count)
+
+    national_lengths = _national_lengths(rules)
+    # Si tous les pays ont un préfixe national, un numéro sans "+" commence par 0 (ou 00)
+    needs_zero = all(rule.trunk == "0" for rule in rules)
+    plus = text[run.start()] == "+"
+
+    for first, part in enumerate(parts):
+        if not part:
+            continue
+        start = offsets[first]
+        international = plus and first == 0
+        if international:
+            lengths = INTERNATIONAL_LENGTHS
+        elif digits.startswith("00", start):
+            # 00 + indicatif (jamais 0)
+            if digits[start + 2:start + 3] in ("", "0"):
+                continue
+            lengths = PREFIXED_LENGTHS
+        elif needs_zero and part[0] != "0":
+            continue
+        else:
+            lengths = national_lengths
+
+        for length in lengths:
+            count = group_ends.get(start + length)
+            if count is None:
+                continue
+            e164 = normalize(digits[start:start + length], international, rules)
+            if e164 is not None:
+                begin = run.start() if international else groups[first].start()
+                end = groups[count - 1].end()
+                return PhoneMatch(text[begin:end], (begin, end), e164)
+    return None
+
+
+def iter_phones(
+    text: str,
+    regions: Optional[List[str]] = None,
+    pos: int = 0,
+    endpos: Optional[int] = None
+) -> Iterator[PhoneMatch]:
+    """Numéros valides du texte (ou de text[pos:endpos]), dans l'ordre (au plus un par suite de chiffres)."""
+    rules = tuple(country_rules(regions))
+    for run in PHONE_RUN_RE.finditer(text, pos, len(text) if endpos is None else endpos):
+        found = _scan_run(text, run, rules)
+        if found is not None:
+            yield found
+
+
+def find_phone(
+    text: str,
+    regions: Optional[List[str]] = None,
+    pos: int = 0,
+    endpos: Optional[int] = None
+) -> Optional[PhoneMatch]:
+    """Premier numéro valide du texte (ou de text[pos:endpos])."""
+    return next(iter_phones(text, regions, pos, endpos), None)
+
+
+def to_e164(phone: Optional[str], regions: Optional[List[str]] = None) -> Optional[str]:
+    """Forme E.164 d'un numéro déjà extrait (None s'il n'est pas reconnu)."""
+    if not phone:
+        return None
+    found = find_phone(phone, regions)
+    return found.e164 if found is not None else None
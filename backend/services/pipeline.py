@@ -0,0 +1,327 @@
+import os
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+from tempfile import NamedTemporaryFile
+
+import config
+from models.cv_result import CVResult, FieldPosition
+from services.source import DocumentSource
+from services.pdf_parser import PdfEncryptedError, count_pages_pdf
+from services.parsers import PDF_MIME, DOCX_MIME, BACKENDS, iter_pages_with_fallback, supports
+from services.extractor import NOT_FOUND, SCAN_FIELDS, extract_fields
+from services.dedup import document_signature
+from services.memory import MB, MemoryBudget
+from services.normalizer import NormalizedText, normalize_with_offsets
+from services.phones import to_e164
+from services.sections import EDUCATION, SectionTracker
+
+logger = logging.getLogger(__name__)
+
+# Champs du CVResult remplis par l'extraction
+FIELDS = ("first_name", "last_name", "email", "phone", "degree")
+
+SUFFIXES = {
+    PDF_MIME: ".pdf",
+    DOCX_MIME: ".docx"
+}
+
+
+class DocumentError(Exception):
+    """Erreur de traitement d'un document, associée à un code HTTP."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+    def __reduce__(self):
+        # Transmissible entre processus (exécuteur "process") avec ses deux arguments
+        return type(self), (self.status_code, self.detail)
+
+
+@dataclass
+class Analysis:
+    """Résultat d'analyse complet, transmis par les workers de l'exécuteur."""
+    result: CVResult
+    timings: Dict[str, float]
+    # Texte nettoyé de tout le document (index de recherche), si demandé
+    text: Optional[str] = None
+    # Signature MinHash du début du texte (détection des doublons), si demandée
+    signature: Optional[List[int]] = None
+    # Croissance maximale de la mémoire du worker pendant l'analyse (octets)
+    peak_memory: Optional[int] = None
+
+
+def guess_content_type(filename: str) -> Optional[str]:
+    """Déduit le type MIME à partir de l'extension du fichier."""
+    extension = os.path.splitext(filename or "")[1].lower()
+    for content_type, suffix in SUFFIXES.items():
+        if suffix == extension:
+            return content_type
+    return None
+
+
+def iter_document_pages(
+    source: DocumentSource,
+    content_type: str,
+    selected: Optional[List[str]] = None
+) -> Iterator[str]:
+    """
+    Produit le texte du document page par page, via la chaîne de backends du format
+    (voir services.parsers). Les formats sans notion de page (DOCX) sont lus d'un bloc.
+    """
+    if config.STREAMING_PARSE:
+        yield from iter_pages_with_fallback(source, content_type, config.MAX_PAGES, selected)
+    else:
+        yield "\f".join(iter_pages_with_fallback(source, content_type, None, selected))
+
+
+def check_document(source: DocumentSource, content_type: str) -> None:
+    """
+    Contrôles préalables, avant tout parsing complet : un PDF chiffré ou déclarant
+    un nombre de pages aberrant est rejeté sans être ouvert par pdfplumber.
+    """
+    if content_type != PDF_MIME:
+        return
+    try:
+        page_count = count_pages_pdf(source)
+    except PdfEncryptedError:
+        raise DocumentError(422, "PDF protégé par mot de passe.")
+    except Exception as e:
+        logger.error(f"Echec lecture de la structure PDF : {e}")
+        raise DocumentError(422, "Impossible de lire le contenu du fichier.")
+    if page_count is not None and page_count > config.MAX_DOCUMENT_PAGES:
+        logger.warning(f"PDF rejeté : {page_count} pages déclarées")
+        raise DocumentError(422, f"Document trop long ({page_count} pages, maximum {config.MAX_DOCUMENT_PAGES}).")
+
+
+def field_position(page: int, raw: str, span: Tuple[int, int]) -> FieldPosition:
+    """Position d'un intervalle du texte brut `raw` (pages séparées par \\f, la première étant `page`)."""
+    start, end = span
+    page_start = raw.rfind("\f", 0, start) + 1
+    return FieldPosition(page=page + raw.count("\f", 0, start), start=start - page_start, end=end - page_start)
+
+
+class FieldCollector:
+    """
+    Champs extraits au fil des pages : le premier nom, email et téléphone trouvés, et tous les
+    diplômes de la rubrique Formation, qui peut se poursuivre sur plusieurs pages. Sans rubrique
+    Formation dans le document, le premier diplôme trouvé hors des expériences est retenu.
+    La rubrique Formation est suivie sur une page de plus au plus après celle où elle commence.
+    Le diplôme de repli ne termine jamais la lecture : un intitulé de poste ("Ingénieur DevOps")
+    peut précéder la rubrique Formation des pages suivantes.
+    Avec le texte brut des pages (voir add_page), la position de chaque champ trouvé est conservée.
+    """
+
+    def __init__(self):
+        self.fields = {name: NOT_FOUND for name in FIELDS}
+        self.degrees: List[str] = []
+        self.fallback_degree = NOT_FOUND
+        self.sections = SectionTracker()
+        # Pages lues contenant la rubrique Formation
+        self.education_pages = 0
+        self.positions: Dict[str, FieldPosition] = {}
+        self.degree_position: Optional[FieldPosition] = None
+        self.fallback_position: Optional[FieldPosition] = None
+        # Pages lues (un texte reçu peut en contenir plusieurs, séparées par \f)
+        self.pages_read = 0
+
+    def add_page(
+        self,
+        cleaned_text: str,
+        timings: Optional[Dict[str, float]] = None,
+        source: Optional[NormalizedText] = None
+    ) -> None:
+        """
+        Complète, à partir d'une page de texte nettoyé, les champs encore non trouvés.
+        `source` (normalisation de la page avec ses positions) situe les champs dans le texte brut.
+        """
+        page = self.pages_read + 1
+        self.pages_read += 1 + (source.raw if source is not None else cleaned_text).count("\f")
+        started = time.perf_counter()
+        index = self.sections.segment(cleaned_text)
+        if timings is not None:
+            timings["sections"] = timings.get("sections", 0.0) + time.perf_counter() - started
+        if EDUCATION in index.names():
+            self.education_pages += 1
+
+        wanted = [name for name in SCAN_FIELDS if name != "degree" and self.fields[name] == NOT_FOUND]
+        if self.fields["first_name"] == NOT_FOUND:
+            wanted.append("name")
+        if EDUCATION in index.names() or (EDUCATION not in self.sections.seen and self.fallback_degree == NOT_FOUND):
+            wanted.append("degree")
+        if not wanted:
+            return
+
+        found = extract_fields(cleaned_text, wanted, timings, index, source)
+        positions = {
+            name: field_position(page, source.raw, span) for name, span in found.get("raw_spans", {}).items()
+        }
+        for name in wanted:
+            if name == "name":
+                self.fields["first_name"], self.fields["last_name"] = found["name"]
+            elif name == "degree":
+                if found["degrees"] and not self.degrees:
+                    self.degree_position = positions.get("degree")
+                self.degrees += [degree for degree in found["degrees"] if degree not in self.degrees]
+                if not found["degrees"] and self.fallback_degree == NOT_FOUND:
+                    self.fallback_degree = found["degree"]
+                    self.fallback_position = positions.get("degree")
+            else:
+                self.fields[name] = found[name]
+                if name in positions:
+                    self.positions[name] = positions[name]
+
+        if self.degrees:
+            self.fields["degree"], degree_position = self.degrees[0], self.degree_position
+        elif EDUCATION not in self.sections.seen:
+            self.fields["degree"], degree_position = self.fallback_degree, self.fallback_position
+        else:
+            self.fields["degree"], degree_position = NOT_FOUND, None
+        if degree_position is not None:
+            self.positions["degree"] = degree_position
+        else:
+            self.positions.pop("degree", None)
+
+    @property
+    def complete(self) -> bool:
+        """
+        La suite du document est inutile : tous les champs sont trouvés, et la rubrique Formation
+        est terminée ou déjà lue sur deux pages. Sans rubrique Formation, le document est lu en entier.
+        """
+        if any(value == NOT_FOUND for name, value in self.fields.items() if name != "degree"):
+            return False
+        if EDUCATION not in self.sections.seen:
+            return False
+        return self.sections.finished(EDUCATION) or self.education_pages >= 2
+
+
+def analyze_document(content: bytes, content_type: str, filename: str = "") -> CVResult:
+    """
+    Pipeline complet pour un document : parsing, nettoyage puis extraction.
+    Lève DocumentError avec le code HTTP approprié en cas d'échec.
+    """
+    return analyze_document_timed(content, content_type, filename)[0]
+
+
+def analyze_document_timed(content: bytes, content_type: str, filename: str = "") -> Tuple[CVResult, Dict[str, float]]:
+    """Comme analyze_document, en retournant aussi la durée (secondes) de chaque étape."""
+    analysis = analyze_document_full(content, content_type, filename)
+    return analysis.result, analysis.timings
+
+
+def analyze_document_full(
+    content: bytes,
+    content_type: str,
+    filename: str = "",
+    keep_text: bool = False,
+    sign: bool = False
+) -> Analysis:
+    """
+    Comme analyze_document_timed. Avec keep_text, retourne aussi le texte nettoyé du document
+    pour l'index de recherche : la lecture continue (jusqu'à MAX_PAGES) après l'extraction des champs.
+    Avec sign, calcule la signature MinHash des DEDUP_CHARS premiers caractères du texte nettoyé
+    (la lecture continue au besoin jusqu'à ce volume).
+    """
+    if not supports(content_type):
+        raise DocumentError(400, "Format non supporté. Utilisez PDF ou DOCX.")
+    if not content:
+        raise DocumentError(400, "Fichier vide.")
+
+    tmp_path: Optional[str] = None
+    memory = MemoryBudget(config.DOCUMENT_MAX_MEMORY)
+    try:
+        # Les petits documents sont parsés en mémoire ; au-delà du seuil, écriture sur disque
+        source: DocumentSource = content
+        if len(content) > config.SPOOL_THRESHOLD:
+            with NamedTemporaryFile(delete=False, suffix=SUFFIXES[content_type]) as tmp:
+                tmp.write(content)
+                tmp_path = tmp.name
+            source = tmp_path
+        logger.info(f"Fichier reçu : {filename} ({len(content)} octets)")
+
+        started = time.perf_counter()
+        check_document(source, content_type)
+        precheck = time.perf_counter() - started
+
+        # Parsing et extraction page par page
+        collector = FieldCollector()
+        timings = {"precheck": precheck, "parse": 0.0, "clean": 0.0, "extract_scan": 0.0, "extract_name": 0.0}
+        # Texte à conserver pour la signature, en plus des champs
+        sign_chars = config.DEDUP_CHARS if sign else 0
+        text_length = 0
+        raw_length = 0
+        pages_parsed = 0
+        texts: List[str] = []
+        logger.info("Analyse sémantique en cours...")
+        selected: List[str] = []
+        pages = iter_document_pages(source, content_type, selected)
+        try:
+            while True:
+                started = time.perf_counter()
+                page_text = next(pages, None)
+                parsed_at = time.perf_counter()
+                timings["parse"] += parsed_at - started
+                if page_text is None:
+                    break
+
+                pages_parsed += 1
+                raw_length += len(page_text.strip())
+                normalized = normalize_with_offsets(page_text)
+                cleaned_text = normalized.text
+                timings["clean"] += time.perf_counter() - parsed_at
+                collector.add_page(cleaned_text, timings, normalized)
+                if keep_text or text_length < sign_chars:
+                    texts.append(cleaned_text)
+                    text_length += len(cleaned_text)
+                if memory.exceeded():
+                    break
+                if not keep_text and text_length >= sign_chars and collector.complete:
+                    # Tous les champs sont remplis (et le texte à signer lu) : inutile de lire la suite
+                    break
+        except MemoryError:
+            memory.sample()
+            raise DocumentError(422, "Document trop coûteux à analyser (mémoire insuffisante).")
+        except Exception as e:
+            # On capture les erreurs remontées par les parsers
+            logger.error(f"Echec parsing : {e}")
+            raise DocumentError(422, "Impossible de lire le contenu du fichier.")
+        finally:
+            # Libère le document (fichier PDF ouvert) en cas d'arrêt anticipé
+            pages.close()
+
+        if memory.exceeded():
+            logger.warning(f"Budget mémoire dépassé : {filename} (+{memory.growth // MB} Mo)")
+            raise DocumentError(
+                422, f"Document trop coûteux à analyser (mémoire, maximum {config.DOCUMENT_MAX_MEMORY // MB} Mo)."
+            )
+        if raw_length < 10:
+            raise DocumentError(422, "Fichier illisible ou image scannée non supportée.")
+
+        parser = selected[0] if selected else None
+        paged = config.STREAMING_PARSE and parser is not None and BACKENDS[parser].paged
+        fields = collector.fields
+        result = CVResult(
+            **fields, phone_e164=to_e164(fields["phone"]) if fields["phone"] != NOT_FOUND else None,
+            degrees=collector.degrees, positions=collector.positions,
+            pages_parsed=pages_parsed if paged else None, parser=parser
+        )
+        text = "\n".join(texts)
+
+        signature = None
+        if sign:
+            started = time.perf_counter()
+            signature = document_signature(text)
+            timings["dedup_sign"] = time.perf_counter() - started
+        return Analysis(result, timings, text if keep_text else None, signature, memory.growth)
+
+    finally:
+        # Nettoyage
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+                logger.debug(f"Nettoyage temp : {tmp_path}")
+            except OSError:
+                logger.warning(f"Impossible de supprimer {tmp_path}")
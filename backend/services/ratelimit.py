@@ -0,0 +1,121 @@
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import config
+from services.executor import BULK, INTERACTIVE, LANES
+
+logger = logging.getLogger(__name__)
+
+# --- LIMITE DE DÉBIT PAR CLIENT ---
+# Un seau à jetons par client (clé d'API connue, sinon adresse IP) : RATE_LIMIT_BURST requêtes
+# d'affilée, puis RATE_LIMIT requêtes par seconde. Le client détermine aussi la file de priorité
+# de ses analyses sur l'exécuteur (voir services.executor.LANES).
+# Les seaux sont propres à chaque processus : avec N workers uvicorn, un client peut obtenir
+# jusqu'à N fois la limite.
+
+
+@dataclass(frozen=True)
+class Client:
+    # Identifiant du seau : "key:<clé d'API>" ou "ip:<adresse>" (jamais journalisé)
+    key: str
+    lane: str
+
+
+def identify_client(
+    headers: Mapping[str, str],
+    host: Optional[str],
+    api_keys: Optional[Mapping[str, str]] = None
+) -> Client:
+    """
+    Client d'une requête : clé d'API de CV_API_KEYS (en-tête X-API-Key) et sa file, sinon adresse IP
+    et file interactive. Une clé inconnue est ignorée : changer de clé ne donne pas un nouveau seau.
+    L'en-tête "X-Priority: bulk" déclasse la requête ; il ne permet jamais de passer devant.
+    """
+    api_keys = config.API_KEYS if api_keys is None else api_keys
+    api_key = (headers.get("x-api-key") or "").strip()
+    if api_key and api_key in api_keys:
+        lane = api_keys[api_key]
+        key = f"key:{api_key}"
+        if lane not in LANES:
+            lane = BULK
+    else:
+        lane = INTERACTIVE
+        key = f"ip:{host or 'inconnu'}"
+    if (headers.get("x-priority") or "").strip().lower() == BULK:
+        lane = BULK
+    return Client(key=key, lane=lane)
+
+
+class RateLimiter:
+    """
+    Seaux à jetons par client, gardés dans un LRU borné : un client oublié repart d'un seau plein.
+    Utilisé depuis la boucle d'événements uniquement (pas de verrou).
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_clients = max(1, max_clients)
+        # Client -> (jetons restants, instant de la dernière mise à jour)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._allowed = 0
+        self._limited = 0
+
+    def acquire(self, key: str, cost: float = 1.0, now: Optional[float] = None) -> float:
+        """
+        Consomme `cost` jetons du seau du client. Retourne 0 si la requête est acceptée,
+        sinon le délai (secondes) avant que le seau en contienne assez.
+        """
+        now = time.monotonic() if now is None else now
+        bucket = self._buckets.pop(key, None)
+        if bucket is None:
+            tokens = float(self.burst)
+        else:
+            tokens, updated = bucket
+            tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+
+        if tokens >= cost:
+            tokens -= cost
+            wait = 0.0
+            self._allowed += 1
+        else:
+            wait = (cost - tokens) / self.rate
+            self._limited += 1
+
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "clients": len(self._buckets),
+            "allowed": self._allowed,
+            "limited": self._limited,
+        }
+
+
+# Limiteur partagé par les endpoints d'upload (None si CV_RATE_LIMIT vaut 0)
+_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    global _limiter
+    if _limiter is None and config.RATE_LIMIT > 0:
+        _limiter = RateLimiter(
+            rate=config.RATE_LIMIT,
+            burst=config.RATE_LIMIT_BURST,
+            max_clients=config.RATE_LIMIT_CLIENTS
+        )
+        logger.info(f"Limite de débit : {config.RATE_LIMIT} requêtes/s par client (rafale {config.RATE_LIMIT_BURST})")
+    return _limiter
+
+
+def close_rate_limiter() -> None:
+    global _limiter
+    _limiter = None
@@ -0,0 +1,264 @@
+import re
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+from models.cv_result import CVResult
+from services.dictionaries import dictionaries_fingerprint
+from services.extractor import EXTRACTOR_VERSION, NOT_FOUND
+
+logger = logging.getLogger(__name__)
+
+# --- INDEX DE RECHERCHE ---
+# Chaque CV analysé est conservé (résultat + texte nettoyé) dans une base SQLite :
+# une table des documents (filtres exacts, indexés en B-tree) et une table virtuelle FTS5
+# (recherche plein texte classée par BM25), liées par le rowid.
+
+# Mots de la requête (un * final demande une recherche par préfixe) : la syntaxe FTS5
+# n'est jamais exposée (pas d'erreur ni d'injection)
+QUERY_TOKEN_RE = re.compile(r"(\w+)(\*?)", re.UNICODE)
+# Poids BM25 des colonnes FTS : nom, diplôme, texte, domaine (filtre seulement)
+BM25_WEIGHTS = (5.0, 3.0, 1.0, 0.0)
+SNIPPET_TOKENS = 12
+# Version du contenu indexé, à incrémenter quand il change sans que les résultats changent
+# (2 : tous les diplômes de la rubrique Formation dans la colonne diplôme)
+INDEX_VERSION = "2"
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS documents ("
+    "rowid INTEGER PRIMARY KEY, document_id TEXT NOT NULL UNIQUE, filename TEXT, "
+    "email_domain TEXT, result TEXT NOT NULL, version TEXT NOT NULL, indexed_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS documents_email_domain ON documents (email_domain, indexed_at)",
+    "CREATE INDEX IF NOT EXISTS documents_indexed_at ON documents (indexed_at)",
+    # remove_diacritics : "ingénieur" et "ingenieur" se retrouvent.
+    # La colonne domain (voir domain_token) permet de filtrer par domaine dans le FTS lui-même,
+    # sans jointure sur documents pour chaque correspondance.
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+    "name, degree, text, domain, tokenize = 'unicode61 remove_diacritics 2')",
+]
+
+
+def fts_query(text: str, column: Optional[str] = None) -> Optional[str]:
+    """
+    Requête FTS5 à partir d'un texte libre : chaque mot entre guillemets, tous requis
+    ("informat*" trouve "informatique", au prix d'une requête plus lente). None si aucun mot.
+    """
+    tokens = QUERY_TOKEN_RE.findall(text or "")
+    if not tokens:
+        return None
+    query = " ".join(f'"{word}"{star}' for word, star in tokens)
+    return f"{column} : ({query})" if column else query
+
+
+def email_domain(email: str) -> Optional[str]:
+    if not email or email == NOT_FOUND or "@" not in email:
+        return None
+    return email.rsplit("@", 1)[1].lower()
+
+
+def domain_token(domain: str) -> str:
+    """
+    Domaine encodé en un seul mot alphanumérique (hexadécimal) : le tokenizer le garde entier,
+    donc la recherche du mot équivaut à une égalité exacte ("gmail.com" ne trouve pas "gmail.com.au").
+    """
+    return "d" + domain.encode("utf-8").hex()
+
+
+def result_version() -> str:
+    """Version des résultats indexés : un changement de dictionnaires provoque la ré-indexation."""
+    return f"{EXTRACTOR_VERSION}.{INDEX_VERSION}.{dictionaries_fingerprint()}"
+
+
+class SearchIndex:
+    """
+    Index plein texte des CV analysés, mis à jour à chaque upload.
+    La base est partagée entre workers uvicorn (WAL) ; un document ré-analysé remplace l'ancien.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=10, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._db.execute(statement)
+
+    def contains(self, document_id: str) -> bool:
+        """Le document est-il indexé avec la version courante de l'extracteur (et des dictionnaires) ?"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT 1 FROM documents WHERE document_id = ? AND version = ?", (document_id, result_version())
+            ).fetchone()
+        return row is not None
+
+    def add(self, document_id: str, result: CVResult, text: str, filename: Optional[str] = None) -> None:
+        self.add_many([(document_id, result, text, filename)])
+
+    def add_many(self, documents: List[Tuple[str, CVResult, str, Optional[str]]]) -> None:
+        """Indexe (ou ré-indexe) des documents dans une seule transaction."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for document_id, result, text, filename in documents:
+                    self._upsert(document_id, result, text, filename, now)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _upsert(self, document_id: str, result: CVResult, text: str, filename: Optional[str], now: float) -> None:
+        stored = result.model_dump(exclude={"document_id", "duplicates"})
+        domain = email_domain(result.email)
+        row = self._db.execute("SELECT rowid FROM documents WHERE document_id = ?", (document_id,)).fetchone()
+        if row is not None:
+            self._db.execute("DELETE FROM documents_fts WHERE rowid = ?", (row[0],))
+            self._db.execute("DELETE FROM documents WHERE rowid = ?", (row[0],))
+        rowid = self._db.execute(
+            "INSERT INTO documents (document_id, filename, email_domain, result, version, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (document_id, filename, domain, json.dumps(stored, ensure_ascii=False),
+             result_version(), now)
+        ).lastrowid
+        name = " ".join(part for part in (result.first_name, result.last_name) if part != NOT_FOUND)
+        # Tous les diplômes de la rubrique Formation : un filtre trouve aussi le deuxième ou le troisième
+        degree = " ".join(result.degrees) or (result.degree if result.degree != NOT_FOUND else "")
+        self._db.execute(
+            "INSERT INTO documents_fts (rowid, name, degree, text, domain) VALUES (?, ?, ?, ?, ?)",
+            (rowid, name, degree, text, domain_token(domain) if domain else "")
+        )
+
+    def search(
+        self,
+        query: str = "",
+        degree: str = "",
+        domain: str = "",
+        page: int = 1,
+        page_size: int = 20
+    ) -> Dict[str, Any]:
+        """
+        Recherche classée (BM25) et paginée. `degree` restreint la recherche à la colonne
+        diplôme, `domain` filtre sur le domaine exact de l'email. Sans texte ni diplôme,
+        les documents sont listés du plus récent au plus ancien.
+        """
+        page = max(1, page)
+        offset = (page - 1) * page_size
+        domain = domain.strip().lstrip("@").lower()
+        match = " AND ".join(f"({part})" for part in (fts_query(query), fts_query(degree, "degree")) if part)
+
+        with self._lock:
+            if match:
+                total, rows = self._ranked(match, domain, offset, page_size)
+            else:
+                total, rows = self._recent(domain, offset, page_size)
+
+        hits = []
+        for document_id, filename, result, score, snippet in rows:
+            hits.append({
+                "document_id": document_id,
+                "filename": filename,
+                # BM25 de SQLite : plus petit = plus pertinent ; exposé en score croissant
+                "score": round(-score, 4) if score is not None else None,
+                "snippet": snippet,
+                "result": CVResult(**json.loads(result), document_id=document_id),
+            })
+        return {"total": total, "page": page, "page_size": page_size, "hits": hits}
+
+    def _recent(self, domain: str, offset: int, limit: int) -> Tuple[int, List[tuple]]:
+        where, params = ("WHERE email_domain = ?", [domain]) if domain else ("", [])
+        total = self._db.execute(f"SELECT COUNT(*) FROM documents {where}", params).fetchone()[0]
+        rows = self._db.execute(
+            f"SELECT document_id, filename, result, NULL, NULL FROM documents {where} "
+            f"ORDER BY indexed_at DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+        return total, rows
+
+    def _ranked(self, match: str, domain: str, offset: int, limit: int) -> Tuple[int, List[tuple]]:
+        """
+        Requête texte, résolue entièrement dans le FTS (filtre de domaine compris).
+        Au-delà de SEARCH_RANK_WINDOW correspondances, l'ordre est : les SEARCH_RANK_WINDOW plus
+        récentes classées par BM25, puis les suivantes classées par BM25. Les premières pages
+        d'une requête très large ne calculent ainsi BM25 que sur la fenêtre.
+        """
+        if domain:
+            match = f'({match}) AND domain : "{domain_token(domain)}"'
+        total = self._db.execute(
+            "SELECT COUNT(*) FROM documents_fts WHERE documents_fts MATCH ?", (match,)
+        ).fetchone()[0]
+        if offset >= total:
+            return total, []
+
+        if total <= config.SEARCH_RANK_WINDOW:
+            ranked = self._bm25(match, "", [], offset, limit)
+        else:
+            threshold = self._db.execute(
+                "SELECT rowid FROM documents_fts WHERE documents_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                (match, config.SEARCH_RANK_WINDOW - 1)
+            ).fetchone()[0]
+            ranked = []
+            if offset < config.SEARCH_RANK_WINDOW:
+                ranked = self._bm25(match, "AND rowid >= ?", [threshold], offset,
+                                    min(limit, config.SEARCH_RANK_WINDOW - offset))
+            if len(ranked) < limit:
+                ranked += self._bm25(match, "AND rowid < ?", [threshold],
+                                     max(0, offset - config.SEARCH_RANK_WINDOW), limit - len(ranked))
+        if not ranked:
+            return total, []
+
+        # Extraits et résultats des seules lignes de la page, en une requête bornée par rowid
+        rowids = [rowid for rowid, _ in ranked]
+        placeholders = ", ".join("?" * len(rowids))
+        details = {
+            row[0]: row[1:]
+            for row in self._db.execute(
+                f"SELECT documents_fts.rowid, d.document_id, d.filename, d.result, "
+                f"snippet(documents_fts, 2, '[', ']', '…', {SNIPPET_TOKENS}) "
+                f"FROM documents_fts CROSS JOIN documents d ON d.rowid = documents_fts.rowid "
+                f"WHERE documents_fts MATCH ? AND documents_fts.rowid BETWEEN ? AND ? "
+                f"AND documents_fts.rowid IN ({placeholders})",
+                [match, min(rowids), max(rowids)] + rowids
+            )
+        }
+        return total, [(*details[rowid][:3], score, details[rowid][3]) for rowid, score in ranked]
+
+    def _bm25(self, match: str, condition: str, params: List[Any], offset: int, limit: int) -> List[tuple]:
+        weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+        return self._db.execute(
+            f"SELECT rowid, bm25(documents_fts, {weights}) AS score FROM documents_fts "
+            f"WHERE documents_fts MATCH ? {condition} ORDER BY score LIMIT ? OFFSET ?",
+            [match] + params + [limit, offset]
+        ).fetchall()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return {"db_path": self.db_path, "documents": count}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# Index partagé par les endpoints (None si CV_SEARCH_DB n'est pas défini)
+_index: Optional[SearchIndex] = None
+
+
+def get_search_index() -> Optional[SearchIndex]:
+    global _index
+    if _index is None and config.SEARCH_DB:
+        _index = SearchIndex(config.SEARCH_DB)
+        logger.info(f"Index de recherche ouvert : {config.SEARCH_DB}")
+    return _index
+
+
+def close_search_index() -> None:
+    global _index
+    if _index is not None:
+        _index.close()
+        _index = None
@@ -0,0 +1,103 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from services.dictionaries import Dictionaries, get_dictionaries
+
+# --- SECTIONS DU CV ---
+# Un seul parcours du texte repère les titres de rubriques (Formation, Expérience, Compétences...)
+# et produit un index de positions : chaque extracteur ne cherche que dans ses sections
+# (diplômes dans la formation, nom et coordonnées dans l'en-tête). Le texte qui précède le
+# premier titre est l'en-tête ; lu page par page, une section se poursuit sur la page suivante.
+
+HEADER = "header"
+CONTACT = "contact"
+EDUCATION = "education"
+EXPERIENCE = "experience"
+
+# Titre seul sur sa ligne (puces, numérotation et ponctuation tolérées), ou suivi de ":"
+# (le contenu commence alors sur la même ligne). Les lignes commencent aussi après un saut de page.
+HEADING_TEMPLATE = (
+    r"(?:^|(?<=[\f\r\v]))[^\w\n\f]*(?:\d{{1,2}}[.)][^\w\n\f]*)?"
+    r"(?P<heading>{headings})(?:[ \t]*:|[^\w\n\f]*$)"
+)
+
+
+@dataclass(frozen=True)
+class Section:
+    """Contenu d'une section : positions [start, end) dans le texte, et position du titre."""
+    name: str
+    start: int
+    end: int
+    # None pour l'en-tête et pour une section commencée sur une page précédente
+    heading: Optional[Tuple[int, int]] = None
+
+
+@dataclass(frozen=True)
+class SectionIndex:
+    """Sections du texte, dans l'ordre ; elles le couvrent entièrement, sans chevauchement."""
+    sections: Tuple[Section, ...]
+
+    def spans(self, *names: str) -> List[Tuple[int, int]]:
+        """Positions du contenu des sections demandées (une section peut apparaître plusieurs fois)."""
+        return [(section.start, section.end) for section in self.sections if section.name in names]
+
+    def names(self) -> Set[str]:
+        return {section.name for section in self.sections}
+
+    @property
+    def last(self) -> str:
+        """Section en cours à la fin du texte (elle se poursuit sur la page suivante)."""
+        return self.sections[-1].name
+
+
+@lru_cache(maxsize=2)
+def _heading_table(dictionaries: Dictionaries) -> Tuple[Optional["re.Pattern"], Dict[str, str]]:
+    """Expression des titres (compilée une fois par version des dictionnaires) et titre -> section."""
+    headings = dict(dictionaries.section_headings)
+    if not headings:
+        return None, headings
+    # Du plus long au plus court : "formation et diplomes" prime sur "formation"
+    alternatives = "|".join(
+        re.escape(heading).replace(r"\ ", r"[ \t]+") for heading in sorted(headings, key=len, reverse=True)
+    )
+    pattern = re.compile(HEADING_TEMPLATE.format(headings=alternatives), re.IGNORECASE | re.MULTILINE)
+    return pattern, headings
+
+
+def segment(text: str, current: str = HEADER, dictionaries: Optional[Dictionaries] = None) -> SectionIndex:
+    """
+    Découpe le texte en sections. `current` est la section en cours au début du texte
+    (HEADER pour un document, la dernière section de la page précédente sinon).
+    """
+    pattern, headings = _heading_table(dictionaries or get_dictionaries())
+    sections: List[Section] = []
+    name, start, heading = current, 0, None
+    if pattern is not None:
+        for match in pattern.finditer(text):
+            sections.append(Section(name, start, match.start(), heading))
+            title = " ".join(match.group("heading").lower().split())
+            name, start, heading = headings[title], match.end(), match.span("heading")
+    sections.append(Section(name, start, len(text), heading))
+    # L'en-tête vide (titre en première ligne) n'est pas conservé
+    return SectionIndex(tuple(s for s in sections if s.end > s.start or s.heading is not None))
+
+
+class SectionTracker:
+    """Découpage d'un document lu page par page : mémorise la section en cours et les sections vues."""
+
+    def __init__(self):
+        self.current = HEADER
+        self.seen: Set[str] = set()
+
+    def segment(self, text: str) -> SectionIndex:
+        index = segment(text, self.current)
+        if index.sections:
+            self.current = index.last
+        self.seen |= index.names()
+        return index
+
+    def finished(self, name: str) -> bool:
+        """La section a été lue et une autre a commencé : la suite du document ne la concerne plus."""
+        return name in self.seen and self.current != name
@@ -0,0 +1,24 @@
+import io
+import os
+from typing import BinaryIO, Union
+
+# Un document peut être fourni par chemin, en mémoire (bytes) ou sous forme de flux
+DocumentSource = Union[str, os.PathLike, bytes, bytearray, memoryview, BinaryIO]
+
+
+def open_source(source: DocumentSource) -> Union[str, os.PathLike, BinaryIO]:
+    """Convertit une source en objet accepté par les parsers (chemin ou flux binaire)."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return source
+
+
+def describe_source(source: DocumentSource) -> str:
+    """Représentation courte d'une source, pour les logs."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"<mémoire {len(source)} octets>"
+    return f"<flux {getattr(source, 'name', type(source).__name__)}>"
@@ -0,0 +1,100 @@
+import io
+import textwrap
+import logging
+from typing import List
+
+from services.parsers import PDF_MIME, DOCX_MIME
+from services.pdf_parser import PDFIUM_LOCK, load_pdfium
+from services.docx_parser import extract_text_docx
+
+logger = logging.getLogger(__name__)
+
+# --- MINIATURES DES PAGES ---
+# PDF : rendu de la page par PDFium. DOCX : aperçu du texte (pas de moteur de mise en page),
+# une image par page délimitée par les sauts de page explicites.
+# Pillow et PDFium ne sont importés qu'au premier rendu.
+
+A4_RATIO = 297 / 210
+# Lignes de texte par page d'aperçu DOCX
+DOCX_LINES_PER_PAGE = 60
+
+
+def _docx_pages(path: str) -> List[str]:
+    pages = [page.strip("\n") for page in extract_text_docx(path).split("\f")]
+    return [page for page in pages if page.strip()] or [""]
+
+
+def count_pages(path: str, content_type: str) -> int:
+    """Nombre de pages disponibles en miniature."""
+    if content_type == PDF_MIME:
+        with PDFIUM_LOCK:
+            document = load_pdfium().PdfDocument(path)
+            try:
+                return len(document)
+            finally:
+                document.close()
+    if content_type == DOCX_MIME:
+        return len(_docx_pages(path))
+    raise ValueError(f"Type non supporté : {content_type}")
+
+
+# Palette réduite : une miniature de page pèse ~3x moins qu'en couleurs vraies
+THUMBNAIL_COLORS = 64
+
+
+def _to_png(image) -> bytes:
+    buffer = io.BytesIO()
+    image.quantize(THUMBNAIL_COLORS).save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def _render_pdf_page(path: str, page_number: int, width: int) -> bytes:
+    with PDFIUM_LOCK:
+        document = load_pdfium().PdfDocument(path)
+        try:
+            if not 1 <= page_number <= len(document):
+                raise IndexError(f"Page {page_number} absente")
+            page = document[page_number - 1]
+            bitmap = page.render(scale=width / page.get_width())
+            image = bitmap.to_pil().convert("RGB")
+            bitmap.close()
+            page.close()
+        finally:
+            document.close()
+    if image.width != width:
+        # L'arrondi du rendu peut décaler d'un pixel : largeur exacte demandée
+        image = image.resize((width, round(image.height * width / image.width)))
+    return _to_png(image)
+
+
+def _render_text_page(text: str, width: int) -> bytes:
+    """Aperçu d'une page de texte : fond blanc, police par défaut, lignes coupées à la largeur."""
+    from PIL import Image, ImageDraw, ImageFont
+
+    height = int(width * A4_RATIO)
+    margin = max(8, width // 16)
+    line_height = (height - 2 * margin) / DOCX_LINES_PER_PAGE
+    font = ImageFont.load_default(size=max(6, int(line_height * 0.8)))
+    chars_per_line = max(10, int((width - 2 * margin) / (line_height * 0.45)))
+
+    lines = []
+    for paragraph in text.split("\n"):
+        lines += textwrap.wrap(paragraph.replace("\t", "  "), chars_per_line) or [""]
+
+    image = Image.new("RGB", (width, height), "white")
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(lines[:DOCX_LINES_PER_PAGE]):
+        draw.text((margin, margin + index * line_height), line, fill=(15, 23, 42), font=font)
+    return _to_png(image)
+
+
+def render_thumbnail(path: str, content_type: str, page_number: int, width: int) -> bytes:
+    """Miniature PNG d'une page (numérotée à partir de 1). Lève IndexError si la page n'existe pas."""
+    if content_type == PDF_MIME:
+        return _render_pdf_page(path, page_number, width)
+    if content_type == DOCX_MIME:
+        pages = _docx_pages(path)
+        if not 1 <= page_number <= len(pages):
+            raise IndexError(f"Page {page_number} absente")
+        return _render_text_page(pages[page_number - 1], width)
+    raise ValueError(f"Type non supporté : {content_type}")
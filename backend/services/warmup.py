@@ -0,0 +1,156 @@
+import io
+import time
+import asyncio
+import zipfile
+import logging
+from typing import Any, Dict, Optional
+
+from services.parsers import PDF_MIME, DOCX_MIME, backend_chain
+from services.pdf_parser import count_pages_pdf
+from services.pipeline import analyze_document
+
+logger = logging.getLogger(__name__)
+
+# --- PRÉCHAUFFAGE ---
+# Les parsers sont importés paresseusement et pdfminer/pdfplumber initialisent des tables
+# au premier document : un mini PDF et un mini DOCX intégrés sont analysés au démarrage
+# pour que la première vraie requête ne paie pas ce coût.
+
+WARMUP_LINES = ["Jean Dupont", "jean.dupont@example.com", "06 12 34 56 78", "Master Informatique"]
+
+
+def tiny_pdf() -> bytes:
+    """PDF d'une page (police standard, quelques lignes de texte), xref calculée."""
+    text = b"".join(
+        b"BT /F1 11 Tf 72 " + str(770 - 16 * index).encode() + b" Td (" + line.encode("latin-1") + b") Tj ET\n"
+        for index, line in enumerate(WARMUP_LINES)
+    )
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [4 0 R] /Count 1 >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 3 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Length " + str(len(text)).encode() + b" >>\nstream\n" + text + b"\nendstream",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def tiny_docx() -> bytes:
+    """DOCX minimal : types de contenu, relation principale et un paragraphe par ligne."""
+    paragraphs = "".join(f"<w:p><w:r><w:t>{line}</w:t></w:r></w:p>" for line in WARMUP_LINES)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '</Types>'
+        )
+        archive.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="word/document.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+            '</Relationships>'
+        )
+        archive.writestr(
+            "word/document.xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{paragraphs}</w:body></w:document>'
+        )
+    return buffer.getvalue()
+
+
+def warm_up() -> float:
+    """
+    Exécute chaque backend configuré puis le pipeline complet sur les documents intégrés.
+    Retourne la durée (secondes).
+    """
+    started = time.perf_counter()
+    documents = {PDF_MIME: tiny_pdf(), DOCX_MIME: tiny_docx()}
+    count_pages_pdf(documents[PDF_MIME])
+    for content_type, content in documents.items():
+        for backend in backend_chain(content_type):
+            try:
+                for _ in backend.iter_pages(content, 1):
+                    pass
+            except Exception as e:
+                logger.warning(f"Préchauffage du backend {backend.name} en échec : {e}")
+        analyze_document(content, content_type, "warmup")
+    return time.perf_counter() - started
+
+
+def warm_up_worker() -> None:
+    """
+    Initializer des processus de l'exécuteur (premier pool et pools recyclés) : chaque processus
+    est préchauffé avant sa première tâche. Un échec ne doit pas casser le pool.
+    """
+    try:
+        warm_up()
+    except Exception as e:
+        logger.warning(f"Préchauffage du worker en échec : {e}")
+
+
+# --- ÉTAT DE PRÉPARATION ---
+
+_state: Dict[str, Any] = {"ready": False, "seconds": None}
+
+
+def is_ready() -> bool:
+    return _state["ready"]
+
+
+def readiness() -> Dict[str, Any]:
+    if not _state["ready"]:
+        return {"status": "warming"}
+    return {"status": "ready", "warmup_seconds": _state["seconds"]}
+
+
+def mark_ready(seconds: Optional[float] = None) -> None:
+    _state.update(ready=True, seconds=seconds)
+
+
+def reset_readiness() -> None:
+    _state.update(ready=False, seconds=None)
+
+
+async def warm_up_service(executor) -> None:
+    """
+    Démarre l'exécuteur et attend le préchauffage avant de déclarer le service prêt.
+    En mode "process", chaque processus du pool se préchauffe dans son initializer (warm_up_worker)
+    et ne prend aucune tâche avant : aucune requête ne tombe sur un processus froid. Les `workers`
+    appels soumis ici démarrent le pool et attendent les premiers processus prêts ; rien ne garantit
+    qu'ils se répartissent un par processus (un processus rapide peut en prendre plusieurs), donc
+    /ready peut répondre avant la fin du préchauffage des derniers : signal au mieux.
+    En mode "thread", les modules sont partagés : un préchauffage vaut pour tous les threads.
+    Il n'est pas exécuté dans un thread du processus principal : un fork du pool pendant un import
+    laisserait un verrou pris dans l'enfant.
+    Un échec n'empêche pas le service de passer prêt : les requêtes paieront l'initialisation.
+    """
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(executor.run(warm_up) for _ in range(executor.workers)))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"Préchauffage incomplet : {e}")
+    seconds = round(time.perf_counter() - started, 3)
+    mark_ready(seconds)
+    logger.info(f"Service prêt (préchauffage en {seconds} s)")
@@ -0,0 +1,63 @@
+import sys
+import os
+import io
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+import config
+from main import app
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def make_docx(*lines: str) -> bytes:
+    """Construit un DOCX minimal en mémoire (un paragraphe par ligne)."""
+    doc = Document()
+    for line in lines:
+        doc.add_paragraph(line)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def uploads_total(content_type: str, status: int) -> float:
+    """Valeur du compteur cv_uploads_total (global au processus : comparer avant/après)."""
+    labels = {"content_type": content_type, "status": str(status)}
+    return REGISTRY.get_sample_value("cv_uploads_total", labels) or 0.0
+
+
+# --- CLIENT DE L'API ---
+
+@pytest.fixture
+def client_config():
+    """Config propre aux tests d'API d'un module (à redéfinir dans le module : {nom: valeur})."""
+    return {}
+
+
+@pytest.fixture
+def client(request, tmp_path, monkeypatch, client_config):
+    """
+    Application démarrée (lifespan compris). Par défaut : file de jobs et doublons en mémoire,
+    documents dans tmp_path, recherche désactivée. La config est complétée par la fixture
+    `client_config` du module, puis par le paramètre indirect du test :
+        @pytest.mark.parametrize("client", [{"WARMUP": False}], indirect=True)
+    Toutes les valeurs passent par monkeypatch : elles sont restaurées après le test.
+    """
+    values = {
+        "JOB_DB": ":memory:",
+        "DEDUP_DB": ":memory:",
+        "DOCUMENT_DIR": str(tmp_path / "documents"),
+        "SEARCH_DB": "",
+    }
+    values.update(client_config)
+    values.update(getattr(request, "param", {}))
+    for name, value in values.items():
+        monkeypatch.setattr(config, name, value)
+    with TestClient(app) as c:
+        yield c
@@ -0,0 +1,164 @@
+import sys
+import os
+import io
+import zipfile
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+import config
+from benchmarks.corpus import make_cv, render_pdf
+from conftest import DOCX_MIME, make_docx, uploads_total
+
+CV_DOCX = make_docx(
+    "Jean Dupont",
+    "jean.dupont@gmail.com - 06 12 34 56 78",
+    "Formation : Master Data Science"
+)
+
+
+# TESTS UPLOAD SIMPLE
+
+def test_upload_cv_docx(client):
+    """Test nominal d'un DOCX valide."""
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.docx", CV_DOCX, DOCX_MIME)})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["first_name"] == "Jean"
+    assert data["email"] == "jean.dupont@gmail.com"
+    assert data["phone"] == "06 12 34 56 78"
+
+
+def test_upload_cv_bad_format(client):
+    """Un format non supporté est rejeté en 400."""
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.png", b"\x89PNG", "image/png")})
+    assert resp.status_code == 400
+
+
+# TESTS BATCH
+
+def test_batch_multiple_files_with_failure(client):
+    """Un fichier corrompu n'interrompt pas le lot ; chaque document est compté dans les métriques."""
+    before = uploads_total("docx", 200), uploads_total("docx", 422)
+    files = [
+        ("files", ("a.docx", CV_DOCX, DOCX_MIME)),
+        ("files", ("corrompu.docx", b"pas un docx", DOCX_MIME)),
+    ]
+    resp = client.post("/api/v1/upload-cv/batch", files=files)
+    assert resp.status_code == 200
+    items = resp.json()
+    assert [item["filename"] for item in items] == ["a.docx", "corrompu.docx"]
+    assert items[0]["status_code"] == 200
+    assert items[0]["result"]["email"] == "jean.dupont@gmail.com"
+    assert items[1]["status_code"] == 422
+    assert items[1]["error"]
+    assert (uploads_total("docx", 200), uploads_total("docx", 422)) == (before[0] + 1, before[1] + 1)
+
+
+def test_batch_zip_archive(client):
+    """Une archive ZIP est dépliée : seuls les PDF/DOCX sont traités."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("cvs/un.docx", CV_DOCX)
+        archive.writestr("cvs/deux.docx", CV_DOCX)
+        archive.writestr("cvs/notes.txt", "ignoré")
+    resp = client.post(
+        "/api/v1/upload-cv/batch",
+        files=[("files", ("lot.zip", buffer.getvalue(), "application/zip"))]
+    )
+    assert resp.status_code == 200
+    items = resp.json()
+    assert sorted(item["filename"] for item in items) == ["cvs/deux.docx", "cvs/un.docx"]
+    assert all(item["status_code"] == 200 for item in items)
+
+
+def test_batch_zip_entry_too_large(client, monkeypatch):
+    """Une entrée d'archive trop volumineuse est signalée comme telle (413), pas comme un fichier vide."""
+    monkeypatch.setattr(config, "BATCH_MAX_ENTRY_SIZE", len(CV_DOCX))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("un.docx", CV_DOCX)
+        archive.writestr("gros.docx", CV_DOCX + b"\0" * 1024)
+    resp = client.post("/api/v1/upload-cv/batch", files=[("files", ("lot.zip", buffer.getvalue(), "application/zip"))])
+    items = {item["filename"]: item for item in resp.json()}
+    assert items["un.docx"]["status_code"] == 200
+    assert items["gros.docx"]["status_code"] == 413
+    assert items["gros.docx"]["error"] == "Fichier trop volumineux."
+
+
+# TESTS CACHE
+
+def test_upload_cv_served_from_cache(client):
+    """Un second envoi du même fichier est servi par le cache."""
+    cv = make_docx("Marie Curie", "marie.curie@gmail.com")
+    before = client.get("/api/v1/cache").json()
+    first = client.post("/api/v1/upload-cv", files={"file": ("cv.docx", cv, DOCX_MIME)})
+    second = client.post("/api/v1/upload-cv", files={"file": ("cv.docx", cv, DOCX_MIME)})
+    after = client.get("/api/v1/cache").json()
+
+    assert first.json() == second.json()
+    assert after["hits"] == before["hits"] + 1
+
+
+# TESTS MÉTRIQUES
+
+def test_upload_cv_server_timing(client):
+    """La réponse porte les durées par étape dans Server-Timing."""
+    cv = make_docx("Paul Durand", "paul.durand@gmail.com")
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.docx", cv, DOCX_MIME)})
+    assert resp.status_code == 200
+    stages = [part.split(";")[0].strip() for part in resp.headers["Server-Timing"].split(",")]
+    assert {"read", "parse", "clean", "extract_scan"} <= set(stages)
+
+def test_metrics_endpoint(client):
+    """Les uploads sont comptés par type de contenu et code de réponse."""
+    client.post("/api/v1/upload-cv", files={"file": ("cv.png", b"\x89PNG", "image/png")})
+    body = client.get("/metrics").text
+    assert 'cv_uploads_total{content_type="other",status="400"}' in body
+    assert "cv_stage_duration_seconds_bucket" in body
+
+
+# TESTS APERÇU
+
+def test_pdf_thumbnails(client):
+    """Le document reçu est identifié par son empreinte ; ses pages sont rendues à la demande."""
+    cv = make_cv(9, pages=2)
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", render_pdf(cv), "application/pdf")})
+    document_id = resp.json()["document_id"]
+
+    info = client.get(f"/api/v1/documents/{document_id}").json()
+    assert info["pages"] == 2 and info["content_type"] == "application/pdf"
+
+    page = client.get(f"/api/v1/documents/{document_id}/pages/1.png", params={"width": 200})
+    assert page.status_code == 200
+    assert page.headers["content-type"] == "image/png"
+    assert "immutable" in page.headers["cache-control"]
+    assert Image.open(io.BytesIO(page.content)).width == 200
+
+    # Seconde demande : servie depuis le disque, identique
+    again = client.get(f"/api/v1/documents/{document_id}/pages/1.png", params={"width": 200})
+    assert again.content == page.content
+    assert client.get(f"/api/v1/documents/{document_id}/pages/3.png").status_code == 404
+
+def test_docx_thumbnail(client):
+    """Un DOCX a aussi un aperçu (rendu du texte)."""
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.docx", CV_DOCX, DOCX_MIME)})
+    document_id = resp.json()["document_id"]
+    page = client.get(f"/api/v1/documents/{document_id}/pages/1.png")
+    assert page.status_code == 200
+    assert Image.open(io.BytesIO(page.content)).width == config.THUMBNAIL_WIDTH
+
+@pytest.mark.parametrize("client", [{"DOCUMENT_DIR": ""}], indirect=True)
+def test_document_store_disabled(client, tmp_path):
+    """Sans CV_DOCUMENT_DIR, l'analyse fonctionne mais aucun document n'est conservé."""
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.docx", CV_DOCX, DOCX_MIME)})
+    assert resp.status_code == 200
+    assert client.get(f"/api/v1/documents/{resp.json()['document_id']}").status_code == 404
+    assert list(tmp_path.iterdir()) == []
+
+def test_unknown_document(client):
+    assert client.get("/api/v1/documents/" + "0" * 64).status_code == 404
+    assert client.get("/api/v1/documents/../../etc/pages/1.png").status_code == 404
@@ -0,0 +1,82 @@
+import sys
+import os
+import json
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'benchmarks'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import make_cv, render_pdf, render_docx
+from benchmarks.loadtest import compare_reports, main as run_loadtest, parse_mix, percentile
+from benchmarks.run import compare_to_baseline
+from benchmarks.search import main as run_search_benchmark
+from services.pipeline import analyze_document, PDF_MIME, DOCX_MIME
+
+
+# TESTS CORPUS SYNTHÉTIQUE
+
+def test_corpus_is_deterministic():
+    """Même graine -> mêmes octets."""
+    assert render_pdf(make_cv(7, pages=2)) == render_pdf(make_cv(7, pages=2))
+    assert make_cv(7, lang="en").email == make_cv(7, lang="en").email
+
+@pytest.mark.parametrize("lang", ["fr", "en"])
+def test_corpus_documents_are_extractable(lang):
+    """Les CV générés sont lisibles par les parsers et les champs attendus sont retrouvés."""
+    cv = make_cv(3, pages=2, lang=lang)
+    for content, content_type in ((render_pdf(cv), PDF_MIME), (render_docx(cv), DOCX_MIME)):
+        result = analyze_document(content, content_type)
+        assert result.email == cv.email
+        assert result.phone == cv.phone
+        assert result.first_name == cv.first_name
+
+
+# TESTS COMPARAISON À LA RÉFÉRENCE
+
+def test_compare_to_baseline():
+    baseline = {"doc": {"parse_pdf": {"seconds": 0.100}, "clean_text": {"seconds": 0.0001}}}
+    results = {"doc": {"parse_pdf": {"seconds": 0.200}, "clean_text": {"seconds": 0.0010}}}
+    regressions = compare_to_baseline(results, baseline, tolerance=0.5, min_delta=0.002)
+    # clean_text est 10x plus lent mais l'écart absolu reste sous le seuil
+    assert len(regressions) == 1
+    assert "parse_pdf" in regressions[0]
+
+
+# TESTS BENCHMARK DE LA RECHERCHE
+
+def test_search_benchmark_runs(tmp_path):
+    output = tmp_path / "search.json"
+    assert run_search_benchmark(["--documents", "200", "--runs", "2", "--json", str(output)]) == 0
+    assert output.exists()
+
+
+# TESTS TEST DE CHARGE
+
+def test_percentile_and_mix():
+    values = sorted(float(v) for v in range(1, 101))
+    assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (50, 95, 99)
+    assert percentile([0.2], 99) == 0.2
+    assert parse_mix("upload=3,bulk") == {"upload": 3.0, "bulk": 1.0}
+    with pytest.raises(ValueError):
+        parse_mix("inconnu=1")
+
+def test_compare_loadtest_reports():
+    def report(p95, rps, error_rate=0.0):
+        return {"scenarios": [{"workers": 1, "pages": 5, "latency_ms": {"p95": p95},
+                               "throughput_rps": rps, "error_rate": error_rate}]}
+    assert compare_reports(report(110, 9.5), report(100, 10), max_regression=0.3) == []
+    regressions = compare_reports(report(200, 5, 0.2), report(100, 10), max_regression=0.3)
+    assert len(regressions) == 3 and "p95" in regressions[0]
+
+def test_loadtest_runs(tmp_path):
+    """Démarre uvicorn, envoie quelques requêtes et écrit un rapport comparable."""
+    output = tmp_path / "loadtest.json"
+    argv = ["--workers", "1", "--pages", "1", "--documents", "4", "--requests", "8", "--concurrency", "2",
+            "--mix", "upload=2,bulk=1,batch=1", "--json", str(output)]
+    assert run_loadtest(argv) == 0
+    report = json.loads(output.read_text(encoding="utf-8"))
+    scenario = report["scenarios"][0]
+    assert scenario["requests"] == 8 and scenario["error_rate"] == 0
+    assert scenario["latency_ms"]["p50"] <= scenario["latency_ms"]["p95"] <= scenario["latency_ms"]["p99"]
+    assert set(scenario["by_kind"]) <= {"upload", "bulk", "batch"}
+    assert run_loadtest(argv[:-2] + ["--compare", str(output), "--max-regression", "100"]) == 0
@@ -0,0 +1,112 @@
+import sys
+import os
+import asyncio
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'services'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import DOCX_MIME, make_docx
+from services import cache as cache_module
+from services.cache import ResultCache, make_cache_key
+
+RESULT = {"first_name": "Jean", "last_name": "Dupont", "email": "-", "phone": "-", "degree": "-"}
+
+
+def test_cache_key_depends_on_content_and_version(monkeypatch):
+    """La clé change avec le contenu et avec la version de l'extracteur."""
+    key = make_cache_key(b"abc")
+    assert key != make_cache_key(b"abd")
+    monkeypatch.setattr(cache_module, "EXTRACTOR_VERSION", "999")
+    assert key != make_cache_key(b"abc")
+
+def test_cache_hit_and_miss():
+    cache = ResultCache(max_entries=10)
+    assert cache.get("k") is None
+    cache.set("k", RESULT)
+    assert cache.get("k") == RESULT
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+def test_cache_lru_eviction():
+    """L'entrée la moins récemment utilisée est évincée."""
+    cache = ResultCache(max_entries=2)
+    cache.set("a", RESULT)
+    cache.set("b", RESULT)
+    cache.get("a")
+    cache.set("c", RESULT)
+    assert cache.get("b") is None
+    assert cache.get("a") == RESULT
+    assert cache.stats()["evictions"] == 1
+
+def test_cache_ttl_expiration():
+    cache = ResultCache(max_entries=10, ttl=-1)
+    cache.set("k", RESULT)
+    assert cache.get("k") is None
+    assert cache.stats()["expirations"] == 1
+
+def test_cache_sqlite_survives_restart(tmp_path):
+    """Le niveau SQLite est relu par une nouvelle instance (redémarrage / autre worker)."""
+    db_path = str(tmp_path / "cache.db")
+    first = ResultCache(max_entries=10, db_path=db_path)
+    first.set("k", RESULT)
+    first.close()
+
+    second = ResultCache(max_entries=10, db_path=db_path)
+    assert second.get("k") == RESULT
+    assert second.stats()["disk_hits"] == 1
+    second.close()
+
+def test_cache_sqlite_purged_periodically(tmp_path):
+    """Les entrées expirées sont supprimées à l'ouverture puis toutes les `purge_every` écritures."""
+    db_path = str(tmp_path / "cache.db")
+    expired = ResultCache(max_entries=0, ttl=-1, db_path=db_path, purge_every=1000)
+    for key in ("a", "b", "c"):
+        expired.set(key, RESULT)
+
+    def rows(cache):
+        return cache._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    # Pas de purge à chaque écriture : les entrées expirées restent (jamais servies)
+    assert rows(expired) == 3 and expired.get("a") is None
+    expired.close()
+
+    cache = ResultCache(max_entries=0, ttl=-1, db_path=db_path, purge_every=2)
+    assert rows(cache) == 0
+    cache.set("d", RESULT)
+    assert rows(cache) == 1
+    cache.set("e", RESULT)
+    assert rows(cache) == 0
+    plan = cache._db.execute("EXPLAIN QUERY PLAN DELETE FROM results WHERE expires_at <= 0").fetchall()
+    assert "results_expires_at" in str(plan)
+    cache.close()
+
+
+# TESTS API
+
+def test_cache_used_outside_event_loop(client, monkeypatch):
+    """Le cache (SQLite sous verrou) n'est jamais appelé depuis la boucle d'événements."""
+    calls = []
+
+    def in_event_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    def traced(method):
+        def wrapper(self, *args):
+            calls.append(in_event_loop())
+            return method(self, *args)
+        return wrapper
+
+    monkeypatch.setattr(ResultCache, "get", traced(ResultCache.get))
+    monkeypatch.setattr(ResultCache, "set", traced(ResultCache.set))
+
+    cv = make_docx("Jean Dupont", "jean.dupont@gmail.com")
+    for _ in range(2):
+        assert client.post("/api/v1/upload-cv", files={"file": ("cv.docx", cv, DOCX_MIME)}).status_code == 200
+    files = [("files", ("a.docx", cv, DOCX_MIME)), ("files", ("b.docx", make_docx("Marie Curie"), DOCX_MIME))]
+    assert client.post("/api/v1/upload-cv/batch", files=files).status_code == 200
+    assert len(calls) >= 5 and not any(calls)
@@ -0,0 +1,78 @@
+import sys
+import os
+import json
+import zipfile
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'cli'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cli
+from benchmarks.corpus import make_cv, render_pdf, render_docx
+
+
+@pytest.fixture
+def cv_dir(tmp_path):
+    """Dossier de CV : deux documents valides, un PDF corrompu et des fichiers ignorés."""
+    root = tmp_path / "cvs"
+    (root / "sous-dossier").mkdir(parents=True)
+    (root / "un.docx").write_bytes(render_docx(make_cv(1)))
+    (root / "sous-dossier" / "deux.pdf").write_bytes(render_pdf(make_cv(2)))
+    (root / "corrompu.pdf").write_bytes(b"%PDF-corrompu")
+    (root / "notes.txt").write_text("ignoré")
+    (root / ".cache.pdf").write_bytes(b"%PDF-cache")
+    return root
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+# TESTS CLI
+
+def test_directory_to_jsonl(cv_dir, tmp_path):
+    output = tmp_path / "out.jsonl"
+    assert cli.main([str(cv_dir), "-o", str(output), "--workers", "1"]) == 0
+
+    lines = {line["filename"]: line for line in read_lines(output)}
+    assert set(lines) == {"un.docx", "sous-dossier/deux.pdf", "corrompu.pdf"}
+    assert lines["un.docx"]["result"]["email"] == make_cv(1).email
+    assert lines["corrompu.pdf"]["status_code"] == 422
+
+def test_resume_from_checkpoint(cv_dir, tmp_path):
+    """Une reprise ne retraite pas les documents déjà inscrits dans le fichier de reprise."""
+    output = tmp_path / "out.jsonl"
+    output.write_text(json.dumps({"filename": "un.docx", "status_code": 200}) + "\n")
+    (tmp_path / "out.jsonl.checkpoint").write_text("un.docx\n")
+
+    assert cli.main([str(cv_dir), "-o", str(output), "--workers", "1"]) == 0
+    names = [line["filename"] for line in read_lines(output)]
+    assert sorted(names) == ["corrompu.pdf", "sous-dossier/deux.pdf", "un.docx"]
+
+def test_zip_to_stdout(tmp_path, capsys):
+    archive_path = tmp_path / "lot.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        archive.writestr("cvs/un.docx", render_docx(make_cv(3)))
+        archive.writestr("__MACOSX/cvs/._un.docx", b"")
+
+    assert cli.main([str(archive_path), "--workers", "1"]) == 0
+    [line] = [json.loads(text) for text in capsys.readouterr().out.splitlines()]
+    assert line["filename"] == "cvs/un.docx" and line["status_code"] == 200
+
+def test_zip_entries_sized_in_parent_and_archive_opened_once(tmp_path, monkeypatch):
+    """La taille vient du parcours de l'archive ; chaque processus n'ouvre l'archive qu'une fois."""
+    archive_path = tmp_path / "lot.zip"
+    with zipfile.ZipFile(archive_path, "w") as archive:
+        for seed in range(3):
+            archive.writestr(f"cv{seed}.docx", render_docx(make_cv(seed)))
+    items = list(cli.iter_items(str(archive_path)))
+    assert [size for *_, size in items] == [zipfile.ZipFile(archive_path).getinfo(f"cv{i}.docx").file_size for i in range(3)]
+
+    cli.open_archive.cache_clear()
+    lines = [cli.process_item(*item) for item in items]
+    assert [line["status_code"] for line in lines] == [200, 200, 200]
+    assert cli.open_archive.cache_info().misses == 1
+
+    monkeypatch.setattr(cli.config, "BATCH_MAX_ENTRY_SIZE", 10)
+    assert cli.process_item(*items[0])["status_code"] == 413
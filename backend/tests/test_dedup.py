@@ -0,0 +1,184 @@
+import sys
+import os
+import random
+import subprocess
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from benchmarks.corpus import make_cv, render_pdf, render_docx
+from conftest import DOCX_MIME
+from models.cv_result import CVResult
+from services import dedup
+from services.dedup import DedupIndex, close_dedup_index, document_signature, minhash, similarity, shingles
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = [f"mot{n}" for n in range(3000)]
+
+
+def make_result(email: str = "jean@gmail.com", phone: str = "06 12 34 56 78") -> CVResult:
+    return CVResult(first_name="Jean", last_name="Dupont", email=email, phone=phone, degree="Master")
+
+
+def random_text(seed: int, words: int = 400) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def edit(text: str, ratio: float, seed: int = 0) -> str:
+    """Remplace une part `ratio` des mots du texte."""
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) if rng.random() < ratio else word for word in text.split())
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DedupIndex(str(tmp_path / "dedup.db"))
+    yield index
+    index.close()
+
+
+# TESTS SIGNATURES
+
+def test_minhash_estimates_jaccard():
+    """L'estimation reste proche de la similarité de Jaccard exacte des shingles."""
+    original = random_text(1)
+    for ratio in (0.02, 0.1, 0.3):
+        modified = edit(original, ratio)
+        left, right = shingles(original, 3), shingles(modified, 3)
+        exact = len(left & right) / len(left | right)
+        estimate = similarity(minhash(original, 128, 3), minhash(modified, 128, 3))
+        assert abs(estimate - exact) < 0.15
+
+def test_minhash_short_and_empty_text():
+    signature = minhash("Jean Dupont développeur", 128, 3)
+    assert len(signature) == 128
+    assert similarity(signature, minhash("jean dupont DÉVELOPPEUR", 128, 3)) == 1.0
+    assert minhash(" - ", 128, 3) is None
+
+def test_signature_is_stable_across_processes():
+    """Hachage déterministe (blake2b) : les workers produisent la même signature, quel que soit PYTHONHASHSEED."""
+    probe = "from services.dedup import minhash; print(minhash('master informatique paris', 8, 2))"
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        env={**os.environ, "PYTHONHASHSEED": "123"}
+    ).stdout
+    assert output.strip() == str(minhash("master informatique paris", 8, 2))
+
+
+# TESTS INDEX
+
+def test_find_requires_confirmation(index):
+    """Texte proche mais identité différente : pas de doublon sous le seuil quasi-identique."""
+    text = random_text(2)
+    index.add("a" * 64, document_signature(text), make_result())
+    near = document_signature(edit(text, 0.05))
+    assert similarity(near, document_signature(text)) < config.DEDUP_NEAR_IDENTICAL
+
+    [match] = index.find(near, make_result(email="autre@gmail.com"))
+    assert match.document_id == "a" * 64
+    assert match.same_phone and not match.same_email
+    assert index.find(near, make_result(email="autre@gmail.com", phone="0700000000")) == []
+
+def test_find_near_identical_without_fields(index):
+    text = random_text(3)
+    index.add("a" * 64, document_signature(text), make_result())
+    [match] = index.find(document_signature(text), make_result(email="Non trouvé", phone="Non trouvé"))
+    assert match.similarity == 1.0
+    assert not match.same_email and not match.same_phone
+
+def test_find_ignores_unrelated_and_self(index):
+    index.add("a" * 64, document_signature(random_text(4)), make_result())
+    assert index.find(document_signature(random_text(5)), make_result()) == []
+    signature = document_signature(random_text(6))
+    assert index.check_in("b" * 64, signature, make_result()) == []
+    assert index.find(signature, make_result(), exclude="b" * 64) == []
+
+def test_phone_and_email_normalized(index):
+    text = random_text(7)
+    index.add("a" * 64, document_signature(text), make_result(email="Jean@Gmail.com", phone="+33 6 12 34 56 78"))
+    [match] = index.find(document_signature(edit(text, 0.05)), make_result(phone="0612345678"))
+    assert match.same_email and match.same_phone
+
+def test_add_replaces_signature(index):
+    index.add("a" * 64, document_signature(random_text(8)), make_result())
+    index.add("a" * 64, document_signature(random_text(9)), make_result())
+    assert index.stats()["documents"] == 1
+    assert index.find(document_signature(random_text(8)), make_result()) == []
+    assert index.find(document_signature(random_text(9)), make_result())[0].document_id == "a" * 64
+
+def test_signature_params_checked(index, monkeypatch):
+    index.add("a" * 64, document_signature(random_text(10)), make_result())
+    assert index.get("a" * 64) == document_signature(random_text(10))
+    monkeypatch.setattr(dedup, "EXTRACTOR_VERSION", "autre")
+    assert index.get("a" * 64) is None
+    assert index.find(document_signature(random_text(10)), make_result()) == []
+
+def test_find_ranks_candidates_before_limit(index, monkeypatch):
+    """Candidats limités : le document exclu n'en prend pas la place, les plus proches passent d'abord."""
+    monkeypatch.setattr(config, "DEDUP_MAX_CANDIDATES", 1)
+    text = random_text(11)
+    signature = document_signature(text)
+    for n in range(5):
+        index.add(f"{n:064x}", document_signature(edit(text, 0.1, seed=n)), make_result())
+    index.add("e" * 64, document_signature(edit(text, 0.02)), make_result())
+    index.add("f" * 64, signature, make_result())
+    [match] = index.find(signature, make_result(), exclude="f" * 64)
+    assert match.document_id == "e" * 64
+
+
+# TESTS API
+
+@pytest.fixture
+def client_config(tmp_path):
+    return {"DEDUP_DB": str(tmp_path / "dedup.db")}
+
+def test_upload_reports_duplicate_across_formats(client):
+    """Le même CV en PDF puis en DOCX : le second signale le premier."""
+    cv = make_cv(41)
+    first = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", render_pdf(cv), "application/pdf")})
+    assert first.status_code == 200
+    assert first.json()["duplicates"] == []
+
+    second = client.post("/api/v1/upload-cv", files={"file": ("cv.docx", render_docx(cv), DOCX_MIME)})
+    assert "dedup" in second.headers["Server-Timing"]
+    [match] = second.json()["duplicates"]
+    assert match["document_id"] == first.json()["document_id"]
+    assert match["similarity"] >= config.DEDUP_NEAR_IDENTICAL
+    assert match["same_email"] and match["same_phone"]
+
+def test_cached_upload_reports_duplicates(client):
+    """Un résultat servi depuis le cache signale aussi ses doublons (signature enregistrée)."""
+    cv = make_cv(42)
+    pdf = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", render_pdf(cv), "application/pdf")}).json()
+    content = render_docx(cv)
+    client.post("/api/v1/upload-cv", files={"file": ("cv.docx", content, DOCX_MIME)})
+    again = client.post("/api/v1/upload-cv", files={"file": ("cv.docx", content, DOCX_MIME)})
+    assert "extract_scan" not in again.headers["Server-Timing"]
+    assert [match["document_id"] for match in again.json()["duplicates"]] == [pdf["document_id"]]
+
+def test_different_cvs_are_not_duplicates(client):
+    for seed in (43, 44):
+        resp = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", render_pdf(make_cv(seed)), "application/pdf")})
+        assert resp.json()["duplicates"] == []
+
+def test_batch_reports_duplicates_within_batch(client):
+    cv = make_cv(45, lang="en")
+    files = [
+        ("files", ("cv.pdf", render_pdf(cv), "application/pdf")),
+        ("files", ("cv.docx", render_docx(cv), DOCX_MIME)),
+    ]
+    items = client.post("/api/v1/upload-cv/batch", files=files).json()
+    assert items[0]["result"]["duplicates"] == []
+    assert len(items[1]["result"]["duplicates"]) == 1
+
+def test_dedup_disabled(client, monkeypatch):
+    cv = make_cv(41)
+    client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", render_pdf(cv), "application/pdf")})
+    close_dedup_index()
+    monkeypatch.setattr(config, "DEDUP_DB", "")
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv2.docx", render_docx(cv), DOCX_MIME)})
+    assert resp.json()["duplicates"] == []
+    assert "dedup" not in resp.headers["Server-Timing"]
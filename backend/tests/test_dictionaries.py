@@ -0,0 +1,158 @@
+import sys
+import os
+import time
+import shutil
+import asyncio
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from services import dictionaries
+from services.cache import make_cache_key
+from services.dictionaries import (
+    DICTIONARY_FILES, OPTIONAL_FILES, DictionaryError, dictionaries_fingerprint, get_dictionaries, load_dictionaries,
+    reload_dictionaries
+)
+from services.executor import BoundedExecutor
+from services.extractor import extract_degree, extract_name
+
+ADMIN_TOKEN = "secret-admin"
+GAZETTEER_SIZE = 50_000
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Copie modifiable des dictionnaires livrés ; la version livrée est rechargée ensuite."""
+    directory = tmp_path / "data"
+    shutil.copytree(config.DICTIONARY_DIR, directory)
+    monkeypatch.setattr(config, "DICTIONARY_DIR", str(directory))
+    yield directory
+    monkeypatch.undo()
+    reload_dictionaries()
+
+
+def letters(number: int) -> str:
+    """Mot de 4 lettres distinct pour chaque nombre (les noms ne contiennent pas de chiffres)."""
+    return "".join(chr(ord("a") + number // 26 ** power % 26) for power in range(4))
+
+
+def append(path, *entries: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("\n".join(entries) + "\n")
+
+
+# TESTS CHARGEMENT
+
+def test_shipped_dictionaries():
+    loaded = load_dictionaries()
+    assert "expérience" in loaded.skip_words and "experience" in loaded.skip_words
+    assert loaded.degrees.index("master of science") < loaded.degrees.index("master")
+    assert "mohamed" in loaded.first_names and "helene" in loaded.first_names
+    assert loaded.fingerprint == load_dictionaries().fingerprint
+
+def test_missing_or_empty_file(tmp_path):
+    with pytest.raises(DictionaryError):
+        load_dictionaries(str(tmp_path))
+    for name, filename in DICTIONARY_FILES.items():
+        if name not in OPTIONAL_FILES:
+            (tmp_path / filename).write_text("# commentaire\nmaster\n", encoding="utf-8")
+    loaded = load_dictionaries(str(tmp_path))
+    assert loaded.first_names == frozenset() and loaded.section_headings == ()  # fichiers facultatifs
+    (tmp_path / DICTIONARY_FILES["section_headings"]).write_text("formation\n", encoding="utf-8")
+    with pytest.raises(DictionaryError):
+        load_dictionaries(str(tmp_path))  # "section: titre" attendu
+    (tmp_path / DICTIONARY_FILES["degrees"]).write_text("# aucun diplôme\n\n", encoding="utf-8")
+    with pytest.raises(DictionaryError):
+        load_dictionaries(str(tmp_path))
+
+def test_large_gazetteer(data_dir):
+    """Un gazetteer de dizaines de milliers de prénoms se charge vite et ne ralentit pas l'extraction."""
+    append(data_dir / DICTIONARY_FILES["first_names"], *(f"zz{letters(n)}" for n in range(GAZETTEER_SIZE)))
+    started = time.perf_counter()
+    loaded = reload_dictionaries()
+    assert time.perf_counter() - started < 2.0
+    assert len(loaded.first_names) > GAZETTEER_SIZE
+    assert extract_name(f"dupont zz{letters(4242)}\ndeveloppeur") == (f"Zz{letters(4242)}", "Dupont")
+
+
+# TESTS EXTRACTION
+
+def test_first_name_sets_order_and_line():
+    assert extract_name("dupont jean\njean.dupont@gmail.com") == ("Jean", "Dupont")
+    # La ligne d'un prénom connu l'emporte sur une première ligne de deux mots quelconques
+    assert extract_name("consultante sap finance\nmarie curie\nparis") == ("Marie", "Curie")
+    # Sans prénom connu : première ligne de deux mots retenus, dans l'ordre
+    assert extract_name("xqwert zorglub\n") == ("Xqwert", "Zorglub")
+
+def test_reload_changes_extraction(data_dir):
+    before_key = make_cache_key(b"cv")
+    assert extract_degree("habilitation a diriger des recherches") == "Non trouvé"
+    append(data_dir / DICTIONARY_FILES["degrees"], "habilitation à diriger des recherches")
+    reload_dictionaries()
+    assert extract_degree("habilitation a diriger des recherches chimie") == "Habilitation a diriger des recherches Chimie"
+    assert make_cache_key(b"cv") != before_key
+
+def test_failed_reload_keeps_previous(data_dir):
+    previous = get_dictionaries()
+    (data_dir / DICTIONARY_FILES["skip_words"]).unlink()
+    with pytest.raises(DictionaryError):
+        reload_dictionaries()
+    assert get_dictionaries() is previous
+
+
+# TESTS WORKERS
+
+def test_recycled_workers_inherit_reload(data_dir):
+    """Les workers existants gardent leur version ; ceux du pool recyclé héritent de la nouvelle."""
+    executor = BoundedExecutor(kind="process", workers=1)
+    get_dictionaries()
+
+    async def scenario():
+        before = await executor.run(dictionaries_fingerprint)
+        append(data_dir / DICTIONARY_FILES["first_names"], "zorglub")
+        reloaded = reload_dictionaries()
+        stale = await executor.run(dictionaries_fingerprint)
+        assert executor.recycle("reload")
+        return before, stale, reloaded.fingerprint, await executor.run(dictionaries_fingerprint)
+
+    try:
+        before, stale, reloaded, after = asyncio.run(scenario())
+        assert stale == before != reloaded
+        assert after == reloaded
+        assert executor.stats()["recycled"] == 1
+    finally:
+        executor.shutdown()
+
+
+# TESTS API
+
+@pytest.fixture
+def client_config():
+    return {"ADMIN_TOKEN": ADMIN_TOKEN}
+
+def test_admin_requires_token(client, monkeypatch):
+    assert client.post("/api/v1/admin/dictionaries/reload").status_code == 401
+    resp = client.get("/api/v1/admin/dictionaries", headers={"Authorization": "Bearer mauvais"})
+    assert resp.status_code == 401
+    monkeypatch.setattr(config, "ADMIN_TOKEN", "")
+    resp = client.get("/api/v1/admin/dictionaries", headers={"Authorization": f"Bearer {ADMIN_TOKEN}"})
+    assert resp.status_code == 404
+
+def test_reload_endpoint(client, data_dir):
+    headers = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+    before = client.get("/api/v1/admin/dictionaries", headers=headers).json()
+    append(data_dir / DICTIONARY_FILES["first_names"], "zorglub")
+
+    resp = client.post("/api/v1/admin/dictionaries/reload", headers=headers)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["fingerprint"] != before["fingerprint"]
+    assert body["first_names"] == before["first_names"] + 1
+    assert set(body["recycled"]) == {"executor"}
+
+    (data_dir / DICTIONARY_FILES["degrees"]).write_text("", encoding="utf-8")
+    resp = client.post("/api/v1/admin/dictionaries/reload", headers=headers)
+    assert resp.status_code == 422
+    assert dictionaries.get_dictionaries().fingerprint == body["fingerprint"]
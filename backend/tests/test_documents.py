@@ -0,0 +1,53 @@
+import sys
+import os
+import time
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'services'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.cache import content_digest
+from services.documents import DocumentStore
+
+
+# TESTS STOCKAGE DES DOCUMENTS
+
+def test_put_and_thumbnail(tmp_path):
+    store = DocumentStore(str(tmp_path), max_bytes=10_000)
+    document_id = content_digest(b"%PDF-1.4 contenu")
+    store.put(document_id, b"%PDF-1.4 contenu", "application/pdf")
+
+    assert open(store.document_path(document_id), "rb").read() == b"%PDF-1.4 contenu"
+    assert store.get_meta(document_id) == {"content_type": "application/pdf"}
+    path = store.put_thumbnail(document_id, 1, 200, b"png")
+    assert path == store.thumbnail_path(document_id, 1, 200) and os.path.exists(path)
+
+def test_invalid_identifier_rejected(tmp_path):
+    """Un identifiant qui n'est pas une empreinte SHA-256 ne désigne aucun fichier."""
+    store = DocumentStore(str(tmp_path), max_bytes=10_000)
+    assert store.document_path("../../etc/passwd") is None
+    with pytest.raises(ValueError):
+        store.put("../x", b"contenu", "application/pdf")
+
+def test_least_recently_used_evicted(tmp_path):
+    """Au-delà de la taille maximale, les documents les plus anciens sont supprimés."""
+    store = DocumentStore(str(tmp_path), max_bytes=2500)
+    ids = []
+    for index in range(3):
+        content = bytes([index]) * 1000
+        ids.append(content_digest(content))
+        store.put(ids[-1], content, "application/pdf")
+        time.sleep(0.01)
+
+    assert store.document_path(ids[0]) is None
+    assert store.document_path(ids[1]) and store.document_path(ids[2])
+    assert store.stats()["bytes"] <= 2500
+
+def test_rewritten_meta_counted_once(tmp_path):
+    """Réécrire meta.json (nombre de pages) ne compte que la différence de taille."""
+    store = DocumentStore(str(tmp_path), max_bytes=10_000)
+    document_id = content_digest(b"%PDF-1.4 contenu")
+    store.put(document_id, b"%PDF-1.4 contenu", "application/pdf")
+    for pages in (1, 2, 3):
+        store.set_meta(document_id, {"content_type": "application/pdf", "pages": pages})
+    assert store.stats()["bytes"] == DocumentStore(str(tmp_path), max_bytes=10_000).stats()["bytes"]
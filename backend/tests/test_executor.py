@@ -0,0 +1,207 @@
+import sys
+import os
+import time
+import asyncio
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'services'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prometheus_client import REGISTRY
+
+import config
+from services.executor import BULK, INTERACTIVE, BoundedExecutor, QueueFullError
+
+
+def slow_task(delay: float) -> str:
+    time.sleep(delay)
+    return "ok"
+
+
+def test_executor_runs_task():
+    """La tâche s'exécute dans le pool et son résultat est retourné."""
+    executor = BoundedExecutor(kind="thread", workers=1, queue_size=0)
+    try:
+        assert asyncio.run(executor.run(slow_task, 0)) == "ok"
+        assert executor.stats()["completed"] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_executor_rejects_when_full():
+    """Au-delà de workers + file, la requête est rejetée avec un Retry-After."""
+    executor = BoundedExecutor(kind="thread", workers=1, queue_size=1, retry_after=5)
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(slow_task, 0.2))
+        second = asyncio.ensure_future(executor.run(slow_task, 0.2))
+        await asyncio.sleep(0.01)
+        assert executor.stats()["queued"] == 1
+        with pytest.raises(QueueFullError) as exc:
+            await executor.run(slow_task, 0)
+        assert exc.value.retry_after == 5
+        await asyncio.gather(first, second)
+
+    try:
+        asyncio.run(scenario())
+        assert executor.stats()["rejected"] == 1
+        assert executor.stats()["in_flight"] == 0
+    finally:
+        executor.shutdown()
+
+
+def fail_task() -> None:
+    raise ValueError("document invalide")
+
+
+def test_executor_recycles_after_max_tasks(monkeypatch):
+    """Après WORKER_MAX_TASKS tâches par worker, les tâches suivantes partent sur des workers neufs."""
+    monkeypatch.setattr(config, "WORKER_MAX_TASKS", 2)
+    executor = BoundedExecutor(kind="process", workers=1)
+
+    async def scenario():
+        return [await executor.run(os.getpid) for _ in range(5)]
+
+    try:
+        pids = asyncio.run(scenario())
+        assert pids[0] == pids[1] and pids[2] == pids[3]
+        assert len(set(pids)) == 3
+        assert executor.stats()["recycled"] == 2
+    finally:
+        executor.shutdown()
+
+
+def test_executor_recycles_on_worker_rss(monkeypatch):
+    """Un worker dont la RSS dépasse WORKER_MAX_RSS est remplacé, même après une tâche en échec."""
+    monkeypatch.setattr(config, "WORKER_MAX_RSS", 1)
+    executor = BoundedExecutor(kind="process", workers=1)
+
+    async def scenario():
+        with pytest.raises(ValueError):
+            await executor.run(fail_task)
+        return await executor.run(os.getpid)
+
+    try:
+        asyncio.run(scenario())
+        stats = executor.stats()
+        assert stats["recycled"] == 2
+        assert stats["worker_rss"] > 0
+    finally:
+        executor.shutdown()
+
+
+# TESTS FILES DE PRIORITÉ
+
+def test_interactive_lane_runs_first():
+    """Un worker libéré prend la requête interactive avant les imports en masse arrivés plus tôt."""
+    executor = BoundedExecutor(kind="thread", workers=1, queue_size=4, bulk_queue_size=4)
+    order = []
+
+    def task(name: str, delay: float) -> None:
+        time.sleep(delay)
+        order.append(name)
+
+    def waits(lane: str) -> float:
+        return REGISTRY.get_sample_value("cv_queue_wait_seconds_count", {"lane": lane}) or 0.0
+
+    async def scenario():
+        busy = asyncio.ensure_future(executor.run(task, "busy", 0.1, lane=BULK))
+        await asyncio.sleep(0.01)
+        bulk = [asyncio.ensure_future(executor.run(task, f"bulk{i}", 0, lane=BULK)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        assert executor.stats()["lanes"][BULK]["queued"] == 3
+        await asyncio.gather(busy, *bulk, executor.run(task, "interactive", 0))
+
+    before = waits(BULK), waits(INTERACTIVE)
+    try:
+        asyncio.run(scenario())
+        assert order == ["busy", "interactive", "bulk0", "bulk1", "bulk2"]
+        lanes = executor.stats()["lanes"]
+        assert lanes[BULK]["dispatched"] == 4 and lanes[INTERACTIVE]["dispatched"] == 1
+        assert lanes[BULK]["wait_seconds"] > lanes[INTERACTIVE]["wait_seconds"] > 0
+        assert (waits(BULK), waits(INTERACTIVE)) == (before[0] + 4, before[1] + 1)
+    finally:
+        executor.shutdown()
+
+
+def test_lane_queues_are_bounded_separately():
+    """Une file bulk pleine n'empêche pas les requêtes interactives d'attendre leur tour."""
+    executor = BoundedExecutor(kind="thread", workers=1, queue_size=1, bulk_queue_size=1)
+
+    async def scenario():
+        busy = asyncio.ensure_future(executor.run(slow_task, 0.1, lane=BULK))
+        queued = asyncio.ensure_future(executor.run(slow_task, 0, lane=BULK))
+        await asyncio.sleep(0.01)
+        with pytest.raises(QueueFullError):
+            await executor.run(slow_task, 0, lane=BULK)
+        assert await executor.run(slow_task, 0) == "ok"
+        await asyncio.gather(busy, queued)
+
+    try:
+        asyncio.run(scenario())
+        assert executor.stats()["lanes"][BULK]["rejected"] == 1
+        assert executor.stats()["lanes"][INTERACTIVE]["rejected"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_cancelled_waiter_releases_its_place():
+    """Une requête annulée pendant son attente quitte la file sans bloquer de worker."""
+    executor = BoundedExecutor(kind="thread", workers=1, queue_size=1)
+
+    async def scenario():
+        busy = asyncio.ensure_future(executor.run(slow_task, 0.05))
+        waiting = asyncio.ensure_future(executor.run(slow_task, 0))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        await busy
+        assert executor.stats()["queued"] == 0
+        return await asyncio.wait_for(executor.run(slow_task, 0), 1)
+
+    try:
+        assert asyncio.run(scenario()) == "ok"
+        assert executor.stats()["in_flight"] == 0
+    finally:
+        executor.shutdown()
+
+
+def test_batch_uses_bulk_lane(monkeypatch):
+    """Un lot occupe la file bulk sans en bloquer l'accès aux uploads interactifs."""
+    from models.cv_result import BatchItemResult
+    from services import batch
+
+    executor = BoundedExecutor(kind="thread", workers=1, queue_size=1, bulk_queue_size=0)
+    order = []
+
+    def analyze(filename, content, content_type, keep_text, sign):
+        time.sleep(0.05)
+        order.append(filename)
+        return BatchItemResult(filename=filename, status_code=200), None, None
+
+    def upload() -> str:
+        order.append("interactive")
+        return "ok"
+
+    monkeypatch.setattr(batch, "get_executor", lambda: executor)
+    monkeypatch.setattr(batch, "_analyze_item", analyze)
+    monkeypatch.setattr(batch, "get_search_index", lambda: None)
+    monkeypatch.setattr(batch, "get_dedup_index", lambda: None)
+
+    async def scenario():
+        documents = [(f"cv{i}.docx", f"contenu {i}".encode(), None) for i in range(4)]
+        lot = asyncio.ensure_future(batch.run_batch(documents))
+        await asyncio.sleep(0.01)
+        # Worker occupé par le lot : un upload bulk est refusé, un upload interactif attend son tour
+        with pytest.raises(QueueFullError):
+            await executor.run(slow_task, 0, lane=BULK)
+        assert await executor.run(upload) == "ok"
+        assert not lot.done()
+        return await lot
+
+    try:
+        items = asyncio.run(scenario())
+        assert [item.status_code for item in items] == [200] * 4
+        assert order.index("interactive") < order.index("cv3.docx")
+        assert executor.stats()["lanes"][BULK]["dispatched"] == 4
+    finally:
+        executor.shutdown()
@@ -5,7 +5,7 @@ import pytest
 # Ajout du dossier parent au path pour pouvoir importer 'services'
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from services.extractor import extract_email, extract_phone, extract_degree
+from services.extractor import extract_email, extract_phone, extract_degree, extract_name, extract_fields, clean_text
 
 # TESTS EMAIL 
 
@@ -76,4 +76,63 @@ def test_extract_degree_skip_stopwords():
 def test_extract_degree_not_found():
     """Test quand aucun diplôme connu n'est présent."""
     text = "J'ai suivi une formation en cuisine."
-    assert extract_degree(text) == "Non trouvé"
\ No newline at end of file
+    assert extract_degree(text) == "Non trouvé"
+
+def test_extract_degree_multi_word():
+    """Un diplôme en plusieurs mots est reconnu en entier."""
+    text = "Titulaire d'une Licence Professionnelle Réseaux et Télécoms"
+    assert extract_degree(text) == "Licence professionnelle Réseaux Télécoms"
+
+def test_extract_degree_longest_match():
+    """'Master of Science' prime sur 'Master'."""
+    text = "Master of Science in Computer Engineering"
+    assert extract_degree(text) == "Master of science Computer Engineering"
+
+def test_extract_degree_specialty_stops_at_line_end():
+    """La spécialité s'arrête en fin de ligne : la ligne suivante (email) n'en fait pas partie."""
+    text = clean_text("Jean Dupont\nIngénieur\njean.dupont@gmail.com\n06 12 34 56 78")
+    assert extract_degree(text) == "Ingenieur"
+    assert extract_degree("ingenieur devops\njean.dupont@gmail.com") == "Ingenieur Devops"
+
+def test_extract_degree_after_clean_text():
+    """Les diplômes accentués sont reconnus dans le texte nettoyé (sans accents)."""
+    text = clean_text("Diplôme d'ingénieur en informatique")
+    assert extract_degree(text) == "Diplome d'ingenieur Informatique"
+
+
+# TESTS NOM
+
+def test_extract_name_header():
+    """Le nom est pris dans l'en-tête, en ignorant les mots-clés."""
+    text = "Curriculum Vitae\nJean Dupont\nDéveloppeur Python"
+    assert extract_name(text) == ("Jean", "Dupont")
+
+def test_extract_name_from_email():
+    """Sans nom exploitable dans l'en-tête, le nom est deviné via l'email."""
+    text = "CV\nProfil\nContact\nTél\nEmail\nmarie.curie42@gmail.com"
+    assert extract_name(text) == ("Marie", "Curie")
+
+
+# TESTS MOTEUR UNIQUE
+
+def test_extract_fields_single_pass():
+    """Tous les champs sont extraits en un seul appel."""
+    text = "jean dupont\njean.dupont@gmail.com 06 12 34 56 78\nmaster data science 2020-2022"
+    fields = extract_fields(text)
+    assert fields["name"] == ("Jean", "Dupont")
+    assert fields["email"] == "jean.dupont@gmail.com"
+    assert fields["phone"] == "06 12 34 56 78"
+    assert fields["degree"] == "Master Data Science"
+
+def test_extract_email_after_invalid_at():
+    """Un "@" qui ne forme pas d'email (ou pas de partie locale) n'arrête pas la recherche."""
+    text = "rdv @ 10h, contact@test puis 0612345678jean.dupont@gmail.com"
+    assert extract_email(text) == "0612345678jean.dupont@gmail.com"
+
+def test_contacts_outside_header():
+    """Coordonnées hors de l'en-tête : cherchées dans le reste du texte, en-tête exclu."""
+    text = "jean dupont\nexperience\nstage\ncompetences\nmail : jean.dupont@gmail.com tel 06 12 34 56 78\n"
+    fields = extract_fields(text, ("email", "phone"))
+    assert fields["email"] == "jean.dupont@gmail.com"
+    assert fields["phone"] == "06 12 34 56 78"
+    assert fields["spans"]["email"][0] == text.index("jean.dupont@")
@@ -0,0 +1,153 @@
+import sys
+import os
+import io
+import asyncio
+import zipfile
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+
+import config
+from benchmarks.corpus import make_cv, render_pdf, render_docx
+from conftest import uploads_total
+from services import pipeline
+from services.ingest import MULTIPART_OVERHEAD, UploadSizeLimit, sniff_content_type
+from services.parsers import BACKENDS, ParserBackend
+from services.pdf_parser import count_pages_pdf, PdfEncryptedError
+
+CV = make_cv(5, pages=3)
+CV_PDF = render_pdf(CV)
+CV_DOCX = render_docx(CV)
+# Dictionnaire de chiffrement dont le mot de passe utilisateur vide ne correspond pas
+ENCRYPTED_PDF = CV_PDF.replace(
+    b"trailer\n<<",
+    b"trailer\n<< /Encrypt << /Filter /Standard /V 1 /R 2 /O <00> /U <00> /P -4 >> /ID [<01><01>]"
+)
+
+
+# TESTS DÉTECTION DU FORMAT
+
+def test_sniff_pdf_and_docx():
+    assert sniff_content_type(CV_PDF) == pipeline.PDF_MIME
+    assert sniff_content_type(b"\r\n" + CV_PDF) == pipeline.PDF_MIME
+    assert sniff_content_type(CV_DOCX) == pipeline.DOCX_MIME
+
+def test_sniff_rejects_other_zip_and_garbage():
+    """Un ZIP sans word/document.xml n'est pas un DOCX."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("notes.txt", "x")
+    assert sniff_content_type(buffer.getvalue()) is None
+    assert sniff_content_type(b"\x89PNG\r\n") is None
+
+
+# TESTS CONTRÔLES PRÉALABLES PDF
+
+def test_count_pages_pdf():
+    assert count_pages_pdf(CV_PDF) == 3
+
+def test_encrypted_pdf_detected():
+    with pytest.raises(PdfEncryptedError):
+        count_pages_pdf(ENCRYPTED_PDF)
+
+def test_too_many_pages_rejected_before_parsing(monkeypatch):
+    """Au-delà du nombre de pages autorisé, pdfplumber n'ouvre jamais le document."""
+    def forbidden(*args, **kwargs):
+        raise AssertionError("Le parser ne doit pas être appelé")
+
+    monkeypatch.setattr(config, "MAX_DOCUMENT_PAGES", 2)
+    monkeypatch.setitem(BACKENDS, "forbidden", ParserBackend("forbidden", pipeline.PDF_MIME, forbidden))
+    monkeypatch.setitem(config.PARSER_ORDER, pipeline.PDF_MIME, ["forbidden"])
+    with pytest.raises(pipeline.DocumentError) as error:
+        pipeline.analyze_document(CV_PDF, pipeline.PDF_MIME)
+    assert error.value.status_code == 422
+
+
+# TESTS API
+
+def test_upload_type_from_content_not_header(client):
+    """Un DOCX annoncé comme PDF est analysé comme DOCX."""
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", CV_DOCX, "application/pdf")})
+    assert resp.status_code == 200
+    assert resp.json()["email"] == CV.email
+
+def test_upload_encrypted_pdf(client):
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", ENCRYPTED_PDF, "application/pdf")})
+    assert resp.status_code == 422
+
+def test_upload_too_large_chunked(client, monkeypatch):
+    """Le corps est lu par blocs et la lecture s'arrête au-delà de la taille maximale."""
+    monkeypatch.setattr(config, "MAX_UPLOAD_SIZE", 100 * 1024)
+    content = CV_PDF + b"\n" * (200 * 1024)
+    # Sans Content-Length exploitable, c'est la lecture par blocs qui rejette
+    monkeypatch.setattr("services.ingest.MULTIPART_OVERHEAD", 10 ** 9)
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", content, "application/pdf")})
+    assert resp.status_code == 413
+
+def test_upload_too_large_content_length(client, monkeypatch):
+    """Un Content-Length trop grand est rejeté avant la lecture du corps."""
+    monkeypatch.setattr(config, "MAX_UPLOAD_SIZE", 1024)
+    content = CV_PDF + b"\n" * (200 * 1024)
+    rejected = uploads_total("other", 413)
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", content, "application/pdf")})
+    assert resp.status_code == 413
+    assert uploads_total("other", 413) == rejected + 1
+
+def test_upload_too_large_streamed_without_content_length(client, monkeypatch):
+    """Corps envoyé par blocs sans Content-Length : refusé par le middleware, l'endpoint n'est pas appelé."""
+    monkeypatch.setattr(config, "MAX_UPLOAD_SIZE", 1024)
+    monkeypatch.setattr("main.ingest_upload", lambda *args: pytest.fail("corps entièrement lu"))
+    boundary = "limite"
+    head = (f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"cv.pdf\"\r\n"
+            "Content-Type: application/pdf\r\n\r\n").encode()
+
+    def body():
+        yield head
+        for _ in range(4):
+            yield b"\n" * MULTIPART_OVERHEAD
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    rejected = uploads_total("other", 413)
+    resp = client.post("/api/v1/upload-cv", content=body(),
+                       headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    assert resp.status_code == 413
+    assert uploads_total("other", 413) == rejected + 1
+
+@pytest.mark.parametrize("streamed", [False, True])
+def test_batch_request_too_large(client, monkeypatch, streamed):
+    """Le corps d'un lot est borné par le middleware (Content-Length ou octets reçus), avant toute lecture."""
+    monkeypatch.setattr(config, "BATCH_MAX_REQUEST_SIZE", 1024)
+    monkeypatch.setattr("main.read_upload", lambda *args: pytest.fail("corps entièrement lu"))
+    content = CV_PDF + b"\n" * (2 * MULTIPART_OVERHEAD)
+    if streamed:
+        boundary = "limite"
+        parts = [(f"--{boundary}\r\nContent-Disposition: form-data; name=\"files\"; filename=\"cv.pdf\"\r\n"
+                  "Content-Type: application/pdf\r\n\r\n").encode(), content, f"\r\n--{boundary}--\r\n".encode()]
+        resp = client.post("/api/v1/upload-cv/batch", content=iter(parts),
+                           headers={"Content-Type": f"multipart/form-data; boundary={boundary}"})
+    else:
+        resp = client.post("/api/v1/upload-cv/batch", files=[("files", ("cv.pdf", content, "application/pdf"))])
+    assert resp.status_code == 413
+    assert resp.json()["detail"].startswith("Lot trop volumineux")
+
+def test_size_limit_stops_receive_loop():
+    """Les messages http.request sont comptés : la lecture s'arrête dès la limite dépassée."""
+    pulled = []
+
+    async def receive():
+        pulled.append(1)
+        return {"type": "http.request", "body": b"x" * 1024, "more_body": True}
+
+    async def app(scope, receive, send):
+        while True:
+            await receive()
+
+    middleware = UploadSizeLimit(app, {"/upload"}, lambda: 4 * 1024)
+    scope = {"type": "http", "method": "POST", "path": "/upload", "headers": []}
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(middleware(scope, receive, None))
+    assert error.value.status_code == 413
+    assert len(pulled) == (4 * 1024 + MULTIPART_OVERHEAD) // 1024 + 1
@@ -0,0 +1,138 @@
+import sys
+import os
+import io
+import time
+import asyncio
+import zipfile
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import DOCX_MIME, make_docx, uploads_total
+from services import jobs
+from models.cv_result import BatchItemResult
+from services.jobs import JobStore, JobRunner, QUEUED, RUNNING, DONE
+
+
+# TESTS FILE PERSISTÉE
+
+def test_job_store_lifecycle(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    job_id = store.create("cv.docx", b"contenu", DOCX_MIME)
+    assert store.get(job_id)["status"] == QUEUED
+
+    row = store.claim_next()
+    assert row["id"] == job_id and row["payload"] == b"contenu"
+    assert store.get(job_id)["status"] == RUNNING
+    assert store.claim_next() is None
+
+    assert store.complete(job_id, row["claim"], 200, {"email": "x@y.fr"}, None)
+    job = store.get(job_id)
+    assert job["status"] == DONE and job["result"] == {"email": "x@y.fr"}
+    store.close()
+
+def test_job_store_survives_restart(tmp_path):
+    """Un job en cours lors d'un arrêt est repris après expiration du bail."""
+    db_path = str(tmp_path / "jobs.db")
+    store = JobStore(db_path, lease=0)
+    job_id = store.create("cv.docx", b"contenu", DOCX_MIME)
+    store.claim_next()
+    store.close()
+
+    time.sleep(0.01)
+    restarted = JobStore(db_path, lease=0)
+    assert restarted.claim_next()["id"] == job_id
+    restarted.close()
+
+def test_job_store_fences_stale_claim(tmp_path):
+    """Après expiration du bail, l'ancienne réservation ne peut ni renouveler ni enregistrer de résultat."""
+    store = JobStore(str(tmp_path / "jobs.db"), lease=0)
+    job_id = store.create("cv.docx", b"contenu", DOCX_MIME)
+    stale = store.claim_next()
+    time.sleep(0.01)
+    current = store.claim_next()
+    assert current["id"] == job_id and current["claim"] != stale["claim"]
+
+    assert not store.renew(job_id, stale["claim"])
+    assert not store.complete(job_id, stale["claim"], 200, {"email": "ancien@x.fr"}, None)
+    assert store.get(job_id)["status"] == RUNNING
+    assert store.complete(job_id, current["claim"], 200, {"email": "x@y.fr"}, None)
+    assert store.get(job_id)["result"] == {"email": "x@y.fr"}
+    store.close()
+
+def test_long_job_lease_renewed(tmp_path, monkeypatch):
+    """Un job plus long que le bail n'est pas repris tant que son worker renouvelle le bail."""
+    store = JobStore(str(tmp_path / "jobs.db"), lease=0.2)
+    job_id = store.create("cv.docx", b"contenu", DOCX_MIME)
+
+    async def slow_batch(files):
+        await asyncio.sleep(0.6)
+        return [BatchItemResult(filename=files[0][0], status_code=200)]
+
+    async def scenario():
+        runner = JobRunner(store, workers=1)
+        task = asyncio.create_task(runner._process(store.claim_next()))
+        await asyncio.sleep(0.4)
+        assert store.claim_next() is None
+        await task
+
+    monkeypatch.setattr(jobs, "run_batch", slow_batch)
+    asyncio.run(scenario())
+    assert store.get(job_id)["status"] == DONE
+    store.close()
+
+def test_finished_jobs_purged(tmp_path):
+    """Les jobs terminés au-delà du TTL sont supprimés ; les jobs en attente sont conservés."""
+    db_path = str(tmp_path / "jobs.db")
+    store = JobStore(db_path, ttl=0.05, purge_every=2)
+    old = store.create("ancien.docx", b"contenu", DOCX_MIME)
+    store.complete(old, store.claim_next()["claim"], 200, None, None)
+    time.sleep(0.1)
+    pending = store.create("attente.docx", b"contenu", DOCX_MIME)
+    recent = store.create("recent.docx", b"contenu", DOCX_MIME)
+    store.claim_next()
+    store.complete(recent, store.claim_next()["claim"], 422, None, "illisible")
+    assert store.get(old) is None
+    assert store.get(pending)["status"] == RUNNING and store.get(recent)["status"] == "failed"
+    store.close()
+
+    time.sleep(0.1)
+    reopened = JobStore(db_path, ttl=0.05)
+    assert reopened.get(recent) is None and reopened.get(pending) is not None
+    reopened.close()
+
+
+# TESTS API
+
+@pytest.fixture
+def client_config(tmp_path):
+    return {"JOB_DB": str(tmp_path / "jobs.db")}
+
+def test_job_api_long_polling(client):
+    """Le job est créé immédiatement puis son résultat est obtenu par long-polling."""
+    cv = make_docx("Jean Dupont", "jean.dupont@gmail.com")
+    analyzed = uploads_total("docx", 200)
+    resp = client.post("/api/v1/jobs", files={"file": ("cv.docx", cv, DOCX_MIME)})
+    assert resp.status_code == 202
+    job_id = resp.json()["id"]
+
+    job = client.get(f"/api/v1/jobs/{job_id}", params={"wait": 10}).json()
+    assert job["status"] == "done"
+    assert job["result"]["email"] == "jean.dupont@gmail.com"
+    assert uploads_total("docx", 200) == analyzed + 1
+
+def test_job_api_failure_and_unknown(client):
+    # Signature ZIP/DOCX valide mais XML illisible : l'échec survient dans le job
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", "<corrompu")
+    resp = client.post("/api/v1/jobs", files={"file": ("cv.docx", buffer.getvalue(), DOCX_MIME)})
+    job = client.get(f"/api/v1/jobs/{resp.json()['id']}", params={"wait": 10}).json()
+    assert job["status"] == "failed" and job["status_code"] == 422
+    assert client.get("/api/v1/jobs/inconnu").status_code == 404
+
+def test_job_api_rejects_unknown_format(client):
+    """Un contenu qui n'est ni PDF ni DOCX est refusé dès la soumission."""
+    resp = client.post("/api/v1/jobs", files={"file": ("cv.docx", b"corrompu", DOCX_MIME)})
+    assert resp.status_code == 400
@@ -0,0 +1,80 @@
+import sys
+import os
+import itertools
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from benchmarks.corpus import make_cv, render_pdf
+from services import memory
+from services.memory import MB, MemoryBudget, current_rss, recycle_reason
+from services.pdf_parser import iter_pages_pdf
+from services.pipeline import DocumentError, analyze_document_full, PDF_MIME
+
+# Sans libération par page, pdfplumber garde ~4 Mo par page de ce corpus jusqu'à la fermeture
+LONG_PDF_PAGES = 80
+MAX_LONG_PDF_GROWTH = 60 * MB
+
+
+# TESTS MESURES
+
+def test_current_rss_and_budget():
+    budget = MemoryBudget(limit=20 * MB)
+    assert current_rss() > 0
+    assert not budget.exceeded()
+    ballast = bytearray(64 * MB)
+    ballast[::4096] = b"x" * len(ballast[::4096])  # pages effectivement allouées
+    assert budget.exceeded()
+    assert budget.growth >= 40 * MB
+    del ballast
+
+def test_recycle_reason(monkeypatch):
+    monkeypatch.setattr(config, "WORKER_MAX_RSS", 100 * MB)
+    monkeypatch.setattr(config, "WORKER_MAX_TASKS", 10)
+    assert recycle_reason(5, 2, 50 * MB) is None
+    assert recycle_reason(5, 2, 200 * MB) == "rss"
+    assert recycle_reason(20, 2, None) == "tasks"
+    monkeypatch.setattr(config, "WORKER_MAX_TASKS", 0)
+    assert recycle_reason(10_000, 1, None) is None
+
+
+# TESTS PIPELINE
+
+def test_long_pdf_pages_are_released():
+    """La mémoire ne croît pas avec le nombre de pages lues (cache de chaque page libéré)."""
+    content = render_pdf(make_cv(5, pages=LONG_PDF_PAGES))
+    budget = MemoryBudget()
+    pages = 0
+    for _ in iter_pages_pdf(content):
+        budget.sample()
+        pages += 1
+    assert pages == LONG_PDF_PAGES
+    assert budget.growth < MAX_LONG_PDF_GROWTH
+
+def test_memory_budget_rejects_document(monkeypatch):
+    """Croissance au-delà de DOCUMENT_MAX_MEMORY : l'analyse s'arrête avec une 422."""
+    rss = itertools.count(100 * MB, 300 * MB)
+    monkeypatch.setattr(memory, "current_rss", lambda: next(rss))
+    monkeypatch.setattr(memory, "peak_rss", lambda: None)
+    monkeypatch.setattr(config, "DOCUMENT_MAX_MEMORY", 512 * MB)
+    with pytest.raises(DocumentError) as exc:
+        analyze_document_full(render_pdf(make_cv(6, pages=5)), PDF_MIME)
+    assert exc.value.status_code == 422
+    assert "mémoire" in exc.value.detail
+
+def test_peak_memory_reported():
+    analysis = analyze_document_full(render_pdf(make_cv(7)), PDF_MIME)
+    assert analysis.peak_memory is not None and analysis.peak_memory >= 0
+
+
+# TESTS API
+
+def test_peak_memory_metric(client):
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", render_pdf(make_cv(8)), "application/pdf")})
+    assert resp.status_code == 200
+    metrics = client.get("/metrics").text
+    executor = client.get("/api/v1/executor").json()
+    assert "cv_document_peak_memory_bytes_count" in metrics
+    assert "recycled" in executor
@@ -0,0 +1,46 @@
+import sys
+import os
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'services'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.normalizer import normalize_text, normalize_with_offsets
+from services.extractor import clean_text, extract_fields
+
+
+def test_normalize_keeps_lines_and_pages():
+    """Les lignes et les pages sont conservées, les espaces réduits."""
+    raw = "  Jean   Dupont \r\n\n Développeur –  Œuvre\f\nPage 2  "
+    assert normalize_text(raw) == "jean dupont\ndeveloppeur - oeuvre\fpage 2"
+
+def test_normalize_single_line_unchanged():
+    """Sur une seule ligne, le résultat reste celui de l'ancien clean_text."""
+    assert clean_text("Ingénieur  Œnologue’s  coût : 10€") == "ingenieur oenologue's cout : 10 euro"
+
+def test_offsets_keep_empty_pages():
+    """Une page vide laisse deux sauts de page ; les pages vides en bord de texte disparaissent."""
+    assert normalize_with_offsets("\f a \f\f\n b\n\f").text == "a\f\fb"
+
+def test_offsets_point_to_raw_text():
+    """Un champ trouvé dans le texte normalisé est retrouvé dans le texte brut."""
+    raw = "CV de  Jean\n\n  Émail :  Jean.Dupont@Gmail.com \fFormation\nMaster Œnologie"
+    normalized = normalize_with_offsets(raw)
+    found = extract_fields(normalized.text, source=normalized)
+    start, end = found["raw_spans"]["email"]
+    assert raw[start:end] == "Jean.Dupont@Gmail.com"
+    start, end = found["raw_spans"]["degree"]
+    assert raw[start:end] == "Master"
+
+def test_raw_span_of_folded_characters():
+    """Un caractère qui en donne plusieurs (œ -> oe) ou dont l'accent disparaît reste localisé."""
+    raw = "  Cœur   d’Été"
+    normalized = normalize_with_offsets(raw)
+    assert normalized.text == "coeur d'ete"
+    assert normalized.raw_span(0, 5) == (2, 6)
+    assert normalized.raw_span(6, 11) == (9, 14)
+
+def test_name_only_from_header():
+    """Le nom n'est cherché que dans les premières lignes, pas dans tout le document."""
+    text = clean_text("CV\nProfil\nContact\nTél\nEmail\nMarie Curie")
+    assert extract_fields(text)["name"] == ("Non trouvé", "Non trouvé")
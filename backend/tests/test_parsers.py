@@ -0,0 +1,208 @@
+import sys
+import os
+import io
+import zipfile
+import dataclasses
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'services'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from conftest import make_docx
+from services import pipeline
+from services.parsers import BACKENDS, ParserBackend, looks_readable
+from benchmarks.corpus import make_cv, render_pdf
+from services.docx_parser import extract_text_docx, DocxBombError
+
+
+CV_DOCX = make_docx("Jean Dupont", "jean.dupont@gmail.com")
+
+
+# TESTS SOURCES DES PARSERS
+
+def test_docx_from_bytes():
+    """Le parser accepte directement des bytes."""
+    assert "Jean Dupont" in extract_text_docx(CV_DOCX)
+
+def test_docx_from_buffer():
+    """Le parser accepte un flux binaire, même déjà consommé."""
+    buffer = io.BytesIO(CV_DOCX)
+    buffer.read()
+    assert "jean.dupont@gmail.com" in extract_text_docx(buffer)
+
+def test_docx_from_path(tmp_path):
+    """Le parser accepte toujours un chemin de fichier."""
+    path = tmp_path / "cv.docx"
+    path.write_bytes(CV_DOCX)
+    assert "Jean Dupont" in extract_text_docx(str(path))
+
+
+# TESTS SEUIL D'ÉCRITURE DISQUE
+
+def test_small_document_stays_in_memory(monkeypatch):
+    """Sous le seuil, aucun fichier temporaire n'est créé."""
+    def forbidden(*args, **kwargs):
+        raise AssertionError("Aucun fichier temporaire attendu")
+
+    monkeypatch.setattr(pipeline, "NamedTemporaryFile", forbidden)
+    result = pipeline.analyze_document(CV_DOCX, pipeline.DOCX_MIME, "cv.docx")
+    assert result.email == "jean.dupont@gmail.com"
+
+def test_large_document_spills_to_disk(monkeypatch):
+    """Au-delà du seuil, le document passe par un fichier temporaire supprimé ensuite."""
+    seen = []
+    original = BACKENDS["docx_xml"]
+
+    def spy(source, max_pages=None):
+        seen.append(source)
+        return original.iter_pages(source, max_pages)
+
+    monkeypatch.setattr(config, "SPOOL_THRESHOLD", 0)
+    monkeypatch.setitem(BACKENDS, "docx_xml", dataclasses.replace(original, iter_pages=spy))
+    result = pipeline.analyze_document(CV_DOCX, pipeline.DOCX_MIME, "cv.docx")
+
+    assert result.email == "jean.dupont@gmail.com"
+    assert isinstance(seen[0], str)
+    assert not os.path.exists(seen[0])
+
+
+# TESTS PARSER DOCX EN FLUX
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+
+
+def make_raw_docx(body: str, header: str = "", footer: str = "", headers: dict = None) -> bytes:
+    """DOCX minimal écrit à la main, pour contrôler précisément le XML."""
+    headers = dict(headers or {})
+    if header:
+        headers["word/header1.xml"] = header
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", f'<w:document {W} {MC}><w:body>{body}</w:body></w:document>')
+        for name, content in headers.items():
+            archive.writestr(name, f"<w:hdr {W}>{content}</w:hdr>")
+        if footer:
+            archive.writestr("word/footer1.xml", f"<w:ftr {W}>{footer}</w:ftr>")
+    return buffer.getvalue()
+
+
+def para(text: str) -> str:
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def test_docx_reads_tables_headers_and_footers():
+    """En-tête, cellules de tableau et pied de page sont lus, dans l'ordre de lecture."""
+    table = "<w:tbl><w:tr><w:tc>" + para("Tél") + "</w:tc><w:tc>" + para("06 12 34 56 78") + "</w:tc></w:tr></w:tbl>"
+    content = make_raw_docx(para("Corps") + table, header=para("Jean Dupont"), footer=para("jean@x.fr"))
+    text = extract_text_docx(content)
+    assert text.index("Jean Dupont") < text.index("Corps") < text.index("06 12 34 56 78") < text.index("jean@x.fr")
+    assert "Tél \t06 12 34 56 78" in text
+
+def test_docx_text_box_not_duplicated():
+    """Le contenu de repli (mc:Fallback) d'une zone de texte n'est pas lu deux fois."""
+    box = (
+        "<w:p><w:r><mc:AlternateContent>"
+        "<mc:Choice>" + para("Boite") + "</mc:Choice>"
+        "<mc:Fallback>" + para("Boite") + "</mc:Fallback>"
+        "</mc:AlternateContent></w:r></w:p>"
+    )
+    assert extract_text_docx(make_raw_docx(box)).count("Boite") == 1
+
+def test_docx_tab_stops_are_not_text():
+    """Les taquets de tabulation (w:pPr/w:tabs) ne produisent pas de tabulation, seuls les w:tab d'un run."""
+    body = (
+        '<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="2000"/><w:tab w:val="right" w:pos="9000"/></w:tabs></w:pPr>'
+        "<w:r><w:t>Python</w:t><w:tab/><w:t>Expert</w:t></w:r></w:p>"
+    )
+    assert extract_text_docx(make_raw_docx(body)) == "Python\tExpert\n\n"
+
+def test_docx_headers_in_numeric_order():
+    """Les en-têtes sont lus par numéro de partie : header2 avant header10."""
+    headers = {
+        "word/header10.xml": para("Dixième"),
+        "word/header2.xml": para("Deuxième"),
+        "word/header.xml": para("Premier"),
+    }
+    text = extract_text_docx(make_raw_docx(para("Corps"), headers=headers))
+    assert text.index("Premier") < text.index("Deuxième") < text.index("Dixième") < text.index("Corps")
+
+def test_docx_decompression_bomb(monkeypatch):
+    """Un contenu XML décompressé au-delà du budget est rejeté."""
+    content = make_raw_docx(para("a" * 10000))
+    monkeypatch.setattr(config, "DOCX_MAX_XML_BYTES", 1000)
+    with pytest.raises(DocxBombError):
+        extract_text_docx(content)
+
+def test_docx_compression_ratio(monkeypatch):
+    content = make_raw_docx(para("a" * 100000))
+    monkeypatch.setattr(config, "DOCX_MAX_RATIO", 10)
+    with pytest.raises(DocxBombError):
+        extract_text_docx(content)
+
+
+# TESTS REGISTRE DES BACKENDS
+
+def fake_backend(name, pages, calls):
+    def iter_pages(source, max_pages=None):
+        calls.append(name)
+        yield from pages
+    return ParserBackend(name, pipeline.PDF_MIME, iter_pages)
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    """Installe une chaîne de backends factices pour le PDF."""
+    calls = []
+    monkeypatch.setattr(pipeline, "count_pages_pdf", lambda source: 1)
+
+    def install(*backends):
+        for name, pages in backends:
+            monkeypatch.setitem(BACKENDS, name, fake_backend(name, pages, calls))
+        monkeypatch.setitem(config.PARSER_ORDER, pipeline.PDF_MIME, [name for name, _ in backends])
+        return calls
+    return install
+
+
+GOOD_PAGE = "Jean Dupont\njean.dupont@gmail.com\n06 12 34 56 78\nMaster Data Science"
+
+
+def test_looks_readable():
+    assert looks_readable(GOOD_PAGE)
+    assert not looks_readable("   ")
+    assert not looks_readable("(cid:3)(cid:4)(cid:5)(cid:6) Jean Dupont développeur")
+    assert not looks_readable("ÿþ¤§¶¤§¶¤§¶¤§¶¤§¶¤§¶¤§¶ Jean")
+
+def test_fast_backend_kept_when_readable(chain):
+    calls = chain(("rapide", [GOOD_PAGE]), ("robuste", [GOOD_PAGE]))
+    result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    assert result.parser == "rapide"
+    assert calls == ["rapide"]
+
+def test_fallback_on_garbled_text(chain):
+    """Un texte de glyphes non décodés déclenche le repli sur le backend suivant."""
+    calls = chain(("rapide", ["(cid:1)(cid:2)(cid:3)(cid:4)(cid:5)"]), ("robuste", [GOOD_PAGE]))
+    result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    assert result.parser == "robuste"
+    assert result.email == "jean.dupont@gmail.com"
+    assert calls == ["rapide", "robuste"]
+
+def test_fallback_on_backend_error(chain, monkeypatch):
+    def broken(source, max_pages=None):
+        raise RuntimeError("PDF non supporté")
+        yield
+
+    chain(("robuste", [GOOD_PAGE]))
+    monkeypatch.setitem(BACKENDS, "casse", ParserBackend("casse", pipeline.PDF_MIME, broken))
+    monkeypatch.setitem(config.PARSER_ORDER, pipeline.PDF_MIME, ["casse", "robuste"])
+    assert pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME).parser == "robuste"
+
+@pytest.mark.parametrize("backend", ["pdfium", "pdfminer", "pdfplumber"])
+def test_pdf_backends_agree(backend, monkeypatch):
+    """Chaque backend PDF réel retrouve les mêmes champs sur un CV du corpus."""
+    cv = make_cv(11, pages=2)
+    monkeypatch.setitem(config.PARSER_ORDER, pipeline.PDF_MIME, [backend])
+    result = pipeline.analyze_document(render_pdf(cv), pipeline.PDF_MIME)
+    assert result.parser == backend
+    assert (result.email, result.last_name) == (cv.email, cv.last_name)
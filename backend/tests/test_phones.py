@@ -0,0 +1,93 @@
+import sys
+import os
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'services'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from benchmarks.phones import main as run_phone_benchmark, make_input, best_time, scan
+from services.extractor import extract_phone
+from services.phones import find_phone, iter_phones, to_e164
+
+
+# TESTS NORMALISATION E.164
+
+@pytest.mark.parametrize("text, e164", [
+    ("Tél : 06 12 34 56 78", "+33612345678"),
+    ("01.45.67.89.10", "+33145678910"),
+    ("07-12-34-56-78", "+33712345678"),
+    ("+33 6 12 34 56 78", "+33612345678"),
+    ("+33 (0)6 12 34 56 78", "+33612345678"),
+    ("+33 06 12 34 56 78", "+33612345678"),
+    ("0033 6 12 34 56 78", "+33612345678"),
+    ("+32 470 12 34 56", "+32470123456"),
+    ("+212 6 12 34 56 78", "+212612345678"),
+    ("+216 98 765 432", "+21698765432"),
+    ("+44 20 7946 0958", "+442079460958"),
+    ("+1 (415) 555-2671", "+14155552671"),
+    ("+39 06 6982 1234", "+390669821234"),
+])
+def test_e164(text, e164):
+    assert find_phone(text).e164 == e164
+
+@pytest.mark.parametrize("regions, text, e164", [
+    (["BE"], "0470 12 34 56", "+32470123456"),
+    (["MA"], "06 12 34 56 78", "+212612345678"),
+    (["TN"], "98 765 432", "+21698765432"),
+    (["UK"], "020 7946 0958", "+442079460958"),
+    (["FR", "BE"], "0470 12 34 56", "+33470123456"),
+    (["FR", "BE"], "02 123 45 67", "+3221234567"),
+])
+def test_national_numbers_by_region(regions, text, e164):
+    """Numéros sans indicatif : interprétés selon les pays configurés, dans l'ordre."""
+    assert to_e164(text, regions) == e164
+
+def test_regions_from_config(monkeypatch):
+    monkeypatch.setattr(config, "PHONE_REGIONS", ["MA"])
+    assert to_e164("06 12 34 56 78") == "+212612345678"
+    assert to_e164("01 45 67 89 10") is None  # fixe marocain : 05 uniquement
+
+
+# TESTS FAUX POSITIFS
+
+@pytest.mark.parametrize("text", [
+    "2018 - 2020 Master",
+    "2019-2021",
+    "SIRET 123 456 789 00012",
+    "Réf. 1234567890123456789",
+    "06 12 34 56",
+    "+33 1 23",
+    "12/05/2019",
+])
+def test_not_a_phone(text):
+    assert find_phone(text) is None
+
+def test_phone_after_dates_and_identifiers():
+    text = "2015 - 2018 Licence\nN° 2024-001234\nContact : 06 12 34 56 78 (né en 1990)"
+    found = find_phone(text)
+    assert found.raw == "06 12 34 56 78"
+    assert text[found.span[0]:found.span[1]] == found.raw
+
+def test_one_phone_per_run():
+    assert [m.e164 for m in iter_phones("06 12 34 56 78 / 01 45 67 89 10 et 07 12 34 56 78")] == [
+        "+33612345678", "+33712345678"
+    ]
+
+def test_extract_phone_keeps_original_text():
+    assert extract_phone("Jean Dupont\n+33 (0)6 12 34 56 78\njean@gmail.com") == "+33 (0)6 12 34 56 78"
+
+
+# TESTS COMPLEXITÉ
+
+@pytest.mark.parametrize("pattern", ["0 ", "1 2-3.4/", "2019 - 2020 ", "9" * 20 + " "])
+def test_scan_is_linear(pattern):
+    """Entrées défavorables : 16 fois plus de texte coûte au plus ~16 fois plus (marge x3)."""
+    small = best_time(scan, make_input(pattern, 5_000), runs=3)
+    large = best_time(scan, make_input(pattern, 80_000), runs=3)
+    assert large < small * 16 * 3
+
+def test_phone_benchmark_runs(tmp_path):
+    output = tmp_path / "phones.json"
+    assert run_phone_benchmark(["--sizes", "2000", "8000", "--runs", "2", "--json", str(output)]) == 0
+    assert output.exists()
@@ -0,0 +1,136 @@
+import sys
+import os
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'services'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from services import pipeline
+from services.normalizer import normalize_with_offsets
+from services.parsers import BACKENDS, ParserBackend
+
+PAGES = [
+    "Jean Dupont\njean.dupont@gmail.com\n06 12 34 56 78",
+    "Formation\nMaster Data Science",
+    "Expérience\nDéveloppeur chez ACME",
+    "Loisirs\nEscalade",
+]
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch):
+    """Remplace le lecteur PDF par un itérateur qui enregistre les pages lues."""
+    consumed = []
+
+    def iter_pages(source, max_pages=None):
+        for index, page in enumerate(PAGES):
+            if max_pages is not None and index >= max_pages:
+                break
+            consumed.append(index)
+            yield page
+
+    monkeypatch.setitem(BACKENDS, "fake", ParserBackend("fake", pipeline.PDF_MIME, iter_pages))
+    monkeypatch.setitem(config.PARSER_ORDER, pipeline.PDF_MIME, ["fake"])
+    monkeypatch.setattr(pipeline, "count_pages_pdf", lambda source: len(PAGES))
+    return consumed
+
+
+def test_stops_when_all_fields_found(fake_pdf):
+    """
+    La lecture s'arrête dès que les champs sont trouvés et que la rubrique Formation est terminée
+    (elle pourrait continuer sur la page suivante : tous ses diplômes sont retenus).
+    """
+    result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    assert result.email == "jean.dupont@gmail.com"
+    assert result.degree == "Master Data Science"
+    assert result.degrees == ["Master Data Science"]
+    assert result.pages_parsed == 3
+    assert fake_pdf == [0, 1, 2]
+
+def test_education_section_continues_on_next_page(fake_pdf):
+    """Une rubrique Formation coupée par un saut de page : les diplômes des deux pages sont retenus."""
+    PAGES.insert(2, "Licence Informatique\nBac S")
+    try:
+        result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    finally:
+        PAGES.pop(2)
+    assert result.degrees == ["Master Data Science", "Licence Informatique", "Bac S"]
+    # Rubrique lue sur deux pages : arrêt sans attendre la rubrique suivante
+    assert fake_pdf == [0, 1, 2]
+
+@pytest.mark.parametrize("first_page, pages_parsed", [
+    # Sans rubrique Formation : lecture jusqu'à la fin du document
+    ("Jean Dupont\njean.dupont@gmail.com\n06 12 34 56 78\nMaster Data Science", 30),
+    # Formation en dernière rubrique : une page lue après son début, pas jusqu'à MAX_PAGES
+    ("Jean Dupont\njean.dupont@gmail.com\n06 12 34 56 78\nFormation\nMaster Data Science", 2),
+])
+def test_stops_without_closed_education_section(fake_pdf, first_page, pages_parsed):
+    saved = PAGES[:]
+    PAGES[:] = [first_page] + ["Randonnée, lecture et photographie"] * 29
+    try:
+        result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    finally:
+        PAGES[:] = saved
+    assert result.degree == "Master Data Science"
+    assert result.pages_parsed == pages_parsed
+
+def test_title_on_first_page_does_not_stop_before_education(fake_pdf):
+    """Un intitulé de poste en page 1 ("Ingénieur") ne met pas fin à la lecture avant la rubrique Formation."""
+    saved = PAGES[:]
+    PAGES[:] = [
+        "Jean Dupont\nIngénieur DevOps\njean.dupont@gmail.com\n06 12 34 56 78\nExpérience\nAdministration Kubernetes",
+        "Formation\nMaster Informatique\nLicence Informatique",
+    ]
+    try:
+        result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    finally:
+        PAGES[:] = saved
+    assert result.degrees == ["Master Informatique", "Licence Informatique"]
+    assert result.degree == "Master Informatique"
+    assert result.pages_parsed == 2
+
+def test_field_positions_in_raw_pages(fake_pdf):
+    """Chaque champ trouvé est situé dans le texte brut de sa page."""
+    pages = ["  JEAN DUPONT\n\nÉmail :  Jean.Dupont@Gmail.com\n06 12 34 56 78", "Formation\n  Master Data Science"]
+    saved = PAGES[:]
+    PAGES[:] = pages
+    try:
+        result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    finally:
+        PAGES[:] = saved
+    for field, text in (("email", "Jean.Dupont@Gmail.com"), ("phone", "06 12 34 56 78"), ("degree", "Master")):
+        position = result.positions[field]
+        assert pages[position.page - 1][position.start:position.end] == text
+    assert result.positions["degree"].page == 2
+
+def test_field_positions_across_page_breaks():
+    """Texte lu d'un bloc (DOCX, lecture non paresseuse) : la page est celle du saut de page."""
+    fields = pipeline.FieldCollector()
+    raw = "Jean Dupont\n06 12 34 56 78\f\fFormation\nLicence Informatique\njean@gmail.com"
+    normalized = normalize_with_offsets(raw)
+    fields.add_page(normalized.text, source=normalized)
+    assert fields.positions["degree"].page == 3
+    assert fields.positions["email"].model_dump() == {"page": 3, "start": 31, "end": 45}
+
+def test_degree_outside_experience_without_education_section():
+    """Sans rubrique Formation, un mot de diplôme dans une expérience n'est pas retenu."""
+    fields = pipeline.FieldCollector()
+    fields.add_page("jean dupont\nexperience\nformateur bts, suivi des alternants\nprofil\ntitulaire d'un master rh")
+    assert fields.fields["degree"] == "Master Rh"
+    assert fields.degrees == []
+
+def test_page_budget(fake_pdf, monkeypatch):
+    """Le budget de pages plafonne la lecture, même si des champs manquent."""
+    monkeypatch.setattr(config, "MAX_PAGES", 1)
+    result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    assert result.pages_parsed == 1
+    assert result.degree == "Non trouvé"
+
+def test_streaming_disabled_reads_whole_document(fake_pdf, monkeypatch):
+    """Sans lecture paresseuse, le document est lu en entier avant l'extraction."""
+    monkeypatch.setattr(config, "STREAMING_PARSE", False)
+    result = pipeline.analyze_document(b"%PDF-fake", pipeline.PDF_MIME)
+    assert result.degree == "Master Data Science"
+    assert result.pages_parsed is None
+    assert fake_pdf == [0, 1, 2, 3]
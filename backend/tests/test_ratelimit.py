@@ -0,0 +1,75 @@
+import sys
+import os
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conftest import DOCX_MIME, make_docx, uploads_total
+from services.executor import BULK, INTERACTIVE
+from services.ratelimit import RateLimiter, identify_client
+
+API_KEYS = {"frontend": "interactive", "import-rh": "bulk"}
+
+
+# TESTS SEAU À JETONS
+
+def test_bucket_burst_then_rate():
+    limiter = RateLimiter(rate=2, burst=3)
+    assert [limiter.acquire("ip:a", now=0) for _ in range(3)] == [0, 0, 0]
+    assert limiter.acquire("ip:a", now=0) == pytest.approx(0.5)
+    # Rempli à 2 jetons/s : un jeton après 0,5 s, jamais plus que la rafale
+    assert limiter.acquire("ip:a", now=0.5) == 0
+    assert limiter.acquire("ip:b", now=0.5) == 0  # seau propre à chaque client
+    assert [limiter.acquire("ip:a", now=100) for _ in range(4)][-1] > 0
+    assert limiter.stats()["limited"] == 2
+
+def test_bucket_store_is_bounded():
+    limiter = RateLimiter(rate=1, burst=1, max_clients=2)
+    for client in ("ip:a", "ip:b", "ip:c"):
+        limiter.acquire(client, now=0)
+    assert limiter.stats()["clients"] == 2
+    assert limiter.acquire("ip:a", now=0) == 0  # le plus ancien a été oublié : seau plein
+
+
+# TESTS IDENTIFICATION
+
+def test_identify_client():
+    assert identify_client({}, "10.0.0.1", API_KEYS).key == "ip:10.0.0.1"
+    assert identify_client({"x-api-key": "import-rh"}, "10.0.0.1", API_KEYS).lane == BULK
+    # Clé inconnue : l'adresse IP reste l'identifiant (pas de nouveau seau en changeant de clé)
+    unknown = identify_client({"x-api-key": "inventee"}, "10.0.0.1", API_KEYS)
+    assert (unknown.key, unknown.lane) == ("ip:10.0.0.1", INTERACTIVE)
+    # Un client peut se déclasser, jamais passer devant
+    assert identify_client({"x-api-key": "frontend", "x-priority": "bulk"}, None, API_KEYS).lane == BULK
+    assert identify_client({"x-api-key": "import-rh", "x-priority": "interactive"}, None, API_KEYS).lane == BULK
+
+
+# TESTS API
+
+LIMITED = {"RATE_LIMIT": 0.01, "RATE_LIMIT_BURST": 2, "API_KEYS": API_KEYS}
+
+
+def upload(client, name: str, headers=None):
+    content = make_docx(name, f"{name.lower().replace(' ', '.')}@gmail.com", "Formation", "Master Informatique")
+    return client.post("/api/v1/upload-cv", files={"file": ("cv.docx", content, DOCX_MIME)}, headers=headers or {})
+
+@pytest.mark.parametrize("client", [LIMITED], indirect=True)
+def test_upload_rate_limited(client):
+    assert upload(client, "Jean Dupont").status_code == 200
+    assert upload(client, "Marie Curie").status_code == 200
+    rejected = uploads_total("other", 429)
+    resp = upload(client, "Paul Martin")
+    assert resp.status_code == 429
+    assert uploads_total("other", 429) == rejected + 1
+    assert int(resp.headers["Retry-After"]) >= 1
+    # Une clé d'API déclarée a son propre seau
+    assert upload(client, "Paul Martin", {"X-API-Key": "import-rh"}).status_code == 200
+    stats = client.get("/api/v1/executor").json()
+    assert stats["rate_limit"]["limited"] == 1
+    assert stats["lanes"][BULK]["dispatched"] >= 1
+
+@pytest.mark.parametrize("client", [{"RATE_LIMIT": 0}], indirect=True)
+def test_rate_limit_disabled_by_default(client):
+    assert all(upload(client, "Jean Dupont").status_code == 200 for _ in range(3))
+    assert client.get("/api/v1/executor").json()["rate_limit"] is None
@@ -0,0 +1,173 @@
+import sys
+import os
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from benchmarks.corpus import make_cv, render_pdf, render_docx
+from conftest import DOCX_MIME
+from models.cv_result import CVResult
+from services import search
+from services.search import SearchIndex, close_search_index, domain_token, fts_query
+
+
+def make_result(first_name: str, last_name: str, email: str, degree: str) -> CVResult:
+    return CVResult(first_name=first_name, last_name=last_name, email=email, phone="0612345678", degree=degree)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / "search.db"))
+    index.add_many([
+        ("a" * 64, make_result("Jean", "Dupont", "jean@gmail.com", "Master Informatique"),
+         "developpeur python\nkubernetes et docker", "dupont.pdf"),
+        ("b" * 64, make_result("Marie", "Martin", "marie@outlook.fr", "Licence Réseaux"),
+         "technicienne reseaux\nformation python", "martin.pdf"),
+        ("c" * 64, make_result("Karim", "Python", "karim@gmail.com", "BTS Systèmes Numériques"),
+         "administrateur systemes", "python.docx"),
+    ])
+    yield index
+    index.close()
+
+
+# TESTS CONSTRUCTION DES REQUÊTES
+
+def test_fts_query_escapes_syntax():
+    """Les opérateurs FTS5 saisis par l'utilisateur sont traités comme des mots."""
+    assert fts_query('master "OR" NEAR(info') == '"master" "OR" "NEAR" "info"'
+    assert fts_query("informat*", "degree") == 'degree : ("informat"*)'
+    assert fts_query(" ?! ") is None
+
+def test_domain_token_is_exact():
+    assert domain_token("gmail.com") != domain_token("gmail.com.au")
+    assert domain_token("gmail.com").isalnum()
+
+
+# TESTS INDEX
+
+def test_search_ranks_name_above_text(index):
+    """Le nom pèse plus que le texte : le candidat nommé Python passe devant."""
+    found = index.search("python")
+    assert found["total"] == 3
+    assert found["hits"][0]["result"].last_name == "Python"
+    assert found["hits"][0]["score"] >= found["hits"][1]["score"]
+
+def test_search_snippet_and_result(index):
+    hit = index.search("kubernetes")["hits"][0]
+    assert "[kubernetes]" in hit["snippet"]
+    assert hit["filename"] == "dupont.pdf"
+    assert hit["result"].document_id == "a" * 64
+
+def test_search_filters(index):
+    assert [h["result"].last_name for h in index.search(degree="master info*")["hits"]] == ["Dupont"]
+    assert index.search("python", domain="gmail.com")["total"] == 2
+    assert index.search("python", domain="@GMAIL.com")["total"] == 2
+    assert index.search(domain="outlook.fr")["total"] == 1
+    assert index.search("python", domain="gmail.co")["total"] == 0
+
+def test_search_ignores_accents(index):
+    assert index.search(degree="réseaux")["total"] == 1
+    assert index.search(degree="systemes numeriques")["total"] == 1
+
+def test_search_pagination(index):
+    pages = [index.search("python", page=page, page_size=2) for page in (1, 2, 3)]
+    assert [len(p["hits"]) for p in pages] == [2, 1, 0]
+    ids = [hit["document_id"] for p in pages for hit in p["hits"]]
+    assert len(set(ids)) == 3
+
+def test_search_without_query_lists_recent(index):
+    found = index.search()
+    assert found["total"] == 3
+    assert all(hit["score"] is None for hit in found["hits"])
+
+def test_reindex_replaces_document(index):
+    index.add("a" * 64, make_result("Jean", "Dupont", "jean@proton.me", "Doctorat Chimie"), "chimie organique")
+    assert index.stats()["documents"] == 3
+    assert index.search("kubernetes")["total"] == 0
+    assert index.search(domain="gmail.com")["total"] == 1
+    assert index.search("chimie", domain="proton.me")["total"] == 1
+
+def test_search_all_degrees(index):
+    result = make_result("Sophie", "Petit", "sophie@gmail.com", "Master Finance")
+    result.degrees = ["Master Finance", "Licence Mathematiques", "Bac S"]
+    index.add("d" * 64, result, "analyste")
+    assert [h["result"].last_name for h in index.search(degree="licence mathematiques")["hits"]] == ["Petit"]
+
+def test_contains_checks_extractor_version(index, monkeypatch):
+    assert index.contains("a" * 64)
+    assert not index.contains("d" * 64)
+    monkeypatch.setattr(search, "EXTRACTOR_VERSION", "autre")
+    assert not index.contains("a" * 64)
+    monkeypatch.undo()
+    monkeypatch.setattr(search, "INDEX_VERSION", "autre")
+    assert not index.contains("a" * 64)
+
+def test_rank_window_keeps_total_and_deep_pages(tmp_path, monkeypatch):
+    """Au-delà de la fenêtre, le total reste exact et les pages profondes restent accessibles."""
+    monkeypatch.setattr(config, "SEARCH_RANK_WINDOW", 3)
+    index = SearchIndex(str(tmp_path / "window.db"))
+    index.add_many([
+        (f"{n:064x}", make_result("Jean", f"Nom{n}", f"j{n}@gmail.com", "Master"), "python", None)
+        for n in range(10)
+    ])
+    first = index.search("python", page=1, page_size=2)
+    assert first["total"] == 10
+    # Classement restreint aux 3 documents les plus récents
+    assert {hit["result"].last_name for hit in first["hits"]} <= {"Nom7", "Nom8", "Nom9"}
+    ids = {hit["document_id"] for page in range(1, 6) for hit in index.search("python", page=page, page_size=2)["hits"]}
+    assert len(ids) == 10
+    index.close()
+
+
+# TESTS API
+
+@pytest.fixture
+def client_config(tmp_path):
+    return {"SEARCH_DB": str(tmp_path / "search.db")}
+
+def test_upload_indexes_whole_document(client):
+    """Le texte indexé couvre tout le document, pas seulement les pages lues pour l'extraction."""
+    cv = make_cv(21, pages=3)
+    cv.pages[2].append("Certification Kubernetes Administrator")
+    upload = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", render_pdf(cv), "application/pdf")})
+    assert upload.status_code == 200
+    assert "index" in upload.headers["Server-Timing"]
+
+    resp = client.get("/api/v1/search", params={"q": "kubernetes"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["total"] == 1
+    assert data["hits"][0]["result"]["email"] == cv.email
+    assert data["hits"][0]["document_id"] == upload.json()["document_id"]
+
+def test_cached_result_is_indexed(client, monkeypatch):
+    """Un document déjà en cache mais absent de l'index est ré-analysé pour être indexé."""
+    cv = make_cv(22)
+    content = render_docx(cv)
+    search_db = config.SEARCH_DB
+    close_search_index()
+    monkeypatch.setattr(config, "SEARCH_DB", "")
+    assert client.post("/api/v1/upload-cv", files={"file": ("cv.docx", content, DOCX_MIME)}).status_code == 200
+    monkeypatch.setattr(config, "SEARCH_DB", search_db)
+    assert client.post("/api/v1/upload-cv", files={"file": ("cv.docx", content, DOCX_MIME)}).status_code == 200
+    resp = client.get("/api/v1/search", params={"q": cv.last_name, "email_domain": cv.email.split("@")[1]})
+    assert cv.email in [hit["result"]["email"] for hit in resp.json()["hits"]]
+
+def test_batch_indexes_documents(client):
+    cvs = [make_cv(seed, lang="en") for seed in (31, 32)]
+    files = [("files", (f"{cv.name}.pdf", render_pdf(cv), "application/pdf")) for cv in cvs]
+    assert client.post("/api/v1/upload-cv/batch", files=files).status_code == 200
+    for cv in cvs:
+        resp = client.get("/api/v1/search", params={"q": cv.email.split("@")[0]})
+        assert cv.email in [hit["result"]["email"] for hit in resp.json()["hits"]]
+
+def test_search_validation(client):
+    assert client.get("/api/v1/search", params={"page": 0}).status_code == 422
+    assert client.get("/api/v1/search", params={"page_size": config.SEARCH_MAX_PAGE_SIZE + 1}).status_code == 422
+
+def test_search_disabled(client, monkeypatch):
+    close_search_index()
+    monkeypatch.setattr(config, "SEARCH_DB", "")
+    assert client.get("/api/v1/search", params={"q": "python"}).status_code == 404
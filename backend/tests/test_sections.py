@@ -0,0 +1,85 @@
+import sys
+import os
+
+# Ajout du dossier parent au path pour pouvoir importer 'services'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.extractor import extract_degree, extract_degrees, extract_fields, extract_name
+from services.sections import EDUCATION, EXPERIENCE, HEADER, SectionTracker, segment
+
+# Texte nettoyé (minuscules, sans accents), comme le reçoit l'extraction
+CV = (
+    "jean dupont\n"
+    "developpeur python\n"
+    "06 12 34 56 78\n"
+    "experiences professionnelles\n"
+    "2020 - 2023 : developpeur, encadrement d'alternants en master data\n"
+    "- formation des equipes\n"
+    "formation\n"
+    "2019 master informatique universite de lyon\n"
+    "2017 licence mathematiques\n"
+    "2014 bac s\n"
+    "competences : python, sql\n"
+    "langues\n"
+    "anglais\n"
+)
+
+
+def names(text, current=HEADER):
+    return [section.name for section in segment(text, current).sections]
+
+
+# TESTS DÉCOUPAGE
+
+def test_segment_headings():
+    index = segment(CV)
+    assert [s.name for s in index.sections] == ["header", "experience", "education", "skills", "languages"]
+    education = index.sections[2]
+    assert CV[education.start:education.end].split("\n")[1] == "2019 master informatique universite de lyon"
+    # Les sections couvrent le texte sans chevauchement (titres exclus)
+    assert index.sections[0].start == 0 and index.sections[-1].end == len(CV)
+    assert all(a.end <= b.start for a, b in zip(index.sections, index.sections[1:]))
+
+def test_heading_variants():
+    assert names("nom\n1. formation\nmaster\n") == ["header", "education"]
+    assert names("nom\n• experience professionnelle :\nstage\n") == ["header", "experience"]
+    assert names("nom\nlangues : anglais, espagnol\n") == ["header", "languages"]
+    # Titre en début de page (après un saut de page)
+    assert names("nom\fformation\nmaster\n") == ["header", "education"]
+    # En-tête vide : le document commence par un titre
+    assert names("formation\nmaster\n") == ["education"]
+
+def test_heading_words_inside_sentences():
+    """Un mot de titre au milieu d'une phrase n'ouvre pas de section."""
+    assert names("nom\nformation des equipes commerciales\nexperience de 5 ans\n") == ["header"]
+
+def test_tracker_continues_across_pages():
+    tracker = SectionTracker()
+    tracker.segment("jean dupont\nformation\nmaster informatique\n")
+    assert tracker.current == EDUCATION and not tracker.finished(EDUCATION)
+    page = tracker.segment("licence mathematiques\nexperience\nstage\n")
+    assert page.sections[0].name == EDUCATION and page.sections[0].heading is None
+    assert tracker.finished(EDUCATION) and tracker.current == EXPERIENCE
+
+
+# TESTS EXTRACTION PAR SECTION
+
+def test_all_degrees_from_education():
+    assert extract_degrees(CV) == ["Master Informatique", "Licence Mathematiques", "Bac S"]
+    assert extract_degree(CV) == "Master Informatique"
+
+def test_experience_ignored_when_education_exists():
+    """Le "master" d'une description de poste n'est pas pris pour le diplôme."""
+    found = extract_fields(CV, ("degree",))
+    assert found["spans"]["degree"][0] > CV.index("\nformation\n")
+
+def test_degree_outside_experience_without_education():
+    text = "jean dupont\nexperience\nencadrement de stagiaires en master\nprojets\ndut informatique\n"
+    assert extract_degree(text) == "Dut Informatique"
+    assert extract_degrees(text) == []
+
+def test_name_and_contact_from_header():
+    assert extract_name(CV) == ("Jean", "Dupont")
+    found = extract_fields(CV, ("phone",))
+    assert found["phone"] == "06 12 34 56 78"
+    assert found["spans"]["phone"][1] < CV.index("experiences")
@@ -0,0 +1,112 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import subprocess
+from functools import partial
+import pytest
+
+# Ajout du dossier parent au path pour pouvoir importer 'main'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from benchmarks.corpus import make_cv, render_pdf
+from services.parsers import PDF_MIME, DOCX_MIME
+from services.executor import BoundedExecutor
+from services.pipeline import analyze_document
+from services.warmup import reset_readiness, tiny_pdf, tiny_docx, warm_up, warm_up_service
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules des parsers : jamais chargés par l'import de l'application
+PARSER_MODULES = ["pdfplumber", "pdfminer", "pypdfium2", "docx", "PIL"]
+# Bornes larges : il s'agit de détecter une régression grossière, pas de chronométrer la CI
+MAX_IMPORT_SECONDS = 5.0
+MAX_FIRST_REQUEST_SECONDS = 5.0
+
+IMPORT_PROBE = f"""
+import sys, time, json
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {PARSER_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def wait_ready(client: TestClient, timeout: float = 30) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        resp = client.get("/ready")
+        if resp.status_code == 200 or time.monotonic() > deadline:
+            return resp
+        time.sleep(0.05)
+
+
+# TESTS DOCUMENTS DE PRÉCHAUFFAGE
+
+def test_builtin_documents_are_parsed():
+    for content, content_type in ((tiny_pdf(), PDF_MIME), (tiny_docx(), DOCX_MIME)):
+        result = analyze_document(content, content_type)
+        assert result.email == "jean.dupont@example.com"
+        assert result.last_name == "Dupont"
+
+def test_warm_up_runs():
+    assert warm_up() >= 0
+
+
+def record_pid(path: str) -> None:
+    """Initializer de test : note le processus préchauffé."""
+    with open(path, "a") as f:
+        f.write(f"{os.getpid()}\n")
+
+def test_every_pool_process_warmed_by_initializer(tmp_path):
+    """Chaque processus du premier pool passe par l'initializer, quelle que soit la répartition des tâches."""
+    path = str(tmp_path / "pids")
+    executor = BoundedExecutor(kind="process", workers=2, initializer=partial(record_pid, path))
+    try:
+        asyncio.run(warm_up_service(executor))
+        pool_pids = set(executor._pool._processes)
+        deadline = time.monotonic() + 30
+        warmed = set()
+        while warmed != pool_pids and time.monotonic() < deadline:
+            time.sleep(0.05)
+            with open(path) as f:
+                warmed = {int(line) for line in f}
+        assert len(pool_pids) == 2 and warmed == pool_pids
+    finally:
+        executor.shutdown()
+        reset_readiness()
+
+
+# TESTS DÉMARRAGE
+
+def test_import_is_lazy_and_fast():
+    """L'import de l'application (démarrage d'un worker) ne charge aucun parser."""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], cwd=BACKEND_DIR,
+        capture_output=True, text=True, check=True
+    ).stdout
+    probe = json.loads(output.strip().splitlines()[-1])
+    assert probe["loaded"] == []
+    assert probe["seconds"] < MAX_IMPORT_SECONDS
+
+def test_ready_after_warm_up_then_first_request_fast(client):
+    cv = make_cv(3, pages=2)
+    resp = wait_ready(client)
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "ready"
+    assert resp.json()["warmup_seconds"] >= 0
+
+    started = time.perf_counter()
+    resp = client.post("/api/v1/upload-cv", files={"file": ("cv.pdf", render_pdf(cv), "application/pdf")})
+    elapsed = time.perf_counter() - started
+    assert resp.status_code == 200
+    assert resp.json()["email"] == cv.email
+    assert elapsed < MAX_FIRST_REQUEST_SECONDS
+
+@pytest.mark.parametrize("client", [{"WARMUP": False}], indirect=True)
+def test_ready_without_warm_up(client):
+    resp = client.get("/ready")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ready", "warmup_seconds": None}
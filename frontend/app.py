@@ -2,10 +2,13 @@ import streamlit as st
 import requests
 import json
 import base64
+import hashlib
 import os
-import time
 import socket
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 #CONFIGURATION INITIALE
 st.set_page_config(
@@ -39,6 +42,85 @@ def get_api_url():
 API_URL = get_api_url()
 logger.info(f"Frontend connecté au Backend sur : {API_URL}")
 
+# Base de l'API pour les appels du frontend, et base publique pour le navigateur
+# (les miniatures sont chargées directement par le navigateur, hors du websocket Streamlit)
+API_BASE_URL = API_URL.split("/api/v1")[0]
+BACKEND_PUBLIC_URL = os.getenv("BACKEND_PUBLIC_URL", API_BASE_URL)
+THUMBNAIL_WIDTH = 600
+
+# Envois simultanés vers le backend (pool de threads borné)
+MAX_CONCURRENT_UPLOADS = int(os.getenv("FRONTEND_MAX_CONCURRENT_UPLOADS", "4"))
+REQUEST_TIMEOUT = 30
+
+# Clé d'API du frontend (CV_API_KEYS côté backend) : seau de limite de débit propre et file interactive,
+# au lieu de l'adresse IP du serveur Streamlit partagée par tous les utilisateurs
+BACKEND_API_KEY = os.getenv("BACKEND_API_KEY", "")
+
+
+# APPELS API
+
+class AnalysisError(Exception):
+    """Réponse d'erreur du backend. Levée (et non retournée) pour ne pas être mise en cache."""
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Session HTTP partagée : les connexions keep-alive sont réutilisées entre envois et reruns."""
+    session = requests.Session()
+    if BACKEND_API_KEY:
+        session.headers["X-API-Key"] = BACKEND_API_KEY
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=MAX_CONCURRENT_UPLOADS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def analyze_cv(file_hash: str, _file_name: str, _file_type: str, _content: bytes) -> dict:
+    """
+    Envoie un CV au backend. Le résultat est mis en cache par empreinte du fichier :
+    un rerun ou un nouvel envoi du même fichier ne repasse pas par le réseau.
+    """
+    files = {"file": (_file_name, _content, _file_type)}
+    resp = get_http_session().post(API_URL, files=files, timeout=REQUEST_TIMEOUT)
+    if resp.status_code != 200:
+        try:
+            detail = resp.json().get("detail", resp.text)
+        except ValueError:
+            detail = resp.text
+        raise AnalysisError(f"Erreur d'analyse (Code {resp.status_code}) : {detail}")
+    return resp.json()
+
+
+@st.cache_data(show_spinner=False, max_entries=500)
+def get_document_info(document_id: str) -> dict:
+    """Type et nombre de pages du document conservé par le backend."""
+    resp = get_http_session().get(f"{API_BASE_URL}/api/v1/documents/{document_id}", timeout=REQUEST_TIMEOUT)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def thumbnail_url(document_id: str, page: int) -> str:
+    return f"{BACKEND_PUBLIC_URL}/api/v1/documents/{document_id}/pages/{page}.png?width={THUMBNAIL_WIDTH}"
+
+
+def file_hash(uploaded_file) -> str:
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+
+def analyze_entry(key: str, name: str, file_type: str, content: bytes) -> dict:
+    """Analyse un fichier et retourne son entrée de résultat (données ou message d'erreur)."""
+    entry = {"name": name, "type": file_type, "data": None, "error": None}
+    try:
+        entry["data"] = analyze_cv(key, name, file_type, content)
+    except requests.exceptions.ConnectionError:
+        entry["error"] = "Impossible de contacter le serveur d'analyse. Vérifiez que le Backend est lancé."
+    except AnalysisError as e:
+        entry["error"] = str(e)
+    except Exception as e:
+        entry["error"] = f"Une erreur inattendue est survenue : {e}"
+    return entry
+
 
 # GESTION DES ASSETS & STYLES 
 
@@ -147,15 +229,13 @@ def inject_custom_css():
         flex-direction: column;
     }
 
-    /* Iframe PDF */
-    iframe {
-        border: none;
+    /* Miniature de page (servie par le backend) */
+    img.cv-thumbnail {
         display: block;
+        width: 100%;
         background-color: #f1f5f9;
+        border: 1px solid var(--border-color);
         border-radius: 8px;
-        width: 100%;
-        height: 100%;
-        min-height: 650px; /* Prend toute la hauteur du conteneur parent */
     }
 
     /* --- RESPONSIVE MOBILE / TABLETTE (< 992px) --- */
@@ -168,9 +248,6 @@ def inject_custom_css():
           height: auto !important;
       }
 
-      /* Le PDF prend moins de hauteur sur mobile */
-      iframe { min-height: 450px !important; } 
-      
       /* Force les colonnes à passer l'une sous l'autre avec une marge */
       [data-testid="column"] { 
           width: 100% !important;
@@ -209,10 +286,49 @@ def render_navbar():
     """, unsafe_allow_html=True)
 
 
+def render_result_row(key: str, entry: dict):
+    """Une ligne par fichier analysé : statut et accès au détail."""
+    col_name, col_status, col_action = st.columns([3, 3, 1])
+    col_name.markdown(f"**{entry['name']}**")
+    if entry["error"]:
+        col_status.error(entry["error"])
+        return
+    cv = entry["data"]
+    col_status.markdown(f"{cv.get('first_name', '')} {cv.get('last_name', '')} — {cv.get('email', '')}")
+    if col_action.button("Voir", key=f"view_{key}", use_container_width=True):
+        st.session_state.selected = key
+        st.rerun()
+
+
+def analyze_files(pending: dict):
+    """
+    Envoie les fichiers pas encore analysés en parallèle (pool borné) ;
+    chaque résultat s'affiche dès qu'il est reçu, sans attendre les autres.
+    """
+    results = st.session_state.results
+    progress = st.progress(0.0, text="Analyse des documents en cours...")
+    ctx = get_script_run_ctx()
+    # Le contexte Streamlit est transmis aux threads (accès au cache sans avertissement)
+    with ThreadPoolExecutor(
+        max_workers=MAX_CONCURRENT_UPLOADS, initializer=add_script_run_ctx, initargs=(None, ctx)
+    ) as pool:
+        futures = {
+            pool.submit(analyze_entry, key, f.name, f.type, f.getvalue()): key
+            for key, f in pending.items()
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            key = futures[future]
+            results[key] = future.result()
+            render_result_row(key, results[key])
+            progress.progress(done / len(futures), text=f"{done}/{len(futures)} document(s) analysé(s)")
+    progress.empty()
+
+
 def reset_session():
-    st.session_state.cv_data = None
-    st.session_state.current_file_name = None
-    st.session_state.current_file_content = None
+    st.session_state.results = {}
+    st.session_state.selected = None
+    # Nouvelle clé : la zone de dépôt est vidée
+    st.session_state.uploader_key += 1
     st.rerun()
 
 
@@ -228,41 +344,41 @@ def show_upload_page():
                 Extraction de données candidats
             </h1>
             <p style="font-size:16px; color:#64748b; margin:0 auto; max-width:600px; line-height:1.6;">
-                Optimisez votre recrutement. Importez un CV (PDF/DOCX) pour extraire instantanément les informations clés.
+                Optimisez votre recrutement. Importez un ou plusieurs CV (PDF/DOCX) pour extraire instantanément les informations clés.
             </p>
         </div>
         """, unsafe_allow_html=True)
 
-        uploaded_file = st.file_uploader("Zone de dépôt", type=["pdf", "docx"], label_visibility="collapsed")
+        uploaded_files = st.file_uploader(
+            "Zone de dépôt", type=["pdf", "docx"], accept_multiple_files=True,
+            label_visibility="collapsed", key=f"uploader_{st.session_state.uploader_key}"
+        )
+
+        if not uploaded_files:
+            st.info("Glissez vos fichiers ici (PDF ou DOCX)")
+            return {}
 
-        if not uploaded_file:
-            st.info("Glissez votre fichier ici (PDF ou DOCX)")
+        st.markdown("###")
+        # Un même fichier déposé deux fois n'est analysé qu'une fois
+        files = {}
+        for uploaded_file in uploaded_files:
+            files.setdefault(file_hash(uploaded_file), uploaded_file)
 
-        if uploaded_file:
-            st.markdown("###")
-            with st.spinner("Analyse du document en cours..."):
-                try:
-                    time.sleep(0.5)
-                    st.session_state.current_file_name = uploaded_file.name
-                    st.session_state.current_file_content = uploaded_file.getvalue()
-                    st.session_state.current_file_type = uploaded_file.type
+        results = st.session_state.results
+        for key in files:
+            if key in results:
+                render_result_row(key, results[key])
 
-                    files = {"file": (uploaded_file.name, uploaded_file.getvalue(), uploaded_file.type)}
-                    resp = requests.post(API_URL, files=files, timeout=30)
+        pending = {key: f for key, f in files.items() if key not in results}
+        if pending:
+            analyze_files(pending)
 
-                    if resp.status_code == 200:
-                        st.session_state.cv_data = resp.json()
-                        st.rerun()
-                    else:
-                        st.error(f"Erreur d'analyse (Code {resp.status_code}) : {resp.text}")
-                
-                except requests.exceptions.ConnectionError:
-                    st.error("Impossible de contacter le serveur d'analyse. Vérifiez que le Backend est lancé.")
-                except Exception as e:
-                    st.error(f"Une erreur inattendue est survenue : {e}")
+        if st.button("Analyser d'autres CV", use_container_width=True):
+            reset_session()
+        return files
 
 
-def show_result_page():
+def show_result_page(entry: dict):
     st.markdown("""
     <div style="margin-bottom:20px; display:flex; align-items:center; gap:8px; font-size:14px;">
         <span style="color:#64748b;">Accueil</span>
@@ -280,25 +396,33 @@ def show_result_page():
             <div style="display:flex; justify-content:space-between; align-items:center; margin-bottom:16px;">
                 <span style="font-weight:700; font-size:16px; color:#0f172a;">Aperçu du document</span>
                 <span style="font-size:12px; color:#64748b; background:#f1f5f9; padding:4px 10px; border-radius:6px;">
-                    {st.session_state.current_file_name}
+                    {entry['name']}
                 </span>
             </div>
             """, unsafe_allow_html=True)
             
-            if st.session_state.current_file_type == "application/pdf":
-                b64_pdf = base64.b64encode(st.session_state.current_file_content).decode("utf-8")
-                # AJOUT : toolbar=1 pour réactiver la barre d'outils
+            document_id = entry["data"].get("document_id")
+            try:
+                pages = get_document_info(document_id)["pages"] if document_id else 0
+            except requests.exceptions.RequestException:
+                pages = 0
+
+            if pages:
+                # Page 1 d'abord ; les suivantes ne sont rendues par le backend qu'à la demande
+                page = 1
+                if pages > 1:
+                    page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"page_{document_id}")
                 st.markdown(
-                    f'<iframe src="data:application/pdf;base64,{b64_pdf}#toolbar=1&navpanes=0&view=FitH"></iframe>',
+                    f'<img class="cv-thumbnail" src="{thumbnail_url(document_id, page)}" alt="Page {page}">',
                     unsafe_allow_html=True
                 )
             else:
-                st.warning("L'aperçu n'est disponible que pour les fichiers PDF.")
+                st.warning("Aperçu indisponible pour ce document.")
                 st.markdown('<div style="height:400px; background:#f8fafc; display:flex; align-items:center; justify-content:center; color:#cbd5e1;">Aperçu non disponible</div>', unsafe_allow_html=True)
 
     # FORMULAIRE D'EXTRACTION
     with col_form:
-        cv = st.session_state.cv_data
+        cv = entry["data"]
         
         with st.container(border=True):
             st.markdown("""
@@ -331,31 +455,38 @@ def show_result_page():
                 st.download_button(
                     label="Télécharger JSON",
                     data=json.dumps(final_json, ensure_ascii=False, indent=4),
-                    file_name=f"export_{st.session_state.current_file_name}.json",
+                    file_name=f"export_{entry['name']}.json",
                     mime="application/json",
                     use_container_width=True
                 )
             
             with col_action_2:
-                if st.button("Analyser un autre CV", use_container_width=True):
-                    reset_session()
+                if st.button("Retour à la liste", use_container_width=True):
+                    st.session_state.selected = None
+                    st.rerun()
 
 
 # POINT D'ENTRÉE
 
 def main():
-    if "cv_data" not in st.session_state:
-        st.session_state.cv_data = None
-    if "current_file_name" not in st.session_state:
-        st.session_state.current_file_name = None
+    # Seuls les résultats (et non le contenu des fichiers) sont conservés en session
+    if "results" not in st.session_state:
+        st.session_state.results = {}
+    if "selected" not in st.session_state:
+        st.session_state.selected = None
+    if "uploader_key" not in st.session_state:
+        st.session_state.uploader_key = 0
 
     inject_custom_css()
     render_navbar()
 
-    if st.session_state.cv_data is None:
-        show_upload_page()
-    else:
-        show_result_page()
+    # La zone de dépôt reste affichée, le détail du CV sélectionné apparaît en dessous
+    files = show_upload_page()
+
+    selected = st.session_state.selected
+    if selected in files and st.session_state.results.get(selected, {}).get("data"):
+        st.markdown("---")
+        show_result_page(st.session_state.results[selected])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file